@@ -0,0 +1,84 @@
+import unicodedata
+from array import array
+from itertools import accumulate
+from typing import Iterator
+
+#compila conjuntos de caracteres informados pelo usuario (simbolos_personalizados) em
+#alfabetos sem repeticoes: o texto e normalizado em NFC (um "é" decomposto vira um unico caractere) e cada
+#unidade aparece uma vez, na ordem da primeira ocorrencia, para que o sorteio continue uniforme.
+#com agrupar_grafemas, cada cluster de grafemas (emoji com modificadores ou ZWJ, letra com acentos
+#combinantes, bandeiras) e uma unidade so, em vez de code points que seriam sorteados separadamente
+ZWJ = "\u200d"
+
+def _estende_grafema(caractere: str) -> bool:
+    #marcas combinantes, ZWJ, seletores de variacao, modificadores de tom de pele e tags de emoji
+    #nunca comecam um cluster: ficam presos ao caractere anterior
+    codigo = ord(caractere)
+    return (unicodedata.category(caractere) in ("Mn", "Me", "Mc") or caractere == ZWJ or
+            0xFE00 <= codigo <= 0xFE0F or 0xE0100 <= codigo <= 0xE01EF or
+            0x1F3FB <= codigo <= 0x1F3FF or 0xE0020 <= codigo <= 0xE007F)
+
+def _indicador_regional(caractere: str) -> bool:
+    return 0x1F1E6 <= ord(caractere) <= 0x1F1FF
+
+def separar_grafemas(texto: str) -> list[str]:
+    #aproximacao das regras de clusters estendidos do UAX #29 que importam para alfabetos de simbolos:
+    #extensores, sequencias unidas por ZWJ e pares de indicadores regionais (bandeiras)
+    grafemas = []
+    for caractere in texto:
+        if grafemas:
+            anterior = grafemas[-1]
+            if (_estende_grafema(caractere) or anterior[-1] == ZWJ or
+                    (_indicador_regional(caractere) and len(anterior) == 1 and _indicador_regional(anterior))):
+                grafemas[-1] = anterior + caractere
+                continue
+        grafemas.append(caractere)
+    return grafemas
+
+def normalizar(texto: str) -> str:
+    #texto ASCII ja esta em NFC
+    return texto if texto.isascii() else unicodedata.normalize("NFC", texto)
+
+def separar_unidades(texto: str, agrupar_grafemas: bool = False) -> list[str]:
+    #as unidades sorteaveis do texto normalizado: code points, ou clusters de grafemas
+    texto = normalizar(texto)
+    return separar_grafemas(texto) if agrupar_grafemas else list(texto)
+
+class TabelaAlfabeto:
+    #alfabeto com unidades de varios code points: um unico str com todas as unidades e um array de
+    #offsets. indexar e O(1) e cada unidade custa 4 bytes alem dos seus caracteres, sem um objeto str por unidade
+    __slots__ = ("texto", "_offsets")
+
+    def __init__(self, unidades: list[str]):
+        self.texto = "".join(unidades)
+        self._offsets = array("I", accumulate(map(len, unidades), initial=0))
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, indice: int) -> str:
+        if indice < 0:
+            indice += len(self)
+        offsets = self._offsets
+        return self.texto[offsets[indice]:offsets[indice + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        offsets, texto = self._offsets, self.texto
+        return (texto[inicio:fim] for inicio, fim in zip(offsets, offsets[1:]))
+
+    def __str__(self) -> str:
+        return self.texto
+
+    def escolher(self, indices: list[int]) -> list[str]:
+        offsets, texto = self._offsets, self.texto
+        return [texto[offsets[i]:offsets[i + 1]] for i in indices]
+
+def compilar_alfabeto(*conjuntos: str, agrupar_grafemas: bool = False) -> "str | TabelaAlfabeto":
+    #uniao dos conjuntos sem repeticoes. quando toda unidade e um unico code point o resultado e um str,
+    #que ja e uma tabela compacta (1, 2 ou 4 bytes por caractere) com indexacao O(1)
+    if not agrupar_grafemas:
+        return "".join(dict.fromkeys("".join(map(normalizar, conjuntos))))
+    unidades = list(dict.fromkeys(unidade for conjunto in conjuntos for unidade in separar_unidades(conjunto, True)))
+    if all(len(unidade) == 1 for unidade in unidades):
+        return "".join(unidades)
+    return TabelaAlfabeto(unidades)
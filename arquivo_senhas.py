@@ -0,0 +1,156 @@
+import mmap
+import os
+import struct
+from itertools import accumulate, islice
+from typing import Iterable, Iterator
+
+from gerador_senha import GeradorFraseCompilado, GeradorSenhaCompilado, ResultadoGeracao
+
+#formato binario de saida em lote (inteiros little-endian):
+#  MAGICA | quantidade (uint64) | inicio das senhas (uint64) | largura (uint32) | reservado (uint32)
+#  largura > 0: `quantidade` registros de exatamente `largura` bytes UTF-8, a senha i em inicio + i * largura
+#  largura = 0: quantidade+1 offsets uint64 logo apos o cabecalho e a senha i em inicio + offsets[i:i+2]
+#ler a senha i e O(1), entao processos diferentes podem importar faixas de indices do mesmo arquivo
+MAGICA = b"GSSENHA1"
+_CABECALHO = struct.Struct("<8sQQII")
+_OFFSET = struct.Struct("<Q")
+BYTES_POR_SENHA_ESTIMADOS = 32
+SENHAS_POR_ESCRITA = 4096
+
+def largura_registro(gerador) -> int | None:
+    #largura fixa quando toda senha tem o mesmo numero de bytes: comprimento fixo e caracteres ASCII.
+    #aceita um GeradorSenhaCompilado ou um PadraoCompilado; frases tem tamanho variavel
+    if isinstance(gerador, GeradorFraseCompilado):
+        return None
+    if isinstance(gerador, GeradorSenhaCompilado):
+        caracteres, comprimento = str(gerador.alfabeto) + (gerador.texto_necessario or ""), gerador.comprimento_final
+    else:
+        caracteres, comprimento = "".join(gerador.alfabetos), gerador.comprimento
+    return comprimento if caracteres.isascii() else None
+
+def _preparar(arquivo, tamanho: int) -> mmap.mmap:
+    #reserva o espaco no disco de uma vez (quando o sistema permite) e mapeia o arquivo inteiro
+    arquivo.truncate(tamanho)
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(arquivo.fileno(), 0, tamanho)
+        except OSError:
+            pass
+    return mmap.mmap(arquivo.fileno(), tamanho)
+
+def escrever_arquivo_senhas(resultados: Iterable[ResultadoGeracao],
+                            caminho: str,
+                            quantidade: int,
+                            largura: int | None = None,
+                            bytes_por_senha: int = BYTES_POR_SENHA_ESTIMADOS,
+                            senhas_por_escrita: int = SENHAS_POR_ESCRITA) -> int:
+    #grava ate `quantidade` senhas direto no arquivo mapeado, em blocos de `senhas_por_escrita`: cada bloco
+    #vira um unico bytes (e um unico pacote de offsets), sem montar linhas de texto nem escrever senha a senha.
+    #com largura fixa o arquivo tem o tamanho final desde o inicio; sem ela, a area das senhas comeca com
+    #quantidade * bytes_por_senha e dobra quando enche. retorna o total escrito
+    if quantidade < 0:
+        raise ValueError("A quantidade de senhas não pode ser negativa.")
+    if largura is not None and largura <= 0:
+        raise ValueError("A largura dos registros deve ser positiva.")
+    if bytes_por_senha <= 0 or senhas_por_escrita <= 0:
+        raise ValueError("A estimativa de bytes por senha e o tamanho do bloco devem ser positivos.")
+
+    if largura:
+        inicio = _CABECALHO.size
+        capacidade = quantidade * largura
+    else:
+        inicio = _CABECALHO.size + _OFFSET.size * (quantidade + 1)
+        capacidade = quantidade * bytes_por_senha
+    #grava em um temporario e renomeia, para que leitores nunca vejam um arquivo pela metade
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    total = usado = 0
+    try:
+        with open(temporario, "w+b") as arquivo:
+            mapa = _preparar(arquivo, inicio + capacidade)
+            try:
+                senhas = (resultado.senha for resultado in resultados)
+                while total < quantidade:
+                    bloco = list(islice(senhas, min(senhas_por_escrita, quantidade - total)))
+                    if not bloco:
+                        break
+                    texto = "".join(bloco)
+                    dados = texto.encode("utf-8")
+                    #em texto ASCII o tamanho em bytes e o numero de caracteres; so os demais blocos sao codificados um a um
+                    tamanhos = list(map(len, bloco)) if texto.isascii() else [len(senha.encode("utf-8")) for senha in bloco]
+                    if largura:
+                        if any(tamanho != largura for tamanho in tamanhos):
+                            invalida = next(i for i, tamanho in enumerate(tamanhos) if tamanho != largura)
+                            raise ValueError(f"A senha {total + invalida} tem {tamanhos[invalida]} bytes, "
+                                             f"mas os registros têm {largura}.")
+                    else:
+                        if usado + len(dados) > capacidade:
+                            capacidade = max(2 * capacidade, usado + len(dados))
+                            mapa.close()
+                            mapa = _preparar(arquivo, inicio + capacidade)
+                        offsets = list(accumulate(tamanhos, initial=usado))[1:]
+                        posicao = _CABECALHO.size + _OFFSET.size * (total + 1)
+                        mapa[posicao:posicao + _OFFSET.size * len(offsets)] = struct.pack(f"<{len(offsets)}Q", *offsets)
+                    mapa[inicio + usado:inicio + usado + len(dados)] = dados
+                    usado += len(dados)
+                    total += len(bloco)
+                _CABECALHO.pack_into(mapa, 0, MAGICA, total, inicio, largura or 0, 0)
+                mapa.flush()
+            finally:
+                mapa.close()
+            #com menos senhas que o previsto, descarta o espaco reservado e nao usado
+            arquivo.truncate(inicio + usado)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    return total
+
+class ArquivoSenhas:
+    def __init__(self, caminho: str):
+        with open(caminho, "rb") as arquivo:
+            if os.fstat(arquivo.fileno()).st_size < _CABECALHO.size:
+                raise ValueError(f"Arquivo de senhas inválido: {caminho}.")
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        magica, self.quantidade, self._inicio, self.largura, _ = _CABECALHO.unpack_from(self._mapa)
+        if magica != MAGICA:
+            self._mapa.close()
+            raise ValueError(f"Arquivo de senhas inválido: {caminho}.")
+        self.caminho = caminho
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    def posicao(self, indice: int) -> tuple[int, int]:
+        #inicio e fim da senha `indice` no arquivo
+        if not 0 <= indice < self.quantidade:
+            raise IndexError(indice)
+        if self.largura:
+            inicio = self._inicio + indice * self.largura
+            return inicio, inicio + self.largura
+        inicio, fim = struct.unpack_from("<QQ", self._mapa, _CABECALHO.size + _OFFSET.size * indice)
+        return self._inicio + inicio, self._inicio + fim
+
+    def __getitem__(self, indice: int) -> str:
+        inicio, fim = self.posicao(indice)
+        return self._mapa[inicio:fim].decode("utf-8")
+
+    def bytes_senha(self, indice: int) -> memoryview:
+        #a senha sem copia nem decodificacao; deve ser liberada (release) antes de fechar o arquivo
+        inicio, fim = self.posicao(indice)
+        return memoryview(self._mapa)[inicio:fim]
+
+    def faixa(self, inicio: int, fim: int) -> Iterator[str]:
+        return (self[indice] for indice in range(inicio, min(fim, self.quantidade)))
+
+    def __iter__(self) -> Iterator[str]:
+        return self.faixa(0, self.quantidade)
+
+    def fechar(self) -> None:
+        self._mapa.close()
+
+    def __enter__(self) -> "ArquivoSenhas":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fechar()
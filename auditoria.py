@@ -0,0 +1,209 @@
+import mmap
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from alfabeto import normalizar
+from gerador_senha import (ConfiguracaoSenha, PoliticaForca, carregar_avaliador, MAX_COMPRIMENTO_AVALIADOR, CARACTERES_MAIUSCULOS,
+                           CARACTERES_MINUSCULOS, CARACTERES_NUMERICOS, CARACTERES_SIMBOLOS_PADRAO)
+
+#auditoria de senhas existentes (uma por linha) contra uma configuracao:
+#  comprimento minimo, presenca de cada classe selecionada, alfabeto permitido e texto necessario,
+#  com o score minimo do zxcvbn verificado apenas nas senhas que passam nas regras anteriores.
+#a saida de violacoes identifica a senha pelo numero da linha, sem repetir a senha
+CAMPOS_VIOLACAO = ("linha", "motivos", "score")
+LINHAS_POR_TAREFA = 512
+#classes exigiveis, na ordem dos motivos; _FORA marca caracteres fora do alfabeto na tabela de traducao
+_CLASSES = (("incluir_minusculas", "sem_minusculas"),
+            ("incluir_maiusculas", "sem_maiusculas"),
+            ("incluir_numeros", "sem_numeros"),
+            ("incluir_simbolos", "sem_simbolos"))
+_FORA = b"x"
+_PERMITIDO = b"."
+
+class RegrasAuditoria:
+    #compila a configuracao em tabelas de consulta: uma bytes.translate de 256 entradas marca os caracteres
+    #fora do alfabeto, e a presenca de cada classe e um translate que apaga os caracteres dela (tudo em C).
+    #cada classe tem o seu conjunto, entao um simbolo personalizado que tambem e letra conta nas duas, como
+    #no gerador. linhas com caracteres nao ASCII (raras) usam os conjuntos sobre a str decodificada
+    def __init__(self, config: ConfiguracaoSenha, politica: PoliticaForca | None = None):
+        if config.modo != "caracteres":
+            raise ValueError("A auditoria só suporta o modo caracteres.")
+        simbolos = CARACTERES_SIMBOLOS_PADRAO if config.simbolos_personalizados is None else normalizar(config.simbolos_personalizados)
+        alfabetos = (CARACTERES_MINUSCULOS, CARACTERES_MAIUSCULOS, CARACTERES_NUMERICOS, simbolos)
+
+        permitidos = set()
+        self.exigidos = []
+        for (campo, motivo), alfabeto in zip(_CLASSES, alfabetos):
+            if getattr(config, campo) and alfabeto:
+                conjunto = frozenset(alfabeto)
+                ascii_classe = "".join(caractere for caractere in conjunto if ord(caractere) < 128).encode("ascii")
+                self.exigidos.append((ascii_classe, conjunto, motivo))
+                permitidos |= conjunto
+        #o texto necessario e aceito mesmo com caracteres de fora das classes selecionadas. como no gerador,
+        #ele e procurado literalmente, sem normalizar
+        texto_necessario = config.texto_necessario or ""
+        permitidos.update(texto_necessario)
+
+        tabela = bytearray(_FORA * 256)
+        for caractere in permitidos:
+            if ord(caractere) < 128:
+                tabela[ord(caractere)] = _PERMITIDO[0]
+        self.tabela = bytes(tabela)
+        self.permitidos = frozenset(permitidos)
+        self.comprimento_minimo = config.comprimento
+        self.texto_necessario = texto_necessario or None
+
+        politica = politica if politica is not None else PoliticaForca()
+        #o score de uma senha escolhida por pessoas nao pode ser estimado pela entropia do alfabeto,
+        #entao qualquer politica diferente de "nenhuma" usa o zxcvbn
+        self.score_minimo = 0 if politica.modo == "nenhuma" else politica.score_minimo
+        self.avaliador = politica.avaliador
+
+    def verificar(self, linha: bytes) -> tuple[list[str], str | None]:
+        #motivos das violacoes estruturais e a senha decodificada (None se nao for UTF-8 valido)
+        motivos = []
+        if linha.isascii():
+            senha = linha.decode("ascii")
+            if len(linha) < self.comprimento_minimo:
+                motivos.append("comprimento")
+            for ascii_classe, _, motivo in self.exigidos:
+                if len(linha.translate(None, ascii_classe)) == len(linha):
+                    motivos.append(motivo)
+            fora = _FORA in linha.translate(self.tabela)
+        else:
+            try:
+                senha = linha.decode("utf-8")
+            except UnicodeDecodeError:
+                return ["utf8_invalido"], None
+            if len(senha) < self.comprimento_minimo:
+                motivos.append("comprimento")
+            for _, conjunto, motivo in self.exigidos:
+                if conjunto.isdisjoint(senha):
+                    motivos.append(motivo)
+            fora = not self.permitidos.issuperset(senha)
+
+        if fora:
+            motivos.append("caractere_nao_permitido")
+        if self.texto_necessario and self.texto_necessario not in senha:
+            motivos.append("sem_texto_necessario")
+        return motivos, senha
+
+class ResumoAuditoria:
+    def __init__(self):
+        self.linhas = 0
+        self.aprovadas = 0
+        self.reprovadas = 0
+        self.avaliadas_zxcvbn = 0
+        self.motivos = Counter()
+
+    def registrar(self, motivos: list[str]) -> None:
+        self.linhas += 1
+        if motivos:
+            self.reprovadas += 1
+            self.motivos.update(motivos)
+        else:
+            self.aprovadas += 1
+
+    def como_dict(self) -> dict:
+        return {"linhas": self.linhas, "aprovadas": self.aprovadas, "reprovadas": self.reprovadas,
+                "avaliadas_zxcvbn": self.avaliadas_zxcvbn, "motivos": dict(self.motivos.most_common())}
+
+    def resumo(self) -> str:
+        motivos = ", ".join(f"{motivo}: {n}" for motivo, n in self.motivos.most_common()) or "nenhum"
+        return (f"Auditoria: {self.linhas} senhas, {self.aprovadas} aprovadas, {self.reprovadas} reprovadas "
+                f"({self.avaliadas_zxcvbn} avaliadas pelo zxcvbn). Motivos: {motivos}")
+
+def ler_linhas(caminho: str) -> Iterator[bytes]:
+    #itera as linhas de um arquivo mapeado em memoria, sem carregar o arquivo nem decodificar tudo
+    with open(caminho, "rb") as arquivo:
+        if os.fstat(arquivo.fileno()).st_size == 0:
+            return
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            for linha in iter(mapa.readline, b""):
+                yield linha.rstrip(b"\r\n")
+
+def _pontuar_senhas(senhas: list[str], avaliador: str = "zxcvbn") -> list[int]:
+    avaliar = carregar_avaliador(avaliador)
+    return [avaliar(senha) for senha in senhas]
+
+def _blocos(linhas: Iterator[bytes], linhas_por_tarefa: int) -> Iterator[list[bytes]]:
+    bloco = []
+    for linha in linhas:
+        bloco.append(linha)
+        if len(bloco) >= linhas_por_tarefa:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+def _classificar(regras: RegrasAuditoria, bloco: list[bytes], primeira: int) -> tuple[list, list, list]:
+    #verifica as regras estruturais no processo principal; devolve (numero, motivos) de cada linha
+    #e as sobreviventes que ainda precisam do zxcvbn. senhas longas demais para o avaliador viram uma
+    #violacao propria em vez de interromper a auditoria
+    linhas, numeros_sobreviventes, sobreviventes = [], [], []
+    for numero, linha in enumerate(bloco, start=primeira):
+        motivos, senha = regras.verificar(linha)
+        if not motivos and regras.score_minimo:
+            if len(senha) > MAX_COMPRIMENTO_AVALIADOR:
+                motivos = ["acima_do_limite_do_avaliador"]
+            else:
+                numeros_sobreviventes.append(numero)
+                sobreviventes.append(senha)
+        linhas.append((numero, motivos))
+    return linhas, numeros_sobreviventes, sobreviventes
+
+def _mesclar(regras: RegrasAuditoria, resumo: ResumoAuditoria, linhas: list, numeros: list, scores: list) -> Iterator[dict]:
+    scores_por_linha = dict(zip(numeros, scores))
+    resumo.avaliadas_zxcvbn += len(scores)
+    for numero, motivos in linhas:
+        score = scores_por_linha.get(numero)
+        if score is not None and score < regras.score_minimo:
+            motivos = ["score"]
+        resumo.registrar(motivos)
+        if motivos:
+            yield {"linha": numero, "motivos": ",".join(motivos), "score": score}
+
+def auditar_arquivo(caminho: str,
+                    config: ConfiguracaoSenha,
+                    politica: PoliticaForca | None = None,
+                    workers: int = 1,
+                    linhas_por_tarefa: int = LINHAS_POR_TAREFA,
+                    resumo: ResumoAuditoria | None = None) -> Iterator[dict]:
+    #fluxo de violacoes na ordem do arquivo. as regras estruturais rodam no processo principal e so as
+    #sobreviventes vao para o zxcvbn, distribuidas em tarefas de `linhas_por_tarefa` linhas entre os workers
+    if workers <= 0:
+        raise ValueError("O número de workers deve ser positivo.")
+    if linhas_por_tarefa <= 0:
+        raise ValueError("O número de linhas por tarefa deve ser positivo.")
+    regras = RegrasAuditoria(config, politica)
+    resumo = resumo if resumo is not None else ResumoAuditoria()
+    if not os.path.isfile(caminho):
+        raise ValueError(f"Arquivo de senhas não encontrado: {caminho}")
+    blocos = _blocos(ler_linhas(caminho), linhas_por_tarefa)
+
+    def violacoes_sequencial():
+        primeira = 1
+        for bloco in blocos:
+            linhas, numeros, senhas = _classificar(regras, bloco, primeira)
+            yield from _mesclar(regras, resumo, linhas, numeros, _pontuar_senhas(senhas, regras.avaliador) if senhas else [])
+            primeira += len(bloco)
+
+    def violacoes_pool():
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            #fila em ordem de leitura, com no maximo 2 tarefas por worker pendentes
+            pendentes = deque()
+            primeira = 1
+            for bloco in blocos:
+                linhas, numeros, senhas = _classificar(regras, bloco, primeira)
+                primeira += len(bloco)
+                pendentes.append((linhas, numeros, executor.submit(_pontuar_senhas, senhas, regras.avaliador) if senhas else None))
+                while len(pendentes) >= 2 * workers:
+                    linhas, numeros, futuro = pendentes.popleft()
+                    yield from _mesclar(regras, resumo, linhas, numeros, futuro.result() if futuro else [])
+            while pendentes:
+                linhas, numeros, futuro = pendentes.popleft()
+                yield from _mesclar(regras, resumo, linhas, numeros, futuro.result() if futuro else [])
+
+    return violacoes_sequencial() if workers == 1 or not regras.score_minimo else violacoes_pool()
@@ -0,0 +1,682 @@
+import hashlib
+import importlib.util
+import json
+import mmap
+import os
+import random
+import re
+import string
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from decimal import Decimal
+from functools import lru_cache
+from math import factorial
+
+#avaliador de forca compativel com o zxcvbn: os dicionarios de frequencia viram um automato de Aho-Corasick
+#compilado em disco (uma vez, no diretorio de cache) e apenas mapeado em memoria depois. cada passada pela
+#senha encontra todas as palavras de todos os dicionarios, no lugar das O(n^2) fatias testadas em cada
+#dicionario pelo zxcvbn. a adjacencia dos teclados, a tabela l33t e as constantes de pontuacao dos teclados
+#tambem vao para o arquivo compilado. os demais padroes (repeticoes, sequencias, datas, regex) e a pontuacao
+#sao reimplementados aqui com as mesmas regras do zxcvbn, entao o score e o mesmo que zxcvbn(senha)["score"]
+#e abrir o automato nunca importa o zxcvbn (cujo __init__ monta todos os dicionarios ranqueados)
+#formato binario (uint32 na ordem nativa; o arquivo e compilado na propria maquina):
+#  MAGICA | nos | saidas | dicionarios | bytes dos nomes | bytes das tabelas auxiliares |
+#  nomes em UTF-8 separados por \n (alinhados a 4) | tabelas auxiliares em JSON (alinhadas a 4) |
+#  primeiro filho (nos+1) | rotulos (nos-1) | destinos (nos-1) | falha (nos) | proxima saida (nos) |
+#  profundidade (nos) | inicio das saidas (nos+1) | dicionario de cada saida (saidas) | rank de cada saida (saidas)
+MAGICA = b"GSAUTOM2"
+_CABECALHO = struct.Struct("<8sIIIII")
+VERSAO_AUTOMATO = "2"
+
+def _dicionarios() -> list[tuple[str, list[str]]]:
+    #mesma ordem e mesmos ranks de zxcvbn.matching.RANKED_DICTIONARIES (o rank e a posicao na lista, a partir de 1)
+    from zxcvbn.frequency_lists import FREQUENCY_LISTS
+    return list(FREQUENCY_LISTS.items())
+
+def _tabelas_auxiliares() -> dict:
+    #teclados, substituicoes l33t e teclas com shift do zxcvbn instalado. cada teclado guarda
+    #prev+atual -> [direcao, shift] com a primeira direcao em que o zxcvbn encontraria `atual`, e as
+    #posicoes iniciais e o grau medio que o zxcvbn usa para pontuar passeios nele
+    from zxcvbn import matching, scoring
+    teclados = []
+    for nome, grafo in matching.GRAPHS.items():
+        passos = {}
+        for anterior, adjacentes in grafo.items():
+            for direcao, adjacente in enumerate(adjacentes):
+                for posicao, caractere in enumerate(adjacente or ""):
+                    passos.setdefault(anterior + caractere, [direcao, posicao == 1])
+        if nome in ("qwerty", "dvorak"):
+            posicoes, grau = scoring.KEYBOARD_STARTING_POSITIONS, scoring.KEYBOARD_AVERAGE_DEGREE
+        else:
+            posicoes, grau = scoring.KEYPAD_STARTING_POSITIONS, scoring.KEYPAD_AVERAGE_DEGREE
+        teclados.append({"nome": nome, "conta_shift": nome in ("qwerty", "dvorak"), "passos": passos,
+                         "posicoes": posicoes, "grau": grau})
+    shift = "".join(chr(c) for c in range(128) if matching.SHIFTED_RX.search(chr(c)))
+    return {"teclados": teclados, "l33t": matching.L33T_TABLE, "shift": shift}
+
+def compilar_automato(destino: str) -> int:
+    dicionarios = _dicionarios()
+    filhos = [{}]
+    terminais = {}
+    for indice, (_, palavras) in enumerate(dicionarios):
+        for rank, palavra in enumerate(palavras, start=1):
+            if not palavra:
+                continue
+            no = 0
+            for caractere in palavra:
+                proximo = filhos[no].get(caractere)
+                if proximo is None:
+                    proximo = filhos[no][caractere] = len(filhos)
+                    filhos.append({})
+                no = proximo
+            #palavras repetidas no mesmo dicionario ficam com o ultimo rank, como no dict do zxcvbn
+            terminais.setdefault(no, {})[indice] = rank
+
+    #renumera em largura: os filhos de cada no ficam contiguos e ordenados pelo codigo do caractere
+    ordem = [0]
+    novo = {0: 0}
+    for no in ordem:
+        for caractere in sorted(filhos[no], key=ord):
+            novo[filhos[no][caractere]] = len(ordem)
+            ordem.append(filhos[no][caractere])
+    quantidade = len(ordem)
+    primeiro, rotulos, destinos = array("I", [0] * (quantidade + 1)), array("I"), array("I")
+    profundidade = array("I", [0] * quantidade)
+    for posicao, no in enumerate(ordem):
+        primeiro[posicao] = len(rotulos)
+        for caractere in sorted(filhos[no], key=ord):
+            rotulos.append(ord(caractere))
+            destinos.append(novo[filhos[no][caractere]])
+            profundidade[novo[filhos[no][caractere]]] = profundidade[posicao] + 1
+    primeiro[quantidade] = len(rotulos)
+
+    inicio_saidas, saidas_dicionario, saidas_rank = array("I", [0] * (quantidade + 1)), array("I"), array("I")
+    for posicao, no in enumerate(ordem):
+        inicio_saidas[posicao] = len(saidas_dicionario)
+        for indice, rank in sorted(terminais.get(no, {}).items()):
+            saidas_dicionario.append(indice)
+            saidas_rank.append(rank)
+    inicio_saidas[quantidade] = len(saidas_dicionario)
+
+    #falha: maior sufixo proprio que tambem e prefixo de alguma palavra; saida: proximo no terminal nessa cadeia
+    falha, saida = array("I", [0] * quantidade), array("I", [0] * quantidade)
+    fila = deque(destinos[primeiro[0]:primeiro[1]])
+    while fila:
+        no = fila.popleft()
+        for aresta in range(primeiro[no], primeiro[no + 1]):
+            filho, caractere = destinos[aresta], rotulos[aresta]
+            candidato = falha[no]
+            while True:
+                alvo = _transicao(primeiro, rotulos, destinos, candidato, caractere)
+                if alvo is not None or candidato == 0:
+                    break
+                candidato = falha[candidato]
+            falha[filho] = alvo if alvo is not None else 0
+            saida[filho] = falha[filho] if inicio_saidas[falha[filho]] < inicio_saidas[falha[filho] + 1] else saida[falha[filho]]
+            fila.append(filho)
+
+    nomes = "\n".join(nome for nome, _ in dicionarios).encode("utf-8")
+    nomes += b"\0" * (-len(nomes) % 4)
+    auxiliares = json.dumps(_tabelas_auxiliares()).encode("utf-8")
+    auxiliares += b" " * (-len(auxiliares) % 4)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(MAGICA, quantidade, len(saidas_dicionario), len(dicionarios), len(nomes),
+                                      len(auxiliares)))
+        arquivo.write(nomes)
+        arquivo.write(auxiliares)
+        for tabela in (primeiro, rotulos, destinos, falha, saida, profundidade, inicio_saidas, saidas_dicionario, saidas_rank):
+            tabela.tofile(arquivo)
+    os.replace(temporario, destino)
+    return quantidade
+
+def _transicao(primeiro, rotulos, destinos, no: int, caractere: int) -> int | None:
+    inicio, fim = primeiro[no], primeiro[no + 1]
+    k = bisect_left(rotulos, caractere, inicio, fim)
+    if k < fim and rotulos[k] == caractere:
+        return destinos[k]
+    return None
+
+#padroes e pontuacao do zxcvbn (matching.py e scoring.py), reimplementados para nao importar a biblioteca
+_ANO_REFERENCIA = 2017
+_MIN_ESPACO_ANOS = 20
+_CARDINALIDADE_FORCA_BRUTA = 10
+_MIN_PALPITES_SEQUENCIA_MAIOR = 10000
+_MIN_PALPITES_SUBCASAMENTO_UNICO = 10
+_MIN_PALPITES_SUBCASAMENTO = 50
+_MAX_DELTA_SEQUENCIA = 5
+_ANO_MINIMO_DATA, _ANO_MAXIMO_DATA = 1000, 2050
+#para cada comprimento de data sem separador, onde comecam a segunda e a terceira parte
+_DIVISOES_DATA = {4: ((1, 2), (2, 3)), 5: ((1, 3), (2, 3)), 6: ((1, 2), (2, 4), (4, 5)),
+                  7: ((1, 3), (2, 3), (4, 5), (4, 6)), 8: ((2, 4), (4, 6))}
+
+_REPETICAO_GULOSA = re.compile(r"(.+)\1+")
+_REPETICAO_PREGUICOSA = re.compile(r"(.+?)\1+")
+_REPETICAO_ANCORADA = re.compile(r"^(.+?)\1+$")
+_ANO_RECENTE = re.compile(r"19\d\d|200\d|201\d")
+_DATA_SEM_SEPARADOR = re.compile(r"^\d{4,8}$")
+_DATA_COM_SEPARADOR = re.compile(r"^(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})$")
+_SEQUENCIA_MINUSCULAS = re.compile(r"^[a-z]+$")
+_SEQUENCIA_MAIUSCULAS = re.compile(r"^[A-Z]+$")
+_SEQUENCIA_DIGITOS = re.compile(r"^\d+$")
+_DIGITO = re.compile(r"\d")
+_MAIUSCULA_INICIAL = re.compile(r"^[A-Z][^A-Z]+$")
+_MAIUSCULA_FINAL = re.compile(r"^[^A-Z]+[A-Z]$")
+_SEM_MINUSCULAS = re.compile(r"^[^a-z]+$")
+_SEM_MAIUSCULAS = re.compile(r"^[^A-Z]+$")
+
+def _enumerar_l33t(tabela: dict) -> list[dict]:
+    #todas as combinacoes de substituicoes da subtabela, na ordem de zxcvbn.matching.enumerate_l33t_subs
+    subs = [[]]
+    for letra, trocas in tabela.items():
+        proximas = []
+        for troca in trocas:
+            for sub in subs:
+                repetida = next((k for k, (l33t, _) in enumerate(sub) if l33t == troca), -1)
+                if repetida == -1:
+                    proximas.append(sub + [(troca, letra)])
+                else:
+                    alternativa = sub[:repetida] + sub[repetida + 1:] + [(troca, letra)]
+                    proximas.append(sub)
+                    proximas.append(alternativa)
+        vistas = set()
+        subs = []
+        for sub in proximas:
+            rotulo = tuple(sorted((letra, troca) for troca, letra in sub))
+            if rotulo not in vistas:
+                vistas.add(rotulo)
+                subs.append(sub)
+    return [dict(sub) for sub in subs]
+
+def _repeticoes(senha: str, avaliar_base) -> list[dict]:
+    casamentos = []
+    inicio = 0
+    while inicio < len(senha):
+        guloso = _REPETICAO_GULOSA.search(senha, inicio)
+        if not guloso:
+            break
+        preguicoso = _REPETICAO_PREGUICOSA.search(senha, inicio)
+        if len(guloso.group(0)) > len(preguicoso.group(0)):
+            #"aabaab": a repeticao gulosa pode ela mesma ser repetida; a ancorada acha a menor base
+            casamento = guloso
+            base = _REPETICAO_ANCORADA.search(casamento.group(0)).group(1)
+        else:
+            casamento = preguicoso
+            base = casamento.group(1)
+        i, j = casamento.start(), casamento.end() - 1
+        casamentos.append({"pattern": "repeat", "i": i, "j": j, "token": casamento.group(0), "base_token": base,
+                           "base_guesses": avaliar_base(base), "repeat_count": len(casamento.group(0)) / len(base)})
+        inicio = j + 1
+    return casamentos
+
+def _sequencias(senha: str) -> list[dict]:
+    #trechos em que a diferenca entre codigos consecutivos e constante (abc, 9753, zyx)
+    if len(senha) == 1:
+        return []
+    casamentos = []
+
+    def registrar(i, j, delta):
+        if (j - i > 1 or (delta and abs(delta) == 1)) and 0 < abs(delta) <= _MAX_DELTA_SEQUENCIA:
+            token = senha[i:j + 1]
+            if _SEQUENCIA_MINUSCULAS.match(token):
+                nome, espaco = "lower", 26
+            elif _SEQUENCIA_MAIUSCULAS.match(token):
+                nome, espaco = "upper", 26
+            elif _SEQUENCIA_DIGITOS.match(token):
+                nome, espaco = "digits", 10
+            else:
+                nome, espaco = "unicode", 26
+            casamentos.append({"pattern": "sequence", "i": i, "j": j, "token": token, "sequence_name": nome,
+                               "sequence_space": espaco, "ascending": delta > 0})
+
+    i, ultimo_delta = 0, None
+    for k in range(1, len(senha)):
+        delta = ord(senha[k]) - ord(senha[k - 1])
+        if ultimo_delta is None:
+            ultimo_delta = delta
+        if delta == ultimo_delta:
+            continue
+        registrar(i, k - 1, ultimo_delta)
+        i, ultimo_delta = k - 1, delta
+    registrar(i, len(senha) - 1, ultimo_delta)
+    return casamentos
+
+def _anos_recentes(senha: str) -> list[dict]:
+    return [{"pattern": "regex", "i": ano.start(), "j": ano.end() - 1, "token": ano.group(0),
+             "regex_name": "recent_year"} for ano in _ANO_RECENTE.finditer(senha)]
+
+def _dia_mes(a: int, b: int) -> tuple[int, int] | None:
+    for dia, mes in ((a, b), (b, a)):
+        if 1 <= dia <= 31 and 1 <= mes <= 12:
+            return dia, mes
+    return None
+
+def _data(numeros: tuple[int, int, int]) -> tuple[int, int, int] | None:
+    #(ano, mes, dia) para tres inteiros, com as mesmas regras de zxcvbn.matching.map_ints_to_dmy
+    if numeros[1] > 31 or numeros[1] <= 0:
+        return None
+    if any(99 < numero < _ANO_MINIMO_DATA or numero > _ANO_MAXIMO_DATA for numero in numeros):
+        return None
+    if (sum(numero > 31 for numero in numeros) >= 2 or sum(numero > 12 for numero in numeros) == 3
+            or sum(numero <= 0 for numero in numeros) >= 2):
+        return None
+    divisoes = ((numeros[2], numeros[0:2]), (numeros[0], numeros[1:3]))
+    for ano, resto in divisoes:
+        if _ANO_MINIMO_DATA <= ano <= _ANO_MAXIMO_DATA:
+            #com um ano de quatro digitos, o resto precisa ser dia e mes
+            dia_mes = _dia_mes(*resto)
+            return None if dia_mes is None else (ano, dia_mes[1], dia_mes[0])
+    for ano, resto in divisoes:
+        dia_mes = _dia_mes(*resto)
+        if dia_mes:
+            if ano <= 99:
+                ano += 1900 if ano > 50 else 2000
+            return ano, dia_mes[1], dia_mes[0]
+    return None
+
+def _datas(senha: str) -> list[dict]:
+    casamentos = []
+    n = len(senha)
+    #sem separador: de 4 ("1191") a 8 ("11111991") digitos; fica a leitura com o ano mais proximo da referencia
+    for i in range(n - 3):
+        for j in range(i + 3, min(i + 8, n)):
+            token = senha[i:j + 1]
+            if not _DATA_SEM_SEPARADOR.match(token):
+                continue
+            candidatas = [data for k, l in _DIVISOES_DATA[len(token)]
+                          if (data := _data((int(token[:k]), int(token[k:l]), int(token[l:]))))]
+            if not candidatas:
+                continue
+            ano, mes, dia = min(candidatas, key=lambda data: abs(data[0] - _ANO_REFERENCIA))
+            casamentos.append({"pattern": "date", "i": i, "j": j, "token": token, "separator": "",
+                               "year": ano, "month": mes, "day": dia})
+    #com separador: de 6 ("1/1/91") a 10 ("11/11/1991") caracteres
+    for i in range(n - 5):
+        for j in range(i + 5, min(i + 10, n)):
+            token = senha[i:j + 1]
+            partes = _DATA_COM_SEPARADOR.match(token)
+            if not partes:
+                continue
+            data = _data((int(partes.group(1)), int(partes.group(3)), int(partes.group(4))))
+            if not data:
+                continue
+            casamentos.append({"pattern": "date", "i": i, "j": j, "token": token, "separator": partes.group(2),
+                               "year": data[0], "month": data[1], "day": data[2]})
+    #descarta as datas contidas em outras ("2015_06_04" tambem casaria "15_06_04", "5_06_04"...)
+    return [casamento for casamento in casamentos
+            if not any(outro is not casamento and outro["i"] <= casamento["i"] and outro["j"] >= casamento["j"]
+                       for outro in casamentos)]
+
+def _combinacoes(n: int, k: int) -> float:
+    #mesmo calculo em ponto flutuante de zxcvbn.scoring.nCk, para que os palpites sejam identicos
+    if k > n:
+        return 0
+    if k == 0:
+        return 1
+    resultado = 1
+    for d in range(1, k + 1):
+        resultado *= n
+        resultado /= d
+        n -= 1
+    return resultado
+
+def _variacoes(trocadas: int, mantidas: int) -> float:
+    if trocadas == 0 or mantidas == 0:
+        return 2
+    return sum(_combinacoes(trocadas + mantidas, i) for i in range(1, min(trocadas, mantidas) + 1))
+
+def _variacoes_maiusculas(token: str):
+    if _SEM_MAIUSCULAS.match(token) or token.lower() == token:
+        return 1
+    if _MAIUSCULA_INICIAL.match(token) or _MAIUSCULA_FINAL.match(token) or _SEM_MINUSCULAS.match(token):
+        return 2
+    maiusculas = sum(1 for c in token if c.isupper())
+    minusculas = sum(1 for c in token if c.islower())
+    return sum(_combinacoes(maiusculas + minusculas, i) for i in range(1, min(maiusculas, minusculas) + 1))
+
+def _variacoes_l33t(casamento: dict):
+    if not casamento.get("l33t"):
+        return 1
+    variacoes = 1
+    token = casamento["token"].lower()
+    for troca, letra in casamento["sub"].items():
+        variacoes *= _variacoes(token.count(troca), token.count(letra))
+    return variacoes
+
+def _palpites_dicionario(casamento: dict):
+    return (casamento["rank"] * _variacoes_maiusculas(casamento["token"]) * _variacoes_l33t(casamento)
+            * (2 if casamento["reversed"] else 1))
+
+def _palpites_forca_bruta(casamento: dict):
+    #sempre um palpite acima do minimo de um subcasamento, para que outros padroes no mesmo trecho ganhem
+    minimo = _MIN_PALPITES_SUBCASAMENTO_UNICO if len(casamento["token"]) == 1 else _MIN_PALPITES_SUBCASAMENTO
+    return max(_CARDINALIDADE_FORCA_BRUTA ** len(casamento["token"]), minimo + 1)
+
+def _palpites_teclado(casamento: dict):
+    posicoes, grau = casamento["posicoes"], casamento["grau"]
+    palpites = 0
+    voltas = casamento["turns"]
+    #passeios de comprimento ate L com ate `voltas` mudancas de direcao
+    for i in range(2, len(casamento["token"]) + 1):
+        for j in range(1, min(voltas, i - 1) + 1):
+            palpites += _combinacoes(i - 1, j - 1) * posicoes * pow(grau, j)
+    if casamento["shifted_count"]:
+        deslocadas = casamento["shifted_count"]
+        palpites *= _variacoes(deslocadas, len(casamento["token"]) - deslocadas)
+    return palpites
+
+def _palpites_repeticao(casamento: dict):
+    return casamento["base_guesses"] * Decimal(casamento["repeat_count"])
+
+def _palpites_sequencia(casamento: dict):
+    primeiro = casamento["token"][:1]
+    if primeiro in ("a", "A", "z", "Z", "0", "1", "9"):
+        base = 4
+    elif _DIGITO.match(primeiro):
+        base = 10
+    else:
+        base = 26
+    if not casamento["ascending"]:
+        base *= 2
+    return base * len(casamento["token"])
+
+def _palpites_ano(casamento: dict):
+    return max(abs(int(casamento["token"]) - _ANO_REFERENCIA), _MIN_ESPACO_ANOS)
+
+def _palpites_data(casamento: dict):
+    palpites = max(abs(casamento["year"] - _ANO_REFERENCIA), _MIN_ESPACO_ANOS) * 365
+    return palpites * 4 if casamento["separator"] else palpites
+
+_ESTIMATIVAS = {"bruteforce": _palpites_forca_bruta, "dictionary": _palpites_dicionario, "spatial": _palpites_teclado,
+                "repeat": _palpites_repeticao, "sequence": _palpites_sequencia, "regex": _palpites_ano,
+                "date": _palpites_data}
+
+def _estimar(casamento: dict, senha: str) -> Decimal:
+    if casamento.get("guesses"):
+        return Decimal(casamento["guesses"])
+    minimo = 1
+    if len(casamento["token"]) < len(senha):
+        minimo = _MIN_PALPITES_SUBCASAMENTO_UNICO if len(casamento["token"]) == 1 else _MIN_PALPITES_SUBCASAMENTO
+    casamento["guesses"] = max(_ESTIMATIVAS[casamento["pattern"]](casamento), minimo)
+    return Decimal(casamento["guesses"])
+
+def menor_palpite(senha: str, casamentos: list[dict]):
+    #zxcvbn.scoring.most_guessable_match_sequence: programacao dinamica sobre as sequencias de casamentos
+    #sem sobreposicao, minimizando l! * produto dos palpites + 10000^(l-1); devolve so o total de palpites
+    n = len(senha)
+    if n == 0:
+        return 1
+    por_fim = [[] for _ in range(n)]
+    for casamento in casamentos:
+        por_fim[casamento["j"]].append(casamento)
+    for lista in por_fim:
+        lista.sort(key=lambda casamento: casamento["i"])
+    #por posicao final k e comprimento l da sequencia: ultimo casamento, produto dos palpites e total
+    ultimo = [{} for _ in range(n)]
+    produto = [{} for _ in range(n)]
+    total = [{} for _ in range(n)]
+
+    def atualizar(casamento, l):
+        k = casamento["j"]
+        pi = _estimar(casamento, senha)
+        if l > 1:
+            pi = pi * Decimal(produto[casamento["i"] - 1][l - 1])
+        g = factorial(l) * pi + _MIN_PALPITES_SEQUENCIA_MAIOR ** (l - 1)
+        for l_concorrente, g_concorrente in total[k].items():
+            if l_concorrente <= l and g_concorrente <= g:
+                return
+        total[k][l] = g
+        ultimo[k][l] = casamento
+        produto[k][l] = pi
+
+    def forca_bruta(i, j):
+        return {"pattern": "bruteforce", "token": senha[i:j + 1], "i": i, "j": j}
+
+    for k in range(n):
+        for casamento in por_fim[k]:
+            if casamento["i"] > 0:
+                for l in list(ultimo[casamento["i"] - 1]):
+                    atualizar(casamento, l + 1)
+            else:
+                atualizar(casamento, 1)
+        atualizar(forca_bruta(0, k), 1)
+        for i in range(1, k + 1):
+            casamento = forca_bruta(i, k)
+            for l, anterior in list(ultimo[i - 1].items()):
+                #duas forcas brutas vizinhas nunca sao otimas: uma so cobrindo o mesmo trecho e melhor
+                if anterior["pattern"] != "bruteforce":
+                    atualizar(casamento, l + 1)
+    return min(total[n - 1].values())
+
+def palpites_para_score(palpites) -> int:
+    #zxcvbn.time_estimates.guesses_to_score
+    for score, limite in enumerate((1e3, 1e6, 1e8, 1e10)):
+        if palpites < limite + 5:
+            return score
+    return 4
+
+class AutomatoDicionarios:
+    def __init__(self, caminho: str):
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapa) < _CABECALHO.size:
+            raise ValueError(f"Automato de dicionários inválido: {caminho}.")
+        magica, nos, saidas, dicionarios, tamanho_nomes, tamanho_auxiliares = _CABECALHO.unpack_from(self._mapa)
+        if magica != MAGICA:
+            raise ValueError(f"Automato de dicionários inválido: {caminho}.")
+        posicao = _CABECALHO.size
+        self.dicionarios = bytes(self._mapa[posicao:posicao + tamanho_nomes]).rstrip(b"\0").decode("utf-8").split("\n")
+        posicao += tamanho_nomes
+        auxiliares = json.loads(self._mapa[posicao:posicao + tamanho_auxiliares])
+        posicao += tamanho_auxiliares
+        self._teclados = tuple((teclado["nome"], {passo: tuple(valor) for passo, valor in teclado["passos"].items()},
+                                teclado["conta_shift"], teclado["posicoes"], teclado["grau"])
+                               for teclado in auxiliares["teclados"])
+        self._tabela_l33t = auxiliares["l33t"]
+        self._caracteres_l33t = frozenset(c for trocas in self._tabela_l33t.values() for c in trocas)
+        self._shift = frozenset(auxiliares["shift"])
+        self._substituicoes_l33t = lru_cache(maxsize=4096)(self._enumerar_substituicoes)
+        visao = memoryview(self._mapa)
+        tabelas = []
+        for tamanho in (nos + 1, nos - 1, nos - 1, nos, nos, nos, nos + 1, saidas, saidas):
+            tabelas.append(visao[posicao:posicao + 4 * tamanho].cast("I"))
+            posicao += 4 * tamanho
+        (self._primeiro, self._rotulos, self._destinos, self._falha, self._saida,
+         self._profundidade, self._inicio_saidas, self._saidas_dicionario, self._saidas_rank) = tabelas
+        self.nos = nos
+        self.caminho = caminho
+
+    def ocorrencias(self, texto: str):
+        #(i, j, indice do dicionario, rank) de cada palavra que termina em cada posicao j, numa unica passada
+        primeiro, rotulos, destinos, falha = self._primeiro, self._rotulos, self._destinos, self._falha
+        saida, profundidade, inicio, dicionario, rank = (self._saida, self._profundidade, self._inicio_saidas,
+                                                         self._saidas_dicionario, self._saidas_rank)
+        no = 0
+        for j, caractere in enumerate(texto):
+            codigo = ord(caractere)
+            while True:
+                lo, hi = primeiro[no], primeiro[no + 1]
+                k = bisect_left(rotulos, codigo, lo, hi)
+                if k < hi and rotulos[k] == codigo:
+                    no = destinos[k]
+                    break
+                if no == 0:
+                    break
+                no = falha[no]
+            terminal = no if inicio[no] < inicio[no + 1] else saida[no]
+            while terminal:
+                i = j - profundidade[terminal] + 1
+                for s in range(inicio[terminal], inicio[terminal + 1]):
+                    yield i, j, dicionario[s], rank[s]
+                terminal = saida[terminal]
+
+    def _dicionario(self, senha: str) -> list[dict]:
+        #lower() pode alongar a senha ("İ" vira dois caracteres); como o zxcvbn, so olhamos as
+        #len(senha) primeiras posicoes
+        minusculas = senha.lower()[:len(senha)]
+        nomes = self.dicionarios
+        return [{"pattern": "dictionary", "i": i, "j": j, "token": senha[i:j + 1], "matched_word": minusculas[i:j + 1],
+                 "rank": rank, "dictionary_name": nomes[indice], "reversed": False, "l33t": False}
+                for i, j, indice, rank in self.ocorrencias(minusculas)]
+
+    def _reverso(self, senha: str) -> list[dict]:
+        casamentos = self._dicionario(senha[::-1])
+        ultimo = len(senha) - 1
+        for casamento in casamentos:
+            casamento["token"] = casamento["token"][::-1]
+            casamento["reversed"] = True
+            casamento["i"], casamento["j"] = ultimo - casamento["j"], ultimo - casamento["i"]
+        return casamentos
+
+    def _enumerar_substituicoes(self, presentes: frozenset) -> tuple:
+        #so as trocas l33t que aparecem na senha, como zxcvbn.matching.relevant_l33t_subtable
+        subtabela = {}
+        for letra, trocas in self._tabela_l33t.items():
+            relevantes = [troca for troca in trocas if troca in presentes]
+            if relevantes:
+                subtabela[letra] = relevantes
+        if not subtabela:
+            return ()
+        return tuple((sub, str.maketrans(sub)) for sub in _enumerar_l33t(subtabela))
+
+    def _l33t(self, senha: str) -> list[dict]:
+        casamentos = []
+        nomes = self.dicionarios
+        for sub, tabela in self._substituicoes_l33t(self._caracteres_l33t.intersection(senha)):
+            minusculas = senha.translate(tabela).lower()[:len(senha)]
+            for i, j, indice, rank in self.ocorrencias(minusculas):
+                token = senha[i:j + 1]
+                palavra = minusculas[i:j + 1]
+                #so vale o casamento que realmente usa uma substituicao
+                if j == i or token.lower() == palavra:
+                    continue
+                usadas = {l33t: letra for l33t, letra in sub.items() if l33t in token}
+                casamentos.append({"pattern": "dictionary", "i": i, "j": j, "token": token, "matched_word": palavra,
+                                   "rank": rank, "dictionary_name": nomes[indice], "reversed": False, "l33t": True,
+                                   "sub": usadas, "sub_display": ", ".join(f"{k} -> {v}" for k, v in usadas.items())})
+        return casamentos
+
+    def _teclado(self, senha: str) -> list[dict]:
+        casamentos = []
+        n = len(senha)
+        for nome, tabela, conta_shift, posicoes, grau in self._teclados:
+            i = 0
+            while i < n - 1:
+                j = i + 1
+                ultima_direcao, voltas = None, 0
+                deslocadas = 1 if conta_shift and senha[i] in self._shift else 0
+                while j < n:
+                    passo = tabela.get(senha[j - 1:j + 1])
+                    if passo is None:
+                        break
+                    direcao, deslocada = passo
+                    deslocadas += deslocada
+                    if ultima_direcao != direcao:
+                        voltas += 1
+                        ultima_direcao = direcao
+                    j += 1
+                if j - i > 2:
+                    casamentos.append({"pattern": "spatial", "i": i, "j": j - 1, "token": senha[i:j], "graph": nome,
+                                       "turns": voltas, "shifted_count": deslocadas,
+                                       "posicoes": posicoes, "grau": grau})
+                i = j
+        return casamentos
+
+    def casamentos(self, senha: str) -> list[dict]:
+        #equivalente a zxcvbn.matching.omnimatch(senha), na mesma ordem
+        casamentos = self._dicionario(senha) + self._reverso(senha) + self._l33t(senha) + self._teclado(senha)
+        casamentos += _repeticoes(senha, self.palpites)
+        casamentos += _sequencias(senha) + _anos_recentes(senha) + _datas(senha)
+        casamentos.sort(key=lambda casamento: (casamento["i"], casamento["j"]))
+        return casamentos
+
+    def palpites(self, senha: str):
+        return menor_palpite(senha, self.casamentos(senha))
+
+    def score(self, senha: str) -> int:
+        return palpites_para_score(self.palpites(senha))
+
+    def fechar(self) -> None:
+        self._primeiro = self._rotulos = self._destinos = self._falha = self._saida = None
+        self._profundidade = self._inicio_saidas = self._saidas_dicionario = self._saidas_rank = None
+        self._mapa.close()
+
+def caminho_compilado() -> str:
+    #o nome do arquivo muda junto com os modulos do zxcvbn de que o automato e compilado; find_spec localiza o
+    #pacote sem executa-lo (importlib.metadata sozinho ja custaria mais que abrir o automato)
+    from gerador_senha import diretorio_cache
+    especificacao = importlib.util.find_spec("zxcvbn")
+    origem = "desconhecida"
+    if especificacao is not None and especificacao.submodule_search_locations:
+        pasta = especificacao.submodule_search_locations[0]
+        origem = pasta
+        for modulo in ("frequency_lists.py", "adjacency_graphs.py", "matching.py", "scoring.py"):
+            try:
+                estado = os.stat(os.path.join(pasta, modulo))
+            except OSError:
+                continue
+            origem += f":{modulo}:{estado.st_size}:{estado.st_mtime_ns}"
+    resumo = hashlib.sha256(f"{VERSAO_AUTOMATO}:{origem}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(diretorio_cache(), f"automato-{resumo}.bin")
+
+#automato aberto neste processo, por arquivo compilado
+_automatos: dict[str, AutomatoDicionarios] = {}
+
+def carregar_automato() -> AutomatoDicionarios:
+    #compila o automato na primeira vez (alguns segundos) e depois so o mapeia
+    destino = caminho_compilado()
+    automato = _automatos.get(destino)
+    if automato is None:
+        if not os.path.exists(destino):
+            compilar_automato(destino)
+        automato = _automatos[destino] = AutomatoDicionarios(destino)
+    return automato
+
+def score(senha: str) -> int:
+    return carregar_automato().score(senha)
+
+def corpus_validacao(quantidade_aleatorias: int = 400, semente: int = 20240601) -> list[str]:
+    #corpus fixo para comparar com o zxcvbn: senhas comuns e suas variacoes (maiusculas, l33t, invertidas,
+    #com sufixos), passeios de teclado, datas, repeticoes, sequencias e senhas aleatorias de varias classes.
+    #usa um random.Random com semente porque o corpus precisa ser reprodutivel, nao secreto
+    from zxcvbn.frequency_lists import FREQUENCY_LISTS
+    sorteio = random.Random(semente)
+    l33t = str.maketrans({"a": "@", "e": "3", "i": "1", "o": "0", "s": "$", "t": "7", "l": "|", "g": "9"})
+    corpus = []
+    for nome, palavras in FREQUENCY_LISTS.items():
+        for palavra in sorteio.sample(palavras[:5000], 40):
+            variacao = sorteio.randrange(6)
+            if variacao == 1:
+                palavra = palavra.capitalize() + str(sorteio.randrange(100))
+            elif variacao == 2:
+                palavra = palavra.translate(l33t)
+            elif variacao == 3:
+                palavra = palavra[::-1]
+            elif variacao == 4:
+                palavra = palavra + sorteio.choice("!@#$%") + sorteio.choice(palavras[:2000])
+            elif variacao == 5:
+                palavra = palavra.upper()
+            corpus.append(palavra)
+    corpus += ["qwerty", "qwertyuiop", "asdfgh", "zxcvbnm", "1qaz2wsx", "!QAZ@WSX", "qazwsxedc", "poiuytrewq",
+               "12345678", "147258369", "aoeuidhtns", "1q2w3e4r5t", "mnbvcxz", "QWERTY!@#", "0147896325",
+               "abcdef", "abcdefghijk", "zyxwvu", "13579", "aaaaaa", "abcabcabc", "xyzxyzxyz", "11111111",
+               "01/01/1990", "1990-12-31", "19901231", "31121990", "2016", "1987", "lol1987", "june2012",
+               "P@ssw0rd", "p4$$w0rd", "Tr0ub4dor&3", "correcthorsebatterystaple", "iloveyou!", "d1ct10n4ry"]
+    classes = (string.ascii_lowercase, string.ascii_lowercase + string.digits,
+               string.ascii_letters + string.digits, string.ascii_letters + string.digits + "!@#$%^&*()-_=+[]{}|;:,.<>/?")
+    for _ in range(quantidade_aleatorias):
+        alfabeto = sorteio.choice(classes)
+        corpus.append("".join(sorteio.choice(alfabeto) for _ in range(sorteio.randint(6, 24))))
+    return corpus
+
+def validar(corpus: list[str] | None = None) -> dict:
+    #compara o score do automato com o do zxcvbn em cada senha do corpus
+    from gerador_senha import carregar_zxcvbn
+    zxcvbn = carregar_zxcvbn()
+    automato = carregar_automato()
+    corpus = corpus_validacao() if corpus is None else corpus
+    divergentes = [senha for senha in corpus if automato.score(senha) != zxcvbn(senha)["score"]]
+    return {"senhas": len(corpus), "divergentes": divergentes,
+            "concordancia": 1 - len(divergentes) / len(corpus) if corpus else 1.0}
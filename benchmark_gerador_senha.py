@@ -0,0 +1,575 @@
+import argparse
+import json
+import os
+import platform
+import random
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Iterator
+
+from gerador_senha import (AmostradorSeguro, ConfiguracaoSenha, GeradorSenhaCompilado, PoliticaForca, ResultadoGeracao, compilar_configuracao,
+                           gerar_senha, gerar_senhas, CARACTERES_SIMBOLOS_PADRAO, MODOS_POLITICA)
+
+#dimensoes da suite: todas as combinacoes validas sao medidas, sem acesso a rede
+COMPRIMENTOS_SUITE = (1, 8, 16, 64, 256, 1024)
+CLASSES_SUITE = {
+    "min": {"incluir_minusculas": True},
+    "alnum": {"incluir_minusculas": True, "incluir_maiusculas": True, "incluir_numeros": True},
+    "todos": {"incluir_minusculas": True, "incluir_maiusculas": True, "incluir_numeros": True, "incluir_simbolos": True},
+    "unicode": {"incluir_minusculas": True, "incluir_simbolos": True, "simbolos_personalizados": "★✪♛♜"},
+}
+TEXTOS_SUITE = {"sem_texto": None, "com_texto": "Ab1!"}
+POLITICAS_SUITE = {"sem_score": "nenhuma", "com_score": "zxcvbn"}
+#o zxcvbn cresce mais que linearmente com o comprimento; acima disso so medimos sem score
+COMPRIMENTO_MAX_ZXCVBN = 64
+TOLERANCIA_PADRAO = 0.25
+
+
+def medir(funcao, quantidade: int) -> float:
+    #retorna o custo medio em microssegundos por senha
+    inicio = time.perf_counter()
+    funcao(quantidade)
+    return (time.perf_counter() - inicio) / quantidade * 1e6
+
+
+def bench_laco_vs_lote(config: ConfiguracaoSenha, quantidade: int) -> dict:
+    politica = PoliticaForca(modo="zxcvbn")
+    laco = medir(lambda n: [gerar_senha(config, politica) for _ in range(n)], quantidade)
+    lote = medir(lambda n: list(gerar_senhas(config, n, politica)), quantidade)
+    return {"laco_us": laco, "lote_us": lote}
+
+
+def bench_politicas(config: ConfiguracaoSenha, quantidade: int) -> dict:
+    #vazao (senhas/s) de gerar_senhas em cada modo de politica de forca
+    return {modo: 1e6 / medir(lambda n: list(gerar_senhas(config, n, PoliticaForca(modo=modo))), quantidade)
+            for modo in MODOS_POLITICA}
+
+
+def bench_amostragem(alfabeto: str, caracteres: int) -> dict:
+    #compara secrets.choice caractere a caractere com a amostragem em bloco, em µs por caractere
+    amostrador = AmostradorSeguro()
+    choice = medir(lambda n: [secrets.choice(alfabeto) for _ in range(n)], caracteres)
+    bloco = medir(lambda n: amostrador.escolher(alfabeto, n), caracteres)
+    return {"choice_us": choice, "bloco_us": bloco}
+
+
+def bench_vetorizado(config: ConfiguracaoSenha, quantidade: int) -> dict | None:
+    #custo por senha do backend numpy (matriz e matriz + conversao para str); None sem numpy
+    try:
+        from gerador_vetorizado import GeradorVetorizado
+        gerador = GeradorVetorizado(config)
+    except ImportError:
+        return None
+    matriz = medir(lambda n: gerador.gerar_matriz(n), quantidade)
+    strings = medir(lambda n: list(gerador.para_strings(gerador.gerar_matriz(n))), quantidade)
+    return {"matriz_us": matriz, "strings_us": strings}
+
+
+def bench_construtivo(config: ConfiguracaoSenha, quantidade: int) -> dict:
+    #posicionamento construtivo (CSPRNG, so as unidades especiais) contra o caminho anterior
+    #(random.shuffle da lista inteira) e contra um embaralhamento completo com CSPRNG
+    class GeradorEmbaralhado(GeradorSenhaCompilado):
+        def _embaralhar(self, senha_temporaria):
+            self.embaralhar(senha_temporaria)
+            return "".join(senha_temporaria)
+
+    politica = PoliticaForca(modo="nenhuma")
+    resultado = {"construtivo_us": medir(lambda n: [g.gerar() for g in [GeradorSenhaCompilado(config, politica)] for _ in range(n)], quantidade)}
+    for nome, embaralhar in (("random_shuffle_us", random.shuffle), ("system_shuffle_us", random.SystemRandom().shuffle)):
+        gerador = GeradorEmbaralhado(config, politica)
+        gerador.embaralhar = embaralhar
+        resultado[nome] = medir(lambda n: [gerador.gerar() for _ in range(n)], quantidade)
+    return resultado
+
+
+def bench_frase(quantidade: int, palavras_sinteticas: int = 200_000) -> dict:
+    #custo de compilar e abrir a lista de palavras e de cada frase-senha, para a lista padrao e para uma
+    #lista sintetica grande; "texto_ms" e o que custaria carregar a mesma lista como str a cada execucao
+    from lista_palavras import abrir_lista_palavras, caminho_compilado, ler_arquivo_palavras, _listas_abertas
+    resultado = {}
+    cache_anterior = os.environ.get("GERADOR_SENHA_CACHE")
+    with tempfile.TemporaryDirectory() as diretorio:
+        os.environ["GERADOR_SENHA_CACHE"] = diretorio
+        try:
+            origem = os.path.join(diretorio, "sintetica.txt")
+            with open(origem, "w", encoding="utf-8") as arquivo:
+                arquivo.write("\n".join(f"p{i:x}{secrets.token_hex(3)}" for i in range(palavras_sinteticas)))
+            for nome, lista in (("padrao", None), ("sintetica", origem)):
+                inicio = time.perf_counter()
+                abrir_lista_palavras(lista)
+                compilar_ms = (time.perf_counter() - inicio) * 1000
+                _listas_abertas.clear()
+                inicio = time.perf_counter()
+                palavras = abrir_lista_palavras(lista)
+                abrir_ms = (time.perf_counter() - inicio) * 1000
+
+                texto_ms = None
+                if lista is not None:
+                    inicio = time.perf_counter()
+                    ler_arquivo_palavras(lista)
+                    texto_ms = (time.perf_counter() - inicio) * 1000
+
+                config = ConfiguracaoSenha(comprimento=6, modo="frase", lista_palavras=lista)
+                gerador = compilar_configuracao(config, PoliticaForca(modo="nenhuma"))
+                frase_us = medir(lambda n: [gerador.gerar() for _ in range(n)], quantidade)
+                resultado[nome] = {"palavras": len(palavras), "compilar_ms": compilar_ms, "abrir_ms": abrir_ms,
+                                   "texto_ms": texto_ms, "frase_us": frase_us,
+                                   "tamanho_kib": os.path.getsize(caminho_compilado(lista)) / 1024}
+        finally:
+            _listas_abertas.clear()
+            if cache_anterior is None:
+                del os.environ["GERADOR_SENHA_CACHE"]
+            else:
+                os.environ["GERADOR_SENHA_CACHE"] = cache_anterior
+    return resultado
+
+
+def bench_avaliador(quantidade: int) -> dict:
+    #automato de dicionarios contra o zxcvbn: custo de compilar e abrir o automato e µs por score no corpus de
+    #validacao e em senhas geradas (16 caracteres, todas as classes), com a taxa de concordancia dos scores
+    from avaliador_automato import AutomatoDicionarios, compilar_automato, corpus_validacao
+    from gerador_senha import carregar_zxcvbn
+    zxcvbn = carregar_zxcvbn()
+    config = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True,
+                               incluir_numeros=True, incluir_simbolos=True)
+    conjuntos = {"corpus": corpus_validacao(), "geradas": list(gerar_senhas(config, quantidade, PoliticaForca(modo="nenhuma")))}
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "automato.bin")
+        inicio = time.perf_counter()
+        compilar_automato(caminho)
+        compilar_ms = (time.perf_counter() - inicio) * 1000
+        inicio = time.perf_counter()
+        automato = AutomatoDicionarios(caminho)
+        abrir_ms = (time.perf_counter() - inicio) * 1000
+        resultado = {"compilar_ms": compilar_ms, "abrir_ms": abrir_ms,
+                     "tamanho_kib": os.path.getsize(caminho) / 1024}
+        for nome, senhas in conjuntos.items():
+            zxcvbn_us = medir(lambda n: [zxcvbn(senha)["score"] for senha in senhas[:n]], len(senhas))
+            automato_us = medir(lambda n: [automato.score(senha) for senha in senhas[:n]], len(senhas))
+            iguais = sum(automato.score(senha) == zxcvbn(senha)["score"] for senha in senhas)
+            resultado[nome] = {"senhas": len(senhas), "zxcvbn_us": zxcvbn_us, "automato_us": automato_us,
+                               "aceleracao": zxcvbn_us / automato_us, "concordancia": iguais / len(senhas)}
+        automato.fechar()
+    return resultado
+
+
+def bench_prazo(quantidade: int, prazos=(None, 2.0, 0.5)) -> dict:
+    #latencia por senha (ms: mediana, p99 e maxima) com e sem prazo numa configuracao que nunca atinge o score
+    #minimo (8 digitos): sem prazo toda senha paga as 10 avaliacoes do zxcvbn
+    config = ConfiguracaoSenha(comprimento=8, incluir_numeros=True)
+    resultado = {}
+    for prazo_ms in prazos:
+        gerador = compilar_configuracao(config, PoliticaForca(modo="zxcvbn", prazo_ms=prazo_ms))
+        gerador.gerar_resultado()
+        latencias, tentativas = [], 0
+        for _ in range(quantidade):
+            inicio = time.perf_counter()
+            tentativas += gerador.gerar_resultado().tentativas
+            latencias.append((time.perf_counter() - inicio) * 1000)
+        latencias.sort()
+        resultado["sem_prazo" if prazo_ms is None else f"{prazo_ms:g}ms"] = {
+            "mediana_ms": latencias[len(latencias) // 2], "p99_ms": latencias[int(len(latencias) * 0.99)],
+            "maxima_ms": latencias[-1], "tentativas_media": tentativas / quantidade}
+    return resultado
+
+
+def alfabetos_grandes() -> dict:
+    #simbolos personalizados grandes, informados com repeticoes: todos os ideogramas CJK unificados (duas vezes)
+    #e emoji com os 5 tons de pele mais todas as bandeiras de indicadores regionais (clusters de 2 code points)
+    cjk = "".join(map(chr, range(0x4E00, 0xA000)))
+    tons = [chr(tom) for tom in range(0x1F3FB, 0x1F400)]
+    emoji = "".join(chr(base) + tom for base in range(0x1F442, 0x1F4FF) for tom in tons)
+    bandeiras = "".join(chr(a) + chr(b) for a in range(0x1F1E6, 0x1F200) for b in range(0x1F1E6, 0x1F200))
+    return {"cjk": cjk * 2, "emoji": (emoji + bandeiras) * 2}
+
+
+def bench_alfabeto(quantidade: int) -> dict:
+    #compilar o alfabeto (NFC, sem repeticoes, clusters de grafemas), memoria da tabela contra uma tupla
+    #de str e custo por senha de 16 unidades so com os simbolos personalizados
+    from alfabeto import compilar_alfabeto, separar_unidades
+    resultado = {}
+    for nome, simbolos in alfabetos_grandes().items():
+        inicio = time.perf_counter()
+        tabela = compilar_alfabeto(simbolos, agrupar_grafemas=True)
+        compilar_ms = (time.perf_counter() - inicio) * 1000
+        unidades = tuple(dict.fromkeys(separar_unidades(simbolos, True)))
+        if isinstance(tabela, str):
+            tabela_bytes = sys.getsizeof(tabela)
+        else:
+            tabela_bytes = sys.getsizeof(tabela.texto) + tabela._offsets.itemsize * len(tabela._offsets)
+        tupla_bytes = sys.getsizeof(unidades) + sum(map(sys.getsizeof, unidades))
+        config = ConfiguracaoSenha(comprimento=16, incluir_simbolos=True, simbolos_personalizados=simbolos,
+                                   agrupar_grafemas=True)
+        politica = PoliticaForca(modo="nenhuma")
+        gerador = compilar_configuracao(config, politica)
+        resultado[nome] = {"informados": len(separar_unidades(simbolos, True)), "unidades": len(tabela),
+                           "compilar_ms": compilar_ms, "tabela_kib": tabela_bytes / 1024, "tupla_kib": tupla_bytes / 1024,
+                           "senha_us": medir(lambda n: [gerador.gerar() for _ in range(n)], quantidade)}
+    return resultado
+
+
+def bench_calibracao(quantidade: int, amostras: int = 200) -> dict:
+    #10 tentativas fixas contra as tentativas escolhidas pela calibracao: custo da calibracao (medicao e leitura
+    #do cache), µs por senha e fracao das senhas que atingem o score minimo em cada caso
+    from calibracao import CacheCalibracao, calibrar
+    configs = {
+        "numerica_8": ConfiguracaoSenha(comprimento=8, incluir_numeros=True),
+        "numerica_9": ConfiguracaoSenha(comprimento=9, incluir_numeros=True),
+        "alnum_16": ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True),
+    }
+    resultado = {}
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "calibracao.json")
+        for nome, config in configs.items():
+            fixa = PoliticaForca(modo="zxcvbn")
+            inicio = time.perf_counter()
+            calibrada, medida = calibrar(config, fixa, CacheCalibracao(caminho), amostras)
+            medir_ms = (time.perf_counter() - inicio) * 1000
+            inicio = time.perf_counter()
+            calibrar(config, fixa, CacheCalibracao(caminho), amostras)
+            cache_ms = (time.perf_counter() - inicio) * 1000
+            linha = {"taxa": medida.taxa_aceitacao(3), "tentativas": calibrada.max_tentativas,
+                     "medir_ms": medir_ms, "cache_ms": cache_ms}
+            for rotulo, politica in (("fixa", fixa), ("calibrada", calibrada)):
+                gerador = compilar_configuracao(config, politica)
+                atingiram = [0]
+                def gerar(n):
+                    atingiram[0] = sum(gerador.gerar_resultado().atingiu_meta for _ in range(n))
+                linha[f"{rotulo}_us"] = medir(gerar, quantidade)
+                linha[f"{rotulo}_meta"] = atingiram[0] / quantidade
+            resultado[nome] = linha
+    return resultado
+
+
+def bench_padrao(padrao: str, quantidade: int) -> dict:
+    #custo de compilar um padrao (sem e com o cache LRU) e por senha, uma a uma ou em lote
+    from padrao_senha import compilar_padrao, gerar_senhas_padrao, PadraoCompilado
+    compilar_padrao.cache_clear()
+    compilar_us = medir(lambda n: [PadraoCompilado(padrao) for _ in range(n)], quantidade)
+    cache_us = medir(lambda n: [compilar_padrao(padrao) for _ in range(n)], quantidade)
+    amostrador = AmostradorSeguro()
+    individual_us = medir(lambda n: [compilar_padrao(padrao).gerar(amostrador) for _ in range(n)], quantidade)
+    lote_us = medir(lambda n: list(gerar_senhas_padrao(padrao, n)), quantidade)
+    return {"compilar_us": compilar_us, "cache_us": cache_us, "individual_us": individual_us, "lote_us": lote_us}
+
+
+def bench_arquivo_binario(quantidade: int, acessos: int = 1000) -> dict:
+    #escrita (µs/senha) em texto e no formato binario, e leitura da senha i (µs/acesso): no texto e preciso
+    #percorrer o arquivo ate a linha i, no binario e um acesso direto ao arquivo mapeado
+    from arquivo_senhas import ArquivoSenhas, escrever_arquivo_senhas
+    from exportacao import escrever_resultados
+    resultados = [ResultadoGeracao(senha, None, 1) for senha in
+                  gerar_senhas(ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_numeros=True),
+                               quantidade, PoliticaForca(modo="nenhuma"))]
+    indices = [secrets.randbelow(quantidade) for _ in range(acessos)]
+    with tempfile.TemporaryDirectory() as diretorio:
+        texto, binario = os.path.join(diretorio, "senhas.txt"), os.path.join(diretorio, "senhas.bin")
+
+        def escrever_texto(n):
+            with open(texto, "w", encoding="utf-8") as destino:
+                escrever_resultados(resultados[:n], destino, "texto")
+
+        def ler_texto(n):
+            with open(texto, encoding="utf-8") as arquivo:
+                for indice in indices[:n]:
+                    arquivo.seek(0)
+                    for numero, linha in enumerate(arquivo):
+                        if numero == indice:
+                            break
+
+        escrita_texto_us = medir(escrever_texto, quantidade)
+        escrita_binario_us = medir(lambda n: escrever_arquivo_senhas(resultados[:n], binario, n, 16), quantidade)
+        leitura_texto_us = medir(ler_texto, acessos)
+        with ArquivoSenhas(binario) as arquivo:
+            leitura_binario_us = medir(lambda n: [arquivo[indice] for indice in indices[:n]], acessos)
+    return {"escrita_texto_us": escrita_texto_us, "escrita_binario_us": escrita_binario_us,
+            "leitura_texto_us": leitura_texto_us, "leitura_binario_us": leitura_binario_us}
+
+
+def bench_auditoria(quantidade: int) -> dict:
+    #regras estruturais da auditoria: tabelas de traducao contra o padrao any(c in conjunto ...), em µs por senha
+    from auditoria import RegrasAuditoria
+    config = ConfiguracaoSenha(comprimento=12, incluir_minusculas=True, incluir_maiusculas=True,
+                               incluir_numeros=True, incluir_simbolos=True)
+    regras = RegrasAuditoria(config, PoliticaForca(modo="nenhuma"))
+    linhas = [senha.encode() for senha in gerar_senhas(config, quantidade, PoliticaForca(modo="nenhuma"))]
+    conjuntos = ("abcdefghijklmnopqrstuvwxyz", "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "0123456789", CARACTERES_SIMBOLOS_PADRAO)
+    permitidos = set("".join(conjuntos))
+
+    def ingenuo(n):
+        for linha in linhas[:n]:
+            senha = linha.decode()
+            [len(senha) >= 12, all(c in permitidos for c in senha),
+             *(any(c in conjunto for c in senha) for conjunto in conjuntos)]
+    tabelas_us = medir(lambda n: [regras.verificar(linha) for linha in linhas[:n]], quantidade)
+    return {"tabelas_us": tabelas_us, "any_us": medir(ingenuo, quantidade)}
+
+
+def casos_suite(comprimentos=COMPRIMENTOS_SUITE,
+                comprimento_max_zxcvbn: int = COMPRIMENTO_MAX_ZXCVBN) -> Iterator[tuple[str, GeradorSenhaCompilado]]:
+    for comprimento in comprimentos:
+        for nome_classes, classes in CLASSES_SUITE.items():
+            for nome_texto, texto in TEXTOS_SUITE.items():
+                for nome_politica, modo in POLITICAS_SUITE.items():
+                    if modo == "zxcvbn" and comprimento > comprimento_max_zxcvbn:
+                        continue
+                    try:
+                        config = ConfiguracaoSenha(comprimento=comprimento, texto_necessario=texto, **classes)
+                        gerador = GeradorSenhaCompilado(config, PoliticaForca(modo=modo))
+                    except ValueError:
+                        #combinacoes impossiveis (ex.: comprimento 1 com varias classes) ficam de fora
+                        continue
+                    yield f"c{comprimento}-{nome_classes}-{nome_texto}-{nome_politica}", gerador
+
+
+def medir_caso(gerador: GeradorSenhaCompilado, tempo_minimo: float, repeticoes: int = 3) -> dict:
+    #melhor vazao entre as repeticoes, cada uma rodando por pelo menos tempo_minimo segundos
+    melhor_ops = 0.0
+    senhas = tentativas = 0
+    for _ in range(repeticoes):
+        gerados = 0
+        inicio = time.perf_counter()
+        while True:
+            tentativas += gerador.gerar_resultado().tentativas
+            gerados += 1
+            decorrido = time.perf_counter() - inicio
+            if decorrido >= tempo_minimo:
+                break
+        senhas += gerados
+        melhor_ops = max(melhor_ops, gerados / decorrido)
+    return {
+        "ops_s": melhor_ops,
+        "us_por_char": 1e6 / (melhor_ops * gerador.comprimento_final),
+        "tentativas_media": tentativas / senhas,
+    }
+
+
+def executar_suite(tempo_minimo: float = 0.2, comprimentos=COMPRIMENTOS_SUITE,
+                   comprimento_max_zxcvbn: int = COMPRIMENTO_MAX_ZXCVBN) -> dict:
+    casos = {nome: medir_caso(gerador, tempo_minimo)
+             for nome, gerador in casos_suite(comprimentos, comprimento_max_zxcvbn)}
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "tempo_minimo": tempo_minimo,
+        "casos": casos,
+    }
+
+
+def comparar_resultados(base: dict, atual: dict, tolerancia: float = TOLERANCIA_PADRAO) -> list[dict]:
+    #devolve os casos em que a vazao caiu mais que a tolerancia (0.25 = 25% mais lento que a base)
+    regressoes = []
+    for nome, medicao in atual["casos"].items():
+        referencia = base["casos"].get(nome)
+        if referencia is None:
+            continue
+        lentidao = referencia["ops_s"] / medicao["ops_s"] - 1
+        if lentidao > tolerancia:
+            regressoes.append({"caso": nome, "base_ops_s": referencia["ops_s"],
+                               "atual_ops_s": medicao["ops_s"], "lentidao": lentidao})
+    return regressoes
+
+
+def medir_inicializacao(argumentos: list[str], repeticoes: int = 5) -> float:
+    #menor tempo de parede (ms) de um processo `python main.py ...` completo
+    melhor = float("inf")
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", *argumentos], cwd=diretorio, capture_output=True, check=True)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor * 1000
+
+
+def bench_inicializacao(repeticoes: int = 5, socket_servico: str | None = None) -> dict:
+    cenarios = {
+        "python_vazio": None,
+        "help": ["--help"],
+        "sem_zxcvbn": ["-c", "16", "--minusculas", "--politica", "nenhuma"],
+        "com_zxcvbn": ["-c", "16", "--minusculas", "--politica", "zxcvbn"],
+        "frase": ["--frase", "--politica", "nenhuma"],
+    }
+    if socket_servico is not None:
+        cenarios["servico_aquecido"] = ["-c", "16", "--minusculas", "--politica", "zxcvbn", "--servico", socket_servico]
+    resultado = {}
+    for nome, argumentos in cenarios.items():
+        if argumentos is None:
+            melhor = float("inf")
+            for _ in range(repeticoes):
+                inicio = time.perf_counter()
+                subprocess.run([sys.executable, "-c", "pass"], check=True)
+                melhor = min(melhor, time.perf_counter() - inicio)
+            resultado[nome] = melhor * 1000
+        else:
+            resultado[nome] = medir_inicializacao(argumentos, repeticoes)
+    return resultado
+
+
+def bench_unicidade(quantidade: int, taxa_falsos_positivos: float = 1e-6, quantidade_set: int = 10**6) -> dict:
+    #insercoes por segundo e bytes por item das guardas de unicidade, contra um set de strings
+    #(medido com ate quantidade_set itens, pois em 10^7 ele passa de 1 GiB)
+    from unicidade import GuardaUnicidadeBloom, GuardaUnicidadeExata
+    resultado = {}
+    guardas = {"exata": GuardaUnicidadeExata(quantidade),
+               "bloom": GuardaUnicidadeBloom(quantidade, taxa_falsos_positivos)}
+    for nome, guarda in guardas.items():
+        adicionar = guarda.adicionar
+        inicio = time.perf_counter()
+        for i in range(quantidade):
+            adicionar(f"{i:016x}")
+        duracao = time.perf_counter() - inicio
+        resultado[nome] = {"itens": quantidade, "insercoes_s": quantidade / duracao,
+                           "bytes_por_item": guarda.memoria_bytes() / quantidade, "rejeitadas": guarda.rejeitadas}
+
+    itens_set = min(quantidade, quantidade_set)
+    conjunto = set()
+    inicio = time.perf_counter()
+    for i in range(itens_set):
+        conjunto.add(f"{i:016x}")
+    duracao = time.perf_counter() - inicio
+    memoria = sys.getsizeof(conjunto) + sum(sys.getsizeof(s) for s in conjunto)
+    resultado["set"] = {"itens": itens_set, "insercoes_s": itens_set / duracao,
+                        "bytes_por_item": memoria / itens_set, "rejeitadas": 0}
+    return resultado
+
+
+def imprimir_suite(resultado: dict) -> None:
+    print(f"{'caso':<36}{'senhas/s':>14}{'µs/char':>12}{'tentativas':>12}")
+    for nome, medicao in resultado["casos"].items():
+        print(f"{nome:<36}{medicao['ops_s']:>14.0f}{medicao['us_por_char']:>12.3f}{medicao['tentativas_media']:>12.2f}")
+
+
+def imprimir_comparativos(quantidade: int) -> None:
+    configs = {
+        "minusculas_12": ConfiguracaoSenha(comprimento=12, incluir_minusculas=True),
+        "todos_16": ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True,
+                                      incluir_numeros=True, incluir_simbolos=True),
+        "todos_64": ConfiguracaoSenha(comprimento=64, incluir_minusculas=True, incluir_maiusculas=True,
+                                      incluir_numeros=True, incluir_simbolos=True),
+    }
+
+    print(f"{'config':<16}{'laço (µs/senha)':>18}{'lote (µs/senha)':>18}")
+    for nome, config in configs.items():
+        r = bench_laco_vs_lote(config, quantidade)
+        print(f"{nome:<16}{r['laco_us']:>18.1f}{r['lote_us']:>18.1f}")
+
+    print(f"\n{'config':<16}" + "".join(f"{modo + ' (senhas/s)':>24}" for modo in MODOS_POLITICA))
+    for nome, config in configs.items():
+        r = bench_politicas(config, quantidade)
+        print(f"{nome:<16}" + "".join(f"{r[modo]:>24.0f}" for modo in MODOS_POLITICA))
+
+    r = bench_vetorizado(configs["todos_16"], 100 * quantidade)
+    if r is not None:
+        print(f"\n{'vetorizado':<16}{'matriz (µs/senha)':>18}{'strings (µs/senha)':>20}")
+        print(f"{'todos_16':<16}{r['matriz_us']:>18.3f}{r['strings_us']:>20.3f}")
+
+    print(f"\n{'posicionamento':<16}{'construtivo':>14}{'random.shuffle':>16}{'SystemRandom':>14}  (µs/senha)")
+    for nome, config in configs.items():
+        r = bench_construtivo(config, 10 * quantidade)
+        print(f"{nome:<16}{r['construtivo_us']:>14.1f}{r['random_shuffle_us']:>16.1f}{r['system_shuffle_us']:>14.1f}")
+
+    print(f"\n{'frase (6 pal.)':<16}{'palavras':>10}{'compilar ms':>13}{'abrir ms':>10}{'texto ms':>10}{'µs/frase':>10}{'KiB':>8}")
+    for nome, r in bench_frase(10 * quantidade).items():
+        texto = "-" if r["texto_ms"] is None else f"{r['texto_ms']:.1f}"
+        print(f"{nome:<16}{r['palavras']:>10}{r['compilar_ms']:>13.1f}{r['abrir_ms']:>10.3f}{texto:>10}"
+              f"{r['frase_us']:>10.1f}{r['tamanho_kib']:>8.0f}")
+
+    print(f"\n{'padrão':<20}{'compilar':>10}{'cache':>10}{'uma a uma':>11}{'lote':>10}  (µs)")
+    for padrao in ("Aaaa-9999-!!", "AAA-999-aaa-***-999"):
+        r = bench_padrao(padrao, 10 * quantidade)
+        print(f"{padrao:<20}{r['compilar_us']:>10.2f}{r['cache_us']:>10.2f}{r['individual_us']:>11.2f}{r['lote_us']:>10.2f}")
+
+    print(f"\n{'alfabeto':<16}{'informados':>12}{'unidades':>10}{'compilar ms':>13}{'tabela KiB':>12}{'tupla KiB':>11}{'µs/senha':>10}")
+    for nome, r in bench_alfabeto(10 * quantidade).items():
+        print(f"{nome:<16}{r['informados']:>12}{r['unidades']:>10}{r['compilar_ms']:>13.1f}{r['tabela_kib']:>12.0f}"
+              f"{r['tupla_kib']:>11.0f}{r['senha_us']:>10.1f}")
+
+    r = bench_avaliador(2 * quantidade)
+    print(f"\n{'avaliador':<16}{'senhas':>8}{'zxcvbn µs':>11}{'autômato µs':>13}{'aceleração':>12}{'concordância':>14}"
+          f"  (compilar {r['compilar_ms']:.0f} ms, abrir {r['abrir_ms']:.2f} ms, {r['tamanho_kib']:.0f} KiB)")
+    for nome in ("corpus", "geradas"):
+        print(f"{nome:<16}{r[nome]['senhas']:>8}{r[nome]['zxcvbn_us']:>11.0f}{r[nome]['automato_us']:>13.0f}"
+              f"{r[nome]['aceleracao']:>11.1f}x{r[nome]['concordancia']:>14.2%}")
+
+    print(f"\n{'calibração':<16}{'taxa':>7}{'tent.':>7}{'medir ms':>10}{'cache ms':>10}{'fixa µs':>10}{'meta':>7}"
+          f"{'calibr. µs':>12}{'meta':>7}")
+    for nome, r in bench_calibracao(quantidade).items():
+        print(f"{nome:<16}{r['taxa']:>7.0%}{r['tentativas']:>7}{r['medir_ms']:>10.0f}{r['cache_ms']:>10.2f}{r['fixa_us']:>10.0f}"
+              f"{r['fixa_meta']:>7.0%}{r['calibrada_us']:>12.0f}{r['calibrada_meta']:>7.0%}")
+
+    print(f"\n{'prazo (8 díg.)':<16}{'mediana ms':>12}{'p99 ms':>10}{'máxima ms':>11}{'tentativas':>12}")
+    for nome, r in bench_prazo(quantidade).items():
+        print(f"{nome:<16}{r['mediana_ms']:>12.2f}{r['p99_ms']:>10.2f}{r['maxima_ms']:>11.2f}{r['tentativas_media']:>12.1f}")
+
+    r = bench_arquivo_binario(500 * quantidade, acessos=quantidade)
+    print(f"\n{'saída 16 chars':<16}{'escrita (µs/senha)':>20}{'senha i (µs)':>14}  ({500 * quantidade} senhas)")
+    print(f"{'texto':<16}{r['escrita_texto_us']:>20.3f}{r['leitura_texto_us']:>14.1f}")
+    print(f"{'binario':<16}{r['escrita_binario_us']:>20.3f}{r['leitura_binario_us']:>14.2f}")
+
+    r = bench_auditoria(100 * quantidade)
+    print(f"\n{'auditoria':<16}{'tabelas (µs/senha)':>20}{'any (µs/senha)':>18}")
+    print(f"{'todos_12':<16}{r['tabelas_us']:>20.2f}{r['any_us']:>18.2f}")
+
+    alfabeto = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" + CARACTERES_SIMBOLOS_PADRAO
+    r = bench_amostragem(alfabeto, 64 * quantidade)
+    print(f"\n{'amostragem':<16}{'choice (µs/char)':>18}{'bloco (µs/char)':>18}")
+    print(f"{'alfabeto_' + str(len(alfabeto)):<16}{r['choice_us']:>18.3f}{r['bloco_us']:>18.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks do gerador de senhas (sem acesso à rede)")
+    subparsers = parser.add_subparsers(dest="comando")
+
+    suite = subparsers.add_parser("suite", help="Varre comprimento, classes, símbolos, texto necessário e score (padrão)")
+    suite.add_argument("--tempo_minimo", type=float, default=0.2, help="Segundos mínimos por repetição de cada caso (padrão: 0.2)")
+    suite.add_argument("--comprimento_max_zxcvbn", type=int, default=COMPRIMENTO_MAX_ZXCVBN,
+                       help=f"Maior comprimento medido com zxcvbn (padrão: {COMPRIMENTO_MAX_ZXCVBN})")
+    suite.add_argument("--salvar", type=str, help="Grava o resultado como baseline JSON")
+    suite.add_argument("--comparar", type=str, help="Baseline JSON para comparar; sai com código 1 se houver regressão")
+    suite.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                       help=f"Lentidão máxima aceita na comparação (padrão: {TOLERANCIA_PADRAO} = 25%%)")
+
+    comparativos = subparsers.add_parser("comparativos", help="Tabelas de laço x lote, políticas, backend vetorizado e amostragem")
+    comparativos.add_argument("-n", "--quantidade", type=int, default=200, help="Senhas por medição (padrão: 200)")
+
+    inicializacao = subparsers.add_parser("inicializacao", help="Tempo de inicialização do CLI (main.py) por cenário")
+    inicializacao.add_argument("-r", "--repeticoes", type=int, default=5, help="Execuções por cenário; vale a menor (padrão: 5)")
+    inicializacao.add_argument("--servico", type=str, help="Socket de um servico_aquecido.py já em execução, para comparar")
+
+    unicidade = subparsers.add_parser("unicidade", help="Memória e vazão das guardas de unicidade (exata, Bloom) contra um set")
+    unicidade.add_argument("-n", "--quantidade", type=int, default=10**7, help="Itens inseridos em cada guarda (padrão: 10^7)")
+    unicidade.add_argument("--taxa_fp", type=float, default=1e-6, help="Taxa de falsos positivos do Bloom (padrão: 1e-6)")
+
+    args = parser.parse_args(sys.argv[1:] or ["suite"])
+
+    if args.comando == "comparativos":
+        imprimir_comparativos(args.quantidade)
+        sys.exit(0)
+    if args.comando == "inicializacao":
+        for nome, ms in bench_inicializacao(args.repeticoes, args.servico).items():
+            print(f"{nome:<20}{ms:>10.1f} ms")
+        sys.exit(0)
+    if args.comando == "unicidade":
+        print(f"{'guarda':<10}{'itens':>12}{'inserções/s':>14}{'bytes/item':>12}{'MiB em n':>10}{'rejeitadas':>12}")
+        for nome, r in bench_unicidade(args.quantidade, args.taxa_fp).items():
+            mib = r["bytes_por_item"] * args.quantidade / 2**20
+            print(f"{nome:<10}{r['itens']:>12}{r['insercoes_s']:>14.0f}{r['bytes_por_item']:>12.1f}{mib:>10.1f}{r['rejeitadas']:>12}")
+        sys.exit(0)
+
+    resultado = executar_suite(args.tempo_minimo, comprimento_max_zxcvbn=args.comprimento_max_zxcvbn)
+    imprimir_suite(resultado)
+    if args.salvar:
+        with open(args.salvar, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            base = json.load(arquivo)
+        regressoes = comparar_resultados(base, resultado, args.tolerancia)
+        for regressao in regressoes:
+            print(f"REGRESSÃO {regressao['caso']}: {regressao['base_ops_s']:.0f} -> {regressao['atual_ops_s']:.0f} senhas/s "
+                  f"({regressao['lentidao']:+.0%})", file=sys.stderr)
+        if regressoes:
+            sys.exit(1)
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import math
+import os
+import time
+from typing import NamedTuple
+
+from gerador_senha import (ConfiguracaoSenha, GeradorFraseCompilado, GeradorSenhaCompilado, PoliticaForca,
+                           compilar_configuracao, diretorio_cache)
+
+#calibracao por configuracao: quantas candidatas atingem cada score do zxcvbn e quanto custa avaliar uma.
+#o numero fixo de tentativas desperdica avaliacoes em configuracoes que nunca atingem o score minimo
+#(ex.: poucos digitos) e e curto para as que raramente atingem; com a taxa de aceitacao medida o
+#numero de tentativas e o necessario para atingir o score com a confianca pedida.
+#as medicoes ficam em um JSON no diretorio de cache, com no maximo MAX_CALIBRACOES entradas
+#(as usadas ha mais tempo saem primeiro), e sao descartadas quando a versao do zxcvbn muda
+NOME_ARQUIVO_CALIBRACAO = "calibracao.json"
+VERSAO_CALIBRACAO = 1
+AMOSTRAS_CALIBRACAO = 200
+MAX_CALIBRACOES = 256
+CONFIANCA_PADRAO = 0.99
+TETO_TENTATIVAS = 100
+
+class Calibracao(NamedTuple):
+    #candidatas medidas com score 0, 1, 2, 3 e 4, e o custo medio de uma avaliacao
+    scores: tuple[int, int, int, int, int]
+    custo_ms: float
+
+    @property
+    def amostras(self) -> int:
+        return sum(self.scores)
+
+    def taxa_aceitacao(self, score_minimo: int) -> float:
+        return sum(self.scores[score_minimo:]) / self.amostras
+
+    def atinge(self, score_minimo: int) -> bool:
+        return self.taxa_aceitacao(score_minimo) > 0
+
+def _versao_zxcvbn() -> str:
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("zxcvbn")
+    except PackageNotFoundError:
+        return "desconhecida"
+
+def chave_calibracao(gerador: GeradorSenhaCompilado) -> str:
+    #configuracoes que sorteiam as mesmas candidatas tem a mesma chave: a ordem e as repeticoes dos
+    #simbolos nao importam, so os alfabetos compilados. o avaliador entra por causa do custo
+    if isinstance(gerador, GeradorFraseCompilado):
+        config = gerador.config
+        lista = os.path.abspath(config.lista_palavras) if config.lista_palavras else None
+        canonica = ["frase", config.comprimento, lista, len(gerador.palavras), gerador.separador, gerador.capitalizar,
+                    [sorted(conjunto) for conjunto in gerador.injecoes]]
+    else:
+        canonica = ["caracteres", gerador.comprimento_final, sorted(gerador.alfabeto),
+                    sorted(sorted(conjunto) for conjunto in gerador.conjuntos_garantidos), gerador.texto_necessario]
+    canonica.append(gerador.politica.avaliador)
+    texto = json.dumps(canonica, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:32]
+
+def medir_calibracao(gerador: GeradorSenhaCompilado, amostras: int = AMOSTRAS_CALIBRACAO) -> Calibracao:
+    if amostras <= 0:
+        raise ValueError("O número de amostras da calibração deve ser positivo.")
+    avaliar = gerador._avaliar
+    scores = [0] * 5
+    tempo = 0.0
+    for _ in range(amostras):
+        senha = gerador._embaralhar(gerador._amostrar())
+        inicio = time.perf_counter()
+        scores[avaliar(senha)] += 1
+        tempo += time.perf_counter() - inicio
+    return Calibracao(tuple(scores), tempo / amostras * 1000)
+
+def tentativas_necessarias(taxa: float, confianca: float = CONFIANCA_PADRAO, teto: int = TETO_TENTATIVAS) -> int | None:
+    #menor n com 1 - (1 - taxa)^n >= confianca, limitado ao teto; None quando o score nunca foi atingido
+    if not 0 < confianca < 1:
+        raise ValueError("A confiança deve estar entre 0 e 1.")
+    if taxa <= 0:
+        return None
+    if taxa >= 1:
+        return 1
+    return max(1, min(teto, math.ceil(math.log(1 - confianca) / math.log(1 - taxa))))
+
+class CacheCalibracao:
+    def __init__(self, caminho: str | None = None, max_entradas: int = MAX_CALIBRACOES):
+        if max_entradas <= 0:
+            raise ValueError("O cache de calibração deve ter pelo menos uma entrada.")
+        self.caminho = caminho or os.path.join(diretorio_cache(), NOME_ARQUIVO_CALIBRACAO)
+        self.max_entradas = max_entradas
+        self._versao_zxcvbn = _versao_zxcvbn()
+        self.entradas = self._ler()
+
+    def _ler(self) -> dict:
+        #um arquivo ausente, corrompido ou de outra versao vale como cache vazio
+        try:
+            with open(self.caminho, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+        if (not isinstance(dados, dict) or dados.get("versao") != VERSAO_CALIBRACAO or
+                dados.get("zxcvbn") != self._versao_zxcvbn or not isinstance(dados.get("entradas"), dict)):
+            return {}
+        return dados["entradas"]
+
+    def obter(self, chave: str) -> Calibracao | None:
+        entrada = self.entradas.get(chave)
+        if entrada is None:
+            return None
+        entrada["usada_em"] = time.time()
+        return Calibracao(tuple(entrada["scores"]), entrada["custo_ms"])
+
+    def guardar(self, chave: str, calibracao: Calibracao) -> None:
+        self.entradas[chave] = {"scores": list(calibracao.scores), "custo_ms": calibracao.custo_ms, "usada_em": time.time()}
+
+    def salvar(self) -> None:
+        #mantem as max_entradas usadas mais recentemente e grava em um temporario renomeado, para que
+        #processos concorrentes nunca leiam um arquivo pela metade (o ultimo a gravar prevalece)
+        if len(self.entradas) > self.max_entradas:
+            recentes = sorted(self.entradas.items(), key=lambda item: item[1]["usada_em"], reverse=True)
+            self.entradas = dict(recentes[:self.max_entradas])
+        temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({"versao": VERSAO_CALIBRACAO, "zxcvbn": self._versao_zxcvbn, "entradas": self.entradas}, arquivo)
+        os.replace(temporario, self.caminho)
+
+def calibrar(config: ConfiguracaoSenha,
+             politica: PoliticaForca | None = None,
+             cache: CacheCalibracao | None = None,
+             amostras: int = AMOSTRAS_CALIBRACAO,
+             confianca: float = CONFIANCA_PADRAO) -> tuple[PoliticaForca, Calibracao | None]:
+    #retorna a politica com max_tentativas ajustado e a calibracao usada (medida ou do cache). sem zxcvbn
+    #nao ha tentativas a ajustar e a politica volta inalterada. se o score minimo nunca foi atingido, a
+    #amostra so limita a taxa a menos de 3/amostras (regra de tres, ~95%), e uma taxa tao baixa pediria mais
+    #tentativas que as da politica: o max_tentativas informado e mantido em vez de desistir na primeira candidata
+    politica = politica if politica is not None else PoliticaForca()
+    gerador = compilar_configuracao(config, politica)
+    if not gerador.usar_zxcvbn:
+        return politica, None
+    cache = cache if cache is not None else CacheCalibracao()
+    chave = chave_calibracao(gerador)
+    calibracao = cache.obter(chave)
+    if calibracao is None:
+        calibracao = medir_calibracao(gerador, amostras)
+        cache.guardar(chave, calibracao)
+    cache.salvar()
+    tentativas = tentativas_necessarias(calibracao.taxa_aceitacao(politica.score_minimo), confianca)
+    if tentativas is None:
+        tentativas = politica.max_tentativas
+    ajustada = PoliticaForca(modo=politica.modo, score_minimo=politica.score_minimo, margem_bits=politica.margem_bits,
+                             avaliador=politica.avaliador, prazo_ms=politica.prazo_ms, max_tentativas=tentativas)
+    return ajustada, calibracao
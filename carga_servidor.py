@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import json
+import time
+
+CONFIG_PADRAO = {
+    "comprimento": 16,
+    "incluir_maiusculas": True,
+    "incluir_minusculas": True,
+    "incluir_numeros": True,
+    "incluir_simbolos": True,
+}
+
+def percentil(valores_ordenados: list[float], p: float) -> float:
+    if not valores_ordenados:
+        return 0.0
+    indice = min(len(valores_ordenados) - 1, int(round(p / 100 * (len(valores_ordenados) - 1))))
+    return valores_ordenados[indice]
+
+async def _cliente(host: str, porta: int, corpo: bytes, pedidos: int, latencias: list[float], erros: list[int]) -> None:
+    #um cliente mantem uma conexao keep-alive e envia seus pedidos em sequencia
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    pedido = (f"POST /senhas HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+              f"Content-Length: {len(corpo)}\r\n\r\n").encode("latin-1") + corpo
+    try:
+        for _ in range(pedidos):
+            inicio = time.perf_counter()
+            escritor.write(pedido)
+            await escritor.drain()
+            linha_status = await leitor.readline()
+            tamanho = 0
+            while True:
+                linha = await leitor.readline()
+                if linha in (b"\r\n", b""):
+                    break
+                nome, _, valor = linha.decode("latin-1").partition(":")
+                if nome.strip().lower() == "content-length":
+                    tamanho = int(valor)
+            await leitor.readexactly(tamanho)
+            latencias.append(time.perf_counter() - inicio)
+            if b" 200 " not in linha_status:
+                erros.append(1)
+    finally:
+        escritor.close()
+
+async def executar_carga(host: str, porta: int, config: dict, clientes: int, pedidos_por_cliente: int) -> dict:
+    corpo = json.dumps(config).encode("utf-8")
+    latencias: list[float] = []
+    erros: list[int] = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_cliente(host, porta, corpo, pedidos_por_cliente, latencias, erros) for _ in range(clientes)))
+    duracao = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "pedidos": len(latencias),
+        "erros": len(erros),
+        "duracao_s": duracao,
+        "pedidos_por_s": len(latencias) / duracao if duracao > 0 else 0.0,
+        "p50_ms": percentil(latencias, 50) * 1000,
+        "p95_ms": percentil(latencias, 95) * 1000,
+        "p99_ms": percentil(latencias, 99) * 1000,
+        "max_ms": (latencias[-1] if latencias else 0.0) * 1000,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de carga para servidor.py")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço do servidor (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8080, help="Porta do servidor (padrão: 8080)")
+    parser.add_argument("--clientes", type=int, default=50, help="Conexões simultâneas (padrão: 50)")
+    parser.add_argument("--pedidos", type=int, default=200, help="Pedidos por conexão (padrão: 200)")
+    parser.add_argument("--config", type=str, help="JSON com a configuração enviada em cada pedido")
+    args = parser.parse_args()
+
+    config = json.loads(args.config) if args.config else CONFIG_PADRAO
+    resultado = asyncio.run(executar_carga(args.host, args.porta, config, args.clientes, args.pedidos))
+    print(json.dumps(resultado, indent=2))
@@ -0,0 +1,74 @@
+import csv
+import io
+import json
+import sys
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, TextIO
+
+from gerador_senha import FORMATOS_SAIDA, ResultadoGeracao
+
+CAMPOS_SAIDA = ("senha", "comprimento", "score", "tentativas")
+LINHAS_POR_ESCRITA = 4096
+TAMANHO_BUFFER_ARQUIVO = 1 << 20
+
+def escrever_registros(registros: Iterable[dict],
+                       destino: TextIO,
+                       campos: tuple[str, ...],
+                       formato: str = "ndjson",
+                       linhas_por_escrita: int = LINHAS_POR_ESCRITA,
+                       formatar_texto: Callable[[dict], str] | None = None) -> int:
+    #consome os registros sob demanda e os grava em blocos de `linhas_por_escrita` linhas,
+    #entao a memoria usada nao depende de quantas senhas passam pelo pipeline. retorna o total escrito.
+    #no formato texto so os registros com "senha" geram linha, a menos que formatar_texto seja dado
+    if formato not in FORMATOS_SAIDA:
+        raise ValueError(f"Formato de saída inválido: {formato}. Use um de: {', '.join(FORMATOS_SAIDA)}.")
+    if linhas_por_escrita <= 0:
+        raise ValueError("O número de linhas por escrita deve ser positivo.")
+
+    buffer = io.StringIO()
+    escritor_csv = csv.writer(buffer, lineterminator="\n")
+    if formato == "csv":
+        escritor_csv.writerow(campos)
+
+    total = 0
+    pendentes = 0
+    for registro in registros:
+        if formato == "ndjson":
+            buffer.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        elif formato == "csv":
+            escritor_csv.writerow(["" if registro.get(campo) is None else registro[campo] for campo in campos])
+        elif formatar_texto is not None:
+            buffer.write(formatar_texto(registro) + "\n")
+        elif "senha" in registro:
+            buffer.write(registro["senha"] + "\n")
+        total += 1
+        pendentes += 1
+        if pendentes >= linhas_por_escrita:
+            destino.write(buffer.getvalue())
+            buffer.seek(0)
+            buffer.truncate()
+            pendentes = 0
+
+    destino.write(buffer.getvalue())
+    destino.flush()
+    return total
+
+def registro_resultado(resultado: ResultadoGeracao) -> dict:
+    return {"senha": resultado.senha, "comprimento": len(resultado.senha),
+            "score": resultado.score, "tentativas": resultado.tentativas}
+
+def escrever_resultados(resultados: Iterable[ResultadoGeracao],
+                        destino: TextIO,
+                        formato: str = "ndjson",
+                        linhas_por_escrita: int = LINHAS_POR_ESCRITA) -> int:
+    #resultados de geracao com as colunas CAMPOS_SAIDA
+    return escrever_registros(map(registro_resultado, resultados), destino, CAMPOS_SAIDA, formato, linhas_por_escrita)
+
+@contextmanager
+def abrir_saida(caminho: str | None) -> Iterator[TextIO]:
+    #arquivo com buffer grande; sem caminho (ou "-"), usa a saida padrao, que nao e fechada
+    if caminho is None or caminho == "-":
+        yield sys.stdout
+        return
+    with open(caminho, "w", encoding="utf-8", newline="", buffering=TAMANHO_BUFFER_ARQUIVO) as arquivo:
+        yield arquivo
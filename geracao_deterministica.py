@@ -0,0 +1,114 @@
+import hashlib
+import hmac
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+from gerador_senha import (AmostradorSeguro, ConfiguracaoSenha, GeradorSenhaCompilado, PoliticaForca,
+                           ResultadoGeracao, compilar_configuracao)
+
+#modo deterministico, so para fixtures de teste de carga: a senha de indice i de um fluxo depende apenas
+#de (segredo, fluxo, i), entao qualquer maquina com o segredo regenera qualquer fatia sem guardar nada.
+#fica isolado neste modulo; gerar_senha e os demais caminhos continuam usando apenas o CSPRNG do sistema.
+#os bytes sao lidos como inteiros little-endian (ver gerador_senha._inteiros), entao as fixtures sao
+#as mesmas em qualquer maquina
+ROTULO_DRBG = b"gerador_senha/drbg/v1\x00"
+TAMANHO_MINIMO_SEGREDO = 16
+TAMANHO_LOTE_DETERMINISTICO = 256
+
+class AmostradorDeterministico(AmostradorSeguro):
+    #troca a fonte de bytes por um DRBG: a chave de cada senha e HMAC-SHA256(chave do fluxo, indice)
+    #e o bloco n dessa senha e SHAKE-256(chave da senha || n)
+    def __init__(self, segredo: bytes, fluxo: str):
+        super().__init__()
+        if len(segredo) < TAMANHO_MINIMO_SEGREDO:
+            raise ValueError(f"O segredo do modo determinístico deve ter pelo menos {TAMANHO_MINIMO_SEGREDO} bytes.")
+        self._chave_fluxo = hmac.new(segredo, ROTULO_DRBG + fluxo.encode("utf-8"), hashlib.sha256).digest()
+        self.reposicionar(0)
+
+    def reposicionar(self, indice: int) -> None:
+        #comeca o fluxo de bytes da senha `indice`, descartando o que sobrou da anterior
+        self._chave_senha = hmac.new(self._chave_fluxo, indice.to_bytes(8, "big"), hashlib.sha256).digest()
+        self._contador = 0
+        self._buffer = b""
+        self._posicao = 0
+
+    def _ler_bytes(self, quantidade: int) -> bytes:
+        bloco = hashlib.shake_256(self._chave_senha + self._contador.to_bytes(8, "big")).digest(quantidade)
+        self._contador += 1
+        return bloco
+
+class GeradorDeterministico:
+    def __init__(self, config: ConfiguracaoSenha, segredo: bytes, fluxo: str, politica: PoliticaForca | None = None):
+        #com prazo o numero de tentativas depende do relogio, e a senha de cada indice deixaria de ser reproduzivel
+        if politica is not None and politica.prazo_ms is not None:
+            raise ValueError("O modo determinístico não aceita prazo por senha.")
+        self.gerador: GeradorSenhaCompilado = compilar_configuracao(config, politica)
+        self.amostrador = self.gerador.amostrador = AmostradorDeterministico(segredo, fluxo)
+
+    def gerar_resultado(self, indice: int) -> ResultadoGeracao:
+        if indice < 0:
+            raise ValueError("O índice da senha não pode ser negativo.")
+        self.amostrador.reposicionar(indice)
+        return self.gerador.gerar_resultado()
+
+    def gerar_faixa(self, inicio: int, fim: int) -> list[ResultadoGeracao]:
+        return [self.gerar_resultado(indice) for indice in range(inicio, fim)]
+
+def faixa_fragmento(quantidade: int, fragmentos: int, fragmento: int) -> range:
+    #indices do fragmento `fragmento` (0..fragmentos-1); as faixas sao contiguas e nao se sobrepoem
+    if fragmentos <= 0:
+        raise ValueError("O número de fragmentos deve ser positivo.")
+    if not 0 <= fragmento < fragmentos:
+        raise ValueError(f"O fragmento deve estar entre 0 e {fragmentos - 1}.")
+    return range(quantidade * fragmento // fragmentos, quantidade * (fragmento + 1) // fragmentos)
+
+_gerador_worker: GeradorDeterministico | None = None
+
+def _inicializar_worker(config, segredo, fluxo, politica) -> None:
+    global _gerador_worker
+    _gerador_worker = GeradorDeterministico(config, segredo, fluxo, politica)
+
+def _gerar_faixa(inicio: int, fim: int) -> list[ResultadoGeracao]:
+    return _gerador_worker.gerar_faixa(inicio, fim)
+
+def gerar_resultados_deterministicos(config: ConfiguracaoSenha,
+                                     segredo: bytes,
+                                     fluxo: str,
+                                     indices: range,
+                                     politica: PoliticaForca | None = None,
+                                     workers: int = 1,
+                                     tamanho_lote: int = TAMANHO_LOTE_DETERMINISTICO) -> Iterator[ResultadoGeracao]:
+    #resultados dos indices pedidos, sempre na ordem dos indices: com workers > 1 as faixas saem
+    #de varios processos, mas a saida e identica a de um processo so
+    if workers <= 0:
+        raise ValueError("O número de workers deve ser positivo.")
+    if tamanho_lote <= 0:
+        raise ValueError("O tamanho do lote deve ser positivo.")
+    gerador = GeradorDeterministico(config, segredo, fluxo, politica)
+    if workers == 1:
+        return (gerador.gerar_resultado(indice) for indice in indices)
+    return _executar_pool(config, segredo, fluxo, politica, indices, workers, tamanho_lote)
+
+def _executar_pool(config, segredo, fluxo, politica, indices, workers, tamanho_lote) -> Iterator[ResultadoGeracao]:
+    faixas = ((inicio, min(inicio + tamanho_lote, indices.stop)) for inicio in range(indices.start, indices.stop, tamanho_lote))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                             initargs=(config, segredo, fluxo, politica)) as executor:
+        #fila em ordem de envio: consome sempre a faixa mais antiga, com no maximo 2 por worker pendentes
+        pendentes = deque()
+        for faixa in faixas:
+            pendentes.append(executor.submit(_gerar_faixa, *faixa))
+            if len(pendentes) >= 2 * workers:
+                break
+        while pendentes:
+            yield from pendentes.popleft().result()
+            faixa = next(faixas, None)
+            if faixa is not None:
+                pendentes.append(executor.submit(_gerar_faixa, *faixa))
+
+def ler_segredo(caminho: str) -> bytes:
+    try:
+        with open(caminho, "rb") as arquivo:
+            return arquivo.read().strip()
+    except OSError as e:
+        raise ValueError(f"Não foi possível ler o segredo: {e}")
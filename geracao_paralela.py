@@ -0,0 +1,80 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator
+
+from gerador_senha import (ConfiguracaoSenha, EstatisticasGeracao, GeradorSenhaCompilado, PoliticaForca,
+                           ResultadoGeracao, TAMANHO_LOTE_PADRAO, compilar_configuracao)
+
+#gerador compilado uma unica vez em cada processo do pool (ver _inicializar_worker)
+_gerador_worker: GeradorSenhaCompilado | None = None
+
+def _inicializar_worker(config: ConfiguracaoSenha, politica: PoliticaForca | None, medir: bool) -> None:
+    global _gerador_worker
+    _gerador_worker = compilar_configuracao(config, politica, EstatisticasGeracao() if medir else None)
+
+def _gerar_lote(quantidade: int) -> tuple[list[ResultadoGeracao], EstatisticasGeracao | None]:
+    #cada tarefa recebe apenas um inteiro e devolve o lote inteiro, mantendo o IPC pequeno.
+    #com estatisticas ligadas, cada lote devolve tambem os contadores apenas daquele lote
+    estatisticas = None
+    if hasattr(_gerador_worker, "estatisticas"):
+        estatisticas = _gerador_worker.estatisticas = EstatisticasGeracao()
+    return [_gerador_worker.gerar_resultado() for _ in range(quantidade)], estatisticas
+
+def _tamanhos_lotes(quantidade: int, tamanho_lote: int) -> Iterator[int]:
+    completos, resto = divmod(quantidade, tamanho_lote)
+    for _ in range(completos):
+        yield tamanho_lote
+    if resto:
+        yield resto
+
+def gerar_senhas_paralelo(config: ConfiguracaoSenha,
+                          quantidade: int,
+                          workers: int | None = None,
+                          tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+                          politica: PoliticaForca | None = None,
+                          estatisticas: EstatisticasGeracao | None = None) -> Iterator[str]:
+    resultados = gerar_resultados_paralelo(config, quantidade, workers, tamanho_lote, politica, estatisticas)
+    return (resultado.senha for resultado in resultados)
+
+def gerar_resultados_paralelo(config: ConfiguracaoSenha,
+                              quantidade: int,
+                              workers: int | None = None,
+                              tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+                              politica: PoliticaForca | None = None,
+                              estatisticas: EstatisticasGeracao | None = None) -> Iterator[ResultadoGeracao]:
+    #distribui a geracao (e a verificacao com zxcvbn, que prende o GIL) entre processos.
+    #no maximo 2 lotes por worker ficam pendentes, entao a memoria nao cresce com a quantidade.
+    #as senhas saem na ordem em que os lotes terminam
+    if quantidade < 0:
+        raise ValueError("A quantidade de senhas não pode ser negativa.")
+    if tamanho_lote <= 0:
+        raise ValueError("O tamanho do lote deve ser positivo.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError("O número de workers deve ser positivo.")
+
+    #compila no processo principal para que erros de configuracao aparecam antes de subir o pool
+    compilar_configuracao(config, politica)
+    return _executar_pool(config, politica, quantidade, workers, tamanho_lote, estatisticas)
+
+def _executar_pool(config, politica, quantidade, workers, tamanho_lote, estatisticas) -> Iterator[ResultadoGeracao]:
+    lotes = _tamanhos_lotes(quantidade, tamanho_lote)
+    max_pendentes = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_inicializar_worker,
+                             initargs=(config, politica, estatisticas is not None)) as executor:
+        pendentes = set()
+        for tamanho in lotes:
+            pendentes.add(executor.submit(_gerar_lote, tamanho))
+            if len(pendentes) >= max_pendentes:
+                break
+        while pendentes:
+            concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                resultados, estatisticas_lote = futuro.result()
+                if estatisticas is not None:
+                    estatisticas.mesclar(estatisticas_lote)
+                yield from resultados
+                tamanho = next(lotes, None)
+                if tamanho is not None:
+                    pendentes.add(executor.submit(_gerar_lote, tamanho))
@@ -1,7 +1,15 @@
+import math
+import os
 import secrets
 import string
-import random
-from zxcvbn import zxcvbn
+import struct
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, NamedTuple
+
+from alfabeto import TabelaAlfabeto, compilar_alfabeto, separar_grafemas
+
+MODOS_SENHA = ("caracteres", "frase")
 
 class ConfiguracaoSenha:
     def __init__(self,
@@ -11,7 +19,11 @@ class ConfiguracaoSenha:
                  incluir_numeros: bool = False,
                  incluir_simbolos: bool = False,
                  simbolos_personalizados: str | None = None,
-                 texto_necessario: str | None = None):
+                 texto_necessario: str | None = None,
+                 modo: str = "caracteres",
+                 separador: str = "-",
+                 lista_palavras: str | None = None,
+                 agrupar_grafemas: bool = False):
         self.comprimento = comprimento
         self.incluir_maiusculas = incluir_maiusculas
         self.incluir_minusculas = incluir_minusculas
@@ -19,87 +31,596 @@ class ConfiguracaoSenha:
         self.incluir_simbolos = incluir_simbolos
         self.simbolos_personalizados = simbolos_personalizados
         self.texto_necessario = texto_necessario
+        #no modo "frase", comprimento e o numero de palavras; maiusculas capitalizam as palavras e
+        #numeros/simbolos injetam um caractere da classe no fim de uma palavra sorteada
+        self.modo = modo
+        self.separador = separador
+        self.lista_palavras = lista_palavras
+        #trata cada cluster de grafemas de simbolos_personalizados e texto_necessario como um caractere (ver alfabeto.py)
+        self.agrupar_grafemas = agrupar_grafemas
+
+        if self.modo not in MODOS_SENHA:
+            raise ValueError(f"Modo de senha inválido: {modo}. Use um de: {', '.join(MODOS_SENHA)}.")
 
         if self.comprimento <= 0:
             raise ValueError("O comprimento da senha deve ser positivo.")
 
-        if not (self.incluir_maiusculas or self.incluir_minusculas or \
-                self.incluir_numeros or self.incluir_simbolos):
+        if self.modo == "frase":
+            if self.texto_necessario:
+                raise ValueError("O modo frase não suporta texto necessário.")
+        elif not (self.incluir_maiusculas or self.incluir_minusculas or \
+                  self.incluir_numeros or self.incluir_simbolos):
             raise ValueError("Pelo menos um tipo de caractere deve ser selecionado.")
 
+    def chave(self) -> tuple:
+        #identifica configuracoes equivalentes, permitindo reaproveitar o mesmo gerador compilado
+        return (self.comprimento, self.incluir_maiusculas, self.incluir_minusculas, self.incluir_numeros,
+                self.incluir_simbolos, self.simbolos_personalizados, self.texto_necessario,
+                self.modo, self.separador, self.lista_palavras, self.agrupar_grafemas)
+
+#o zxcvbn monta seus dicionarios de frequencia ao ser importado; so o carregamos quando
+#uma politica de forca realmente precisa dele (ver carregar_zxcvbn)
+_zxcvbn = None
+
+def carregar_zxcvbn():
+    global _zxcvbn
+    if _zxcvbn is None:
+        from zxcvbn import zxcvbn
+        _zxcvbn = zxcvbn
+    return _zxcvbn
+
+#implementacoes do score do zxcvbn: a biblioteca em si ou o automato de dicionarios (avaliador_automato.py),
+#que da o mesmo score mais rapido. ambas sao funcoes de modulo, para que os geradores continuem serializaveis.
+#o zxcvbn recusa senhas com mais de 72 caracteres e o automato nao; os avaliadores devolvidos por
+#carregar_avaliador aplicam o mesmo limite, para que o resultado nao dependa do avaliador escolhido
+AVALIADORES = ("zxcvbn", "automato")
+MAX_COMPRIMENTO_AVALIADOR = 72
+
+def _verificar_comprimento(senha: str) -> None:
+    if len(senha) > MAX_COMPRIMENTO_AVALIADOR:
+        raise ValueError(f"O avaliador de força aceita senhas de até {MAX_COMPRIMENTO_AVALIADOR} caracteres, "
+                         f"mas a senha tem {len(senha)}.")
+
+def _score_zxcvbn(senha: str) -> int:
+    _verificar_comprimento(senha)
+    return carregar_zxcvbn()(senha)["score"]
+
+def _score_automato(senha: str) -> int:
+    from avaliador_automato import score
+    _verificar_comprimento(senha)
+    return score(senha)
+
+def carregar_avaliador(avaliador: str = "zxcvbn") -> Callable[[str], int]:
+    if avaliador == "automato":
+        from avaliador_automato import carregar_automato
+        carregar_automato()
+        return _score_automato
+    carregar_zxcvbn()
+    return _score_zxcvbn
+
+def diretorio_cache() -> str:
+    #pasta privada do usuario para arquivos auxiliares (socket do servico aquecido, dados compilados)
+    base = os.environ.get("GERADOR_SENHA_CACHE")
+    if not base:
+        raiz = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(raiz, "gerador_senha")
+    os.makedirs(base, mode=0o700, exist_ok=True)
+    return base
+
 CARACTERES_MINUSCULOS = string.ascii_lowercase
 CARACTERES_MAIUSCULOS = string.ascii_uppercase
 CARACTERES_NUMERICOS = string.digits
 CARACTERES_SIMBOLOS_PADRAO = "!@#$%^&*()-_=+[]{}|;:,.<>/?"
 
-def gerar_senha(config: ConfiguracaoSenha) -> str:
-    conjunto_caracteres_permitidos = []
-    caracteres_garantidos = []
-
-    if config.texto_necessario:
-        caracteres_garantidos.append(config.texto_necessario)
-    if config.incluir_minusculas:
-        conjunto_caracteres_permitidos.extend(list(CARACTERES_MINUSCULOS))
-        caracteres_garantidos.append(secrets.choice(CARACTERES_MINUSCULOS))
-
-    if config.incluir_maiusculas:
-        conjunto_caracteres_permitidos.extend(list(CARACTERES_MAIUSCULOS))
-        caracteres_garantidos.append(secrets.choice(CARACTERES_MAIUSCULOS))
-
-    if config.incluir_numeros:
-        conjunto_caracteres_permitidos.extend(list(CARACTERES_NUMERICOS))
-        caracteres_garantidos.append(secrets.choice(CARACTERES_NUMERICOS))
-
-    simbolos_a_usar = CARACTERES_SIMBOLOS_PADRAO
-    if config.simbolos_personalizados is not None:
-        simbolos_a_usar = config.simbolos_personalizados
-    
-    if config.incluir_simbolos:
-        if not simbolos_a_usar:
-             pass
+TAMANHO_BLOCO_ENTROPIA = 512
+#formatos de saida e tamanho de lote dos modulos de lote (exportacao, arquivo_senhas, geracao_paralela),
+#definidos aqui para que o CLI monte os argumentos sem importar esses modulos
+FORMATOS_SAIDA = ("texto", "ndjson", "csv")
+FORMATO_BINARIO = "binario"
+TAMANHO_LOTE_PADRAO = 256
+_FORMATOS_LARGURA = {1: "B", 2: "H", 4: "I"}
+
+def _inteiros(dados: bytes, largura: int) -> tuple[int, ...]:
+    #inteiros sem sinal little-endian em qualquer maquina: com a ordem nativa, o mesmo fluxo de bytes do
+    #modo deterministico daria senhas diferentes em maquinas big-endian
+    return struct.unpack(f"<{len(dados) // largura}{_FORMATOS_LARGURA[largura]}", dados)
+
+SCORE_MINIMO_PADRAO = 3
+MARGEM_BITS_PADRAO = 10.0
+MAX_TENTATIVAS_PADRAO = 10
+MODOS_POLITICA = ("adaptativa", "zxcvbn", "entropia", "nenhuma")
+#log10 dos palpites minimos para os scores 1 a 4 (mesmos limiares de zxcvbn.scoring, com delta de 5)
+_LIMIARES_LOG10_ZXCVBN = tuple(math.log10(limiar) for limiar in (1e3 + 5, 1e6 + 5, 1e8 + 5, 1e10 + 5))
+
+def score_por_palpites(log10_palpites: float) -> int:
+    return sum(1 for limiar in _LIMIARES_LOG10_ZXCVBN if log10_palpites >= limiar)
+
+def estimar_log10_palpites(entropia_bits: float, comprimento: int) -> float:
+    #o zxcvbn nunca estima mais que 10^comprimento palpites para uma senha (forca bruta sobre o texto todo),
+    #entao a estimativa analitica e o menor valor entre a entropia do alfabeto e esse teto
+    return min(entropia_bits * math.log10(2), comprimento)
+
+class PoliticaForca:
+    #define como a forca de cada candidata e verificada:
+    #  adaptativa - estimativa por entropia; o zxcvbn so roda quando a estimativa fica perto do score minimo
+    #  zxcvbn     - sempre roda o zxcvbn (comportamento original)
+    #  entropia   - apenas a estimativa analitica, sem zxcvbn
+    #  nenhuma    - sem verificacao de forca
+    #max_tentativas e prazo_ms limitam as candidatas de cada senha: ao esgotar, fica a de maior score.
+    #calibracao.py escolhe max_tentativas pela taxa de aceitacao medida para a configuracao
+    def __init__(self,
+                 modo: str = "adaptativa",
+                 score_minimo: int = SCORE_MINIMO_PADRAO,
+                 margem_bits: float = MARGEM_BITS_PADRAO,
+                 avaliador: str = "zxcvbn",
+                 prazo_ms: float | None = None,
+                 max_tentativas: int = MAX_TENTATIVAS_PADRAO):
+        if modo not in MODOS_POLITICA:
+            raise ValueError(f"Política de força inválida: {modo}. Use uma de: {', '.join(MODOS_POLITICA)}.")
+        if avaliador not in AVALIADORES:
+            raise ValueError(f"Avaliador de força inválido: {avaliador}. Use um de: {', '.join(AVALIADORES)}.")
+        if not 0 <= score_minimo <= 4:
+            raise ValueError("O score mínimo deve estar entre 0 e 4.")
+        if margem_bits < 0:
+            raise ValueError("A margem de entropia não pode ser negativa.")
+        if prazo_ms is not None and prazo_ms <= 0:
+            raise ValueError("O prazo por senha deve ser positivo.")
+        if max_tentativas < 1:
+            raise ValueError("O número máximo de tentativas deve ser positivo.")
+        self.modo = modo
+        self.score_minimo = score_minimo
+        self.margem_bits = margem_bits
+        self.avaliador = avaliador
+        self.prazo_ms = prazo_ms
+        self.max_tentativas = max_tentativas
+
+    def chave(self) -> tuple:
+        return (self.modo, self.score_minimo, self.margem_bits, self.avaliador, self.prazo_ms, self.max_tentativas)
+
+    def precisa_zxcvbn(self, entropia_bits: float, comprimento: int) -> bool:
+        if self.modo == "zxcvbn":
+            return True
+        if self.modo != "adaptativa" or self.score_minimo == 0:
+            return False
+        #senhas curtas demais nunca atingem o score minimo no zxcvbn; repetir tentativas seria desperdicio
+        if comprimento < _LIMIARES_LOG10_ZXCVBN[self.score_minimo - 1]:
+            return False
+        log10_com_margem = estimar_log10_palpites(entropia_bits, comprimento) - self.margem_bits * math.log10(2)
+        return score_por_palpites(log10_com_margem) < self.score_minimo
+
+class AmostradorSeguro:
+    #le bytes do CSPRNG do sistema em blocos (secrets.token_bytes) e os converte em indices
+    #sem vies via amostragem por rejeicao, evitando uma chamada de secrets.choice por caractere
+    def __init__(self, tamanho_bloco: int = TAMANHO_BLOCO_ENTROPIA):
+        if tamanho_bloco <= 0:
+            raise ValueError("O tamanho do bloco de entropia deve ser positivo.")
+        self.tamanho_bloco = tamanho_bloco
+        self.bytes_consumidos = 0
+        self._buffer = b""
+        self._posicao = 0
+
+    def _ler_bytes(self, quantidade: int) -> bytes:
+        return secrets.token_bytes(quantidade)
+
+    def _bytes(self, quantidade: int) -> bytes:
+        if len(self._buffer) - self._posicao < quantidade:
+            restante = self._buffer[self._posicao:]
+            novos = self._ler_bytes(max(self.tamanho_bloco, quantidade))
+            self.bytes_consumidos += len(novos)
+            self._buffer = restante + novos
+            self._posicao = 0
+        inicio = self._posicao
+        self._posicao += quantidade
+        return self._buffer[inicio:self._posicao]
+
+    def indices(self, tamanho_alfabeto: int, quantidade: int) -> list[int]:
+        if tamanho_alfabeto <= 0:
+            raise ValueError("O alfabeto para amostragem não pode ser vazio.")
+        if tamanho_alfabeto == 1:
+            return [0] * quantidade
+
+        largura = 1 if tamanho_alfabeto <= 0x100 else 2 if tamanho_alfabeto <= 0x10000 else 4
+        espaco = 1 << (8 * largura)
+        #descarta os valores >= limite para que cada indice tenha exatamente a mesma probabilidade
+        limite = espaco - espaco % tamanho_alfabeto
+
+        resultado = []
+        while len(resultado) < quantidade:
+            faltam = quantidade - len(resultado)
+            pedidos = faltam + (faltam * (espaco - limite)) // limite + 1
+            valores = _inteiros(self._bytes(pedidos * largura), largura)
+            resultado.extend(v % tamanho_alfabeto for v in valores if v < limite)
+        del resultado[quantidade:]
+        return resultado
+
+    def indice(self, tamanho_alfabeto: int) -> int:
+        return self.indices(tamanho_alfabeto, 1)[0]
+
+    def escolher(self, alfabeto, quantidade: int) -> list:
+        indices = self.indices(len(alfabeto), quantidade)
+        if isinstance(alfabeto, TabelaAlfabeto):
+            return alfabeto.escolher(indices)
+        return [alfabeto[i] for i in indices]
+
+    def indices_mistos(self, tamanhos) -> list[int]:
+        #um indice uniforme para cada tamanho, com 4 bytes por indice lidos de uma vez;
+        #serve para poucos sorteios de intervalos diferentes sem uma chamada de indices() para cada
+        valores = _inteiros(self._bytes(4 * len(tamanhos)), 4)
+        resultado = []
+        for tamanho, valor in zip(tamanhos, valores):
+            limite = (1 << 32) - (1 << 32) % tamanho
+            while valor >= limite:
+                valor = int.from_bytes(self._bytes(4), "little")
+            resultado.append(valor % tamanho)
+        return resultado
+
+    def posicoes(self, total: int, quantidade: int) -> list[int]:
+        #quantidade posicoes distintas e uniformes em range(total), em ordem aleatoria:
+        #os primeiros passos de um Fisher-Yates, guardando so as trocas (O(quantidade))
+        if quantidade > total:
+            raise ValueError("Não há posições suficientes para sortear.")
+        trocas = {}
+        resultado = []
+        for i, j in enumerate(self.indices_mistos(range(total, total - quantidade, -1))):
+            j += i
+            resultado.append(trocas.get(j, j))
+            trocas[j] = trocas.get(i, i)
+        return resultado
+
+class ResultadoGeracao(NamedTuple):
+    senha: str
+    #score do zxcvbn quando ele rodou, a estimativa analitica caso contrario, ou None na politica "nenhuma"
+    score: int | None
+    tentativas: int
+    #se o score minimo foi atingido; False quando as tentativas ou o prazo acabaram antes (ver PoliticaForca)
+    atingiu_meta: bool = True
+
+class GeradorSenhaCompilado:
+    #compila uma configuracao uma unica vez (alfabetos, pools garantidos e pool de preenchimento)
+    #para que varias senhas possam ser geradas sem reconstruir os conjuntos a cada chamada
+    def __init__(self, config: ConfiguracaoSenha, politica: PoliticaForca | None = None):
+        conjunto_caracteres_permitidos = []
+        conjuntos_garantidos = []
+
+        if config.incluir_minusculas:
+            conjunto_caracteres_permitidos.append(CARACTERES_MINUSCULOS)
+            conjuntos_garantidos.append(CARACTERES_MINUSCULOS)
+
+        if config.incluir_maiusculas:
+            conjunto_caracteres_permitidos.append(CARACTERES_MAIUSCULOS)
+            conjuntos_garantidos.append(CARACTERES_MAIUSCULOS)
+
+        if config.incluir_numeros:
+            conjunto_caracteres_permitidos.append(CARACTERES_NUMERICOS)
+            conjuntos_garantidos.append(CARACTERES_NUMERICOS)
+
+        simbolos_a_usar = CARACTERES_SIMBOLOS_PADRAO
+        if config.simbolos_personalizados is not None:
+            #sem repeticoes, para que nenhum simbolo tenha mais chance de ser sorteado que os outros
+            simbolos_a_usar = compilar_alfabeto(config.simbolos_personalizados, agrupar_grafemas=config.agrupar_grafemas)
+
+        if config.incluir_simbolos and simbolos_a_usar:
+            conjunto_caracteres_permitidos.append(simbolos_a_usar)
+            conjuntos_garantidos.append(simbolos_a_usar)
+
+        if not conjunto_caracteres_permitidos:
+            raise ValueError("O conjunto de caracteres permitidos está vazio. Certifique-se de que pelo menos um tipo de caractere está selecionado e o conjunto de símbolos é válido.")
+
+        #o texto necessario ocupa todos os seus caracteres, entao a senha final tem exatamente config.comprimento.
+        #ao contrario dos alfabetos, ele entra literalmente (sem NFC): `texto_necessario in senha` vale sempre
+        texto_necessario = config.texto_necessario or ""
+        unidades_texto = separar_grafemas(texto_necessario) if config.agrupar_grafemas else texto_necessario
+        total_garantidos = len(conjuntos_garantidos) + len(unidades_texto)
+        if total_garantidos > config.comprimento:
+            raise ValueError(
+                f"Não é possível garantir todos os tipos de caracteres selecionados com o comprimento fornecido. "
+                f"São necessários pelo menos {total_garantidos} caracteres, mas o comprimento é {config.comprimento}."
+            )
+
+        self.config = config
+        self.texto_necessario = texto_necessario or None
+        self.conjuntos_garantidos = tuple(conjuntos_garantidos)
+        self._tamanhos_garantidos = tuple(len(conjunto) for conjunto in conjuntos_garantidos)
+        #o pool de preenchimento e a uniao dos conjuntos: um simbolo personalizado que tambem e letra ou digito
+        #entra uma vez so. os conjuntos padrao sao disjuntos e dispensam a compilacao
+        if config.simbolos_personalizados is None:
+            self.alfabeto = "".join(conjunto_caracteres_permitidos)
         else:
-            conjunto_caracteres_permitidos.extend(list(simbolos_a_usar))
-            caracteres_garantidos.append(secrets.choice(simbolos_a_usar))
-            
-    if not conjunto_caracteres_permitidos:
-        raise ValueError("O conjunto de caracteres permitidos está vazio. Certifique-se de que pelo menos um tipo de caractere está selecionado e o conjunto de símbolos é válido.")
-
-    if len(caracteres_garantidos) > config.comprimento:
-        raise ValueError(
-            f"Não é possível garantir todos os tipos de caracteres selecionados com o comprimento fornecido. "
-            f"São necessários pelo menos {len(caracteres_garantidos)} caracteres, mas o comprimento é {config.comprimento}."
-        )
-
-    comprimento_restante = config.comprimento - len(caracteres_garantidos)
-    
-    if not conjunto_caracteres_permitidos and comprimento_restante > 0 :
-         raise ValueError("O conjunto de caracteres permitidos está vazio, não é possível preencher o restante do comprimento da senha.")
-
-    caracteres_senha = list(caracteres_garantidos)
-    if conjunto_caracteres_permitidos:
-        for _ in range(comprimento_restante):
-            caracteres_senha.append(secrets.choice(conjunto_caracteres_permitidos))
-    elif comprimento_restante > 0:
-        raise ValueError("Não é possível gerar a senha: o conjunto de caracteres permitidos ficou vazio enquanto caracteres ainda eram necessários.")
-
-    random.shuffle(caracteres_senha)
-
-    caracteres_senha = list(caracteres_garantidos)
-    tentativas = 0
-    max_tentativas = 10
-
-    #tenta gerar uma senha com força minima (score >= 3) por ate 10 tentativas. se nao conseguir, retorna a ultima senha gerada
-    while tentativas < max_tentativas:
-        senha_temporaria = list(caracteres_garantidos)
-        for _ in range(comprimento_restante):
-            senha_temporaria.append(secrets.choice(conjunto_caracteres_permitidos))
-
-        random.shuffle(senha_temporaria)
-        senha_final = "".join(senha_temporaria)
-
-        resultado = zxcvbn(senha_final)
-        if resultado['score'] >= 3:
-            return senha_final
-        
-        tentativas += 1
-    return senha_final
\ No newline at end of file
+            self.alfabeto = compilar_alfabeto(*map(str, conjunto_caracteres_permitidos),
+                                              agrupar_grafemas=config.agrupar_grafemas)
+        self.comprimento_restante = config.comprimento - total_garantidos
+        self.amostrador = AmostradorSeguro()
+
+        self.comprimento_final = config.comprimento
+        #unidades posicionadas pelo sorteio: um caractere por conjunto garantido e o bloco do texto necessario
+        self.especiais = len(conjuntos_garantidos) + (1 if self.texto_necessario else 0)
+        self.entropia_bits = (self.comprimento_restante * math.log2(len(self.alfabeto)) +
+                              sum(math.log2(len(conjunto)) for conjunto in conjuntos_garantidos))
+        self._aplicar_politica(politica)
+
+    def _aplicar_politica(self, politica: PoliticaForca | None) -> None:
+        #depende de entropia_bits e comprimento_final, definidos por cada tipo de gerador
+        self.politica = politica if politica is not None else PoliticaForca()
+        self.score_estimado = score_por_palpites(estimar_log10_palpites(self.entropia_bits, self.comprimento_final))
+        self.usar_zxcvbn = self.politica.precisa_zxcvbn(self.entropia_bits, self.comprimento_final)
+        self._meta_estimada = self.politica.modo == "nenhuma" or self.score_estimado >= self.politica.score_minimo
+        self._avaliar = carregar_avaliador(self.politica.avaliador) if self.usar_zxcvbn else None
+
+    def _amostrar(self) -> list[str]:
+        #preenchimento primeiro, unidades especiais no fim (as ultimas self.especiais posicoes)
+        amostrador = self.amostrador
+        senha_temporaria = amostrador.escolher(self.alfabeto, self.comprimento_restante)
+        indices = amostrador.indices_mistos(self._tamanhos_garantidos)
+        senha_temporaria.extend(conjunto[i] for conjunto, i in zip(self.conjuntos_garantidos, indices))
+        if self.texto_necessario:
+            senha_temporaria.append(self.texto_necessario)
+        return senha_temporaria
+
+    def _embaralhar(self, senha_temporaria: list[str]) -> str:
+        #em vez de embaralhar tudo, sorteia com o CSPRNG as posicoes das unidades especiais e move
+        #para o fim os caracteres de preenchimento que estavam nelas. como o preenchimento e iid,
+        #o resultado tem a mesma distribuicao de um embaralhamento uniforme completo
+        especiais = self.especiais
+        if not especiais:
+            return "".join(senha_temporaria)
+        total = len(senha_temporaria)
+        inicio_especiais = total - especiais
+        posicoes = self.amostrador.posicoes(total, especiais)
+        unidades = senha_temporaria[inicio_especiais:]
+
+        alvos = set(posicoes)
+        livres = (p for p in range(inicio_especiais, total) if p not in alvos)
+        for p in posicoes:
+            if p < inicio_especiais:
+                senha_temporaria[next(livres)] = senha_temporaria[p]
+        for unidade, p in zip(unidades, posicoes):
+            senha_temporaria[p] = unidade
+        return "".join(senha_temporaria)
+
+    def _pontuar(self, senha: str) -> int:
+        return self._avaliar(senha)
+
+    def gerar_resultado(self) -> ResultadoGeracao:
+        #todas as candidatas tem a mesma estimativa analitica, entao sem zxcvbn a primeira ja e a resposta
+        if not self.usar_zxcvbn:
+            score = None if self.politica.modo == "nenhuma" else self.score_estimado
+            return ResultadoGeracao(self._embaralhar(self._amostrar()), score, 1, self._meta_estimada)
+
+        score_minimo = self.politica.score_minimo
+        max_tentativas = self.politica.max_tentativas
+        prazo_ms = self.politica.prazo_ms
+        limite = None if prazo_ms is None else time.perf_counter() + prazo_ms / 1000
+        melhor_senha, melhor_score = None, -1
+        tentativas = 0
+
+        #tenta gerar uma senha com força minima (score >= score_minimo) por ate max_tentativas tentativas
+        #ou ate o prazo. se nao conseguir, retorna a candidata de maior score
+        while tentativas < max_tentativas:
+            inicio = time.perf_counter()
+            senha = self._embaralhar(self._amostrar())
+            tentativas += 1
+
+            score = self._pontuar(senha)
+            if score > melhor_score:
+                melhor_senha, melhor_score = senha, score
+            if score >= score_minimo:
+                break
+            #uma avaliacao nao pode ser interrompida: so comeca outra se, custando o mesmo que a ultima, ela
+            #ainda terminar dentro do prazo
+            if limite is not None:
+                agora = time.perf_counter()
+                if agora + (agora - inicio) > limite:
+                    break
+        return ResultadoGeracao(melhor_senha, melhor_score, tentativas, melhor_score >= score_minimo)
+
+    def gerar(self) -> str:
+        return self.gerar_resultado().senha
+
+class GeradorFraseCompilado(GeradorSenhaCompilado):
+    #frases-senha (diceware): config.comprimento palavras sorteadas de uma lista compilada e mapeada
+    #em memoria (lista_palavras.py), unidas por config.separador
+    def __init__(self, config: ConfiguracaoSenha, politica: PoliticaForca | None = None):
+        from lista_palavras import abrir_lista_palavras
+
+        simbolos_a_usar = CARACTERES_SIMBOLOS_PADRAO
+        if config.simbolos_personalizados is not None:
+            simbolos_a_usar = compilar_alfabeto(config.simbolos_personalizados, agrupar_grafemas=config.agrupar_grafemas)
+        injecoes = []
+        if config.incluir_numeros:
+            injecoes.append(CARACTERES_NUMERICOS)
+        if config.incluir_simbolos and simbolos_a_usar:
+            injecoes.append(simbolos_a_usar)
+
+        self.config = config
+        self.palavras = abrir_lista_palavras(config.lista_palavras)
+        self.separador = config.separador
+        self.capitalizar = config.incluir_maiusculas
+        self.injecoes = tuple(injecoes)
+        #cada injecao sorteia a palavra e o caractere em um unico pedido ao amostrador
+        self._tamanhos_injecoes = tuple(t for conjunto in injecoes for t in (config.comprimento, len(conjunto)))
+        self.amostrador = AmostradorSeguro()
+
+        self.comprimento_final = (config.comprimento * self.palavras.menor_comprimento +
+                                  (config.comprimento - 1) * len(self.separador) + len(injecoes))
+        self.entropia_bits = (config.comprimento * math.log2(len(self.palavras)) +
+                              sum(math.log2(config.comprimento * len(conjunto)) for conjunto in injecoes))
+        self._aplicar_politica(politica)
+
+    def _amostrar(self) -> list[str]:
+        palavras = self.palavras
+        frase = [palavras[i] for i in self.amostrador.indices(len(palavras), self.config.comprimento)]
+        if self.capitalizar:
+            frase = [palavra.capitalize() for palavra in frase]
+        if self.injecoes:
+            sorteios = self.amostrador.indices_mistos(self._tamanhos_injecoes)
+            for n, conjunto in enumerate(self.injecoes):
+                frase[sorteios[2 * n]] += conjunto[sorteios[2 * n + 1]]
+        return frase
+
+    def _embaralhar(self, senha_temporaria: list[str]) -> str:
+        #a ordem das palavras ja e aleatoria; so falta uni-las
+        return self.separador.join(senha_temporaria)
+
+class EstatisticasGeracao:
+    #contadores opcionais de geracao. so sao alimentados por GeradorSenhaInstrumentado, entao o
+    #caminho normal (sem estatisticas) nao paga nada. `callback`, se informado, recebe cada
+    #ResultadoGeracao e se a senha foi um fallback (tentativas esgotadas abaixo do score minimo)
+    def __init__(self, callback: Callable[[ResultadoGeracao, bool], None] | None = None):
+        self.callback = callback
+        self.senhas = 0
+        self.histograma_tentativas: dict[int, int] = {}
+        self.fallbacks = 0
+        self.bytes_aleatorios = 0
+        self.tempo_amostragem = 0.0
+        self.tempo_embaralhamento = 0.0
+        self.tempo_score = 0.0
+        self.tempo_total = 0.0
+
+    def __getstate__(self) -> dict:
+        #callbacks nao atravessam processos; cada worker devolve apenas os contadores
+        estado = self.__dict__.copy()
+        estado["callback"] = None
+        return estado
+
+    def registrar(self, resultado: ResultadoGeracao, fallback: bool, bytes_aleatorios: int, duracao: float) -> None:
+        self.senhas += 1
+        self.histograma_tentativas[resultado.tentativas] = self.histograma_tentativas.get(resultado.tentativas, 0) + 1
+        self.fallbacks += fallback
+        self.bytes_aleatorios += bytes_aleatorios
+        self.tempo_total += duracao
+        if self.callback is not None:
+            self.callback(resultado, fallback)
+
+    def mesclar(self, outra: "EstatisticasGeracao") -> None:
+        self.senhas += outra.senhas
+        for tentativas, quantidade in outra.histograma_tentativas.items():
+            self.histograma_tentativas[tentativas] = self.histograma_tentativas.get(tentativas, 0) + quantidade
+        self.fallbacks += outra.fallbacks
+        self.bytes_aleatorios += outra.bytes_aleatorios
+        self.tempo_amostragem += outra.tempo_amostragem
+        self.tempo_embaralhamento += outra.tempo_embaralhamento
+        self.tempo_score += outra.tempo_score
+        self.tempo_total += outra.tempo_total
+
+    def como_dict(self) -> dict:
+        return {
+            "senhas": self.senhas,
+            "histograma_tentativas": dict(sorted(self.histograma_tentativas.items())),
+            "fallbacks": self.fallbacks,
+            "bytes_aleatorios": self.bytes_aleatorios,
+            "tempo_amostragem": self.tempo_amostragem,
+            "tempo_embaralhamento": self.tempo_embaralhamento,
+            "tempo_score": self.tempo_score,
+            "tempo_total": self.tempo_total,
+        }
+
+    def resumo(self) -> str:
+        total = self.tempo_total or 1.0
+        histograma = ", ".join(f"{t}: {q}" for t, q in sorted(self.histograma_tentativas.items()))
+        return "\n".join([
+            f"Senhas: {self.senhas} | fallbacks (tentativas esgotadas): {self.fallbacks}",
+            f"Tentativas por senha: {histograma or '-'}",
+            f"Tempo: amostragem {self.tempo_amostragem:.4f}s ({self.tempo_amostragem / total:.0%}), "
+            f"embaralhamento {self.tempo_embaralhamento:.4f}s ({self.tempo_embaralhamento / total:.0%}), "
+            f"score {self.tempo_score:.4f}s ({self.tempo_score / total:.0%}), total {self.tempo_total:.4f}s",
+            f"Bytes aleatórios lidos: {self.bytes_aleatorios}",
+        ])
+
+class _Instrumentacao:
+    #mesmo algoritmo do gerador compilado, medindo cada etapa em um EstatisticasGeracao
+    def __init__(self, config: ConfiguracaoSenha, politica: PoliticaForca | None, estatisticas: EstatisticasGeracao):
+        super().__init__(config, politica)
+        self.estatisticas = estatisticas
+
+    def _amostrar(self) -> list[str]:
+        inicio = time.perf_counter()
+        senha_temporaria = super()._amostrar()
+        self.estatisticas.tempo_amostragem += time.perf_counter() - inicio
+        return senha_temporaria
+
+    def _embaralhar(self, senha_temporaria: list[str]) -> str:
+        inicio = time.perf_counter()
+        senha = super()._embaralhar(senha_temporaria)
+        self.estatisticas.tempo_embaralhamento += time.perf_counter() - inicio
+        return senha
+
+    def _pontuar(self, senha: str) -> int:
+        inicio = time.perf_counter()
+        score = super()._pontuar(senha)
+        self.estatisticas.tempo_score += time.perf_counter() - inicio
+        return score
+
+    def gerar_resultado(self) -> ResultadoGeracao:
+        bytes_antes = self.amostrador.bytes_consumidos
+        inicio = time.perf_counter()
+        resultado = super().gerar_resultado()
+        fallback = self.usar_zxcvbn and not resultado.atingiu_meta
+        self.estatisticas.registrar(resultado, fallback, self.amostrador.bytes_consumidos - bytes_antes,
+                                    time.perf_counter() - inicio)
+        return resultado
+
+class GeradorSenhaInstrumentado(_Instrumentacao, GeradorSenhaCompilado):
+    pass
+
+class GeradorFraseInstrumentado(_Instrumentacao, GeradorFraseCompilado):
+    pass
+
+def compilar_configuracao(config: ConfiguracaoSenha,
+                          politica: PoliticaForca | None = None,
+                          estatisticas: EstatisticasGeracao | None = None) -> GeradorSenhaCompilado:
+    if config.modo == "frase":
+        if estatisticas is not None:
+            return GeradorFraseInstrumentado(config, politica, estatisticas)
+        return GeradorFraseCompilado(config, politica)
+    if estatisticas is not None:
+        return GeradorSenhaInstrumentado(config, politica, estatisticas)
+    return GeradorSenhaCompilado(config, politica)
+
+MAX_GERADORES_EM_CACHE = 1024
+
+class CacheLRU:
+    #LRU de objetos caros de criar (geradores compilados) para servicos que recebem configuracoes de
+    #clientes: sem limite, cada configuracao diferente ficaria na memoria para sempre
+    def __init__(self, capacidade: int = MAX_GERADORES_EM_CACHE):
+        if capacidade <= 0:
+            raise ValueError("A capacidade do cache deve ser positiva.")
+        self.capacidade = capacidade
+        self._itens = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def obter(self, chave, criar: Callable[[], object]):
+        item = self._itens.get(chave)
+        if item is not None:
+            self._itens.move_to_end(chave)
+            return item
+        item = self._itens[chave] = criar()
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+        return item
+
+def gerar_senha(config: ConfiguracaoSenha,
+                politica: PoliticaForca | None = None,
+                estatisticas: EstatisticasGeracao | None = None) -> str:
+    return compilar_configuracao(config, politica, estatisticas).gerar()
+
+def gerar_senhas(config: ConfiguracaoSenha,
+                 quantidade: int,
+                 politica: PoliticaForca | None = None,
+                 estatisticas: EstatisticasGeracao | None = None) -> Iterator[str]:
+    #compila a configuracao uma vez e devolve um iterador preguiçoso com `quantidade` senhas
+    if quantidade < 0:
+        raise ValueError("A quantidade de senhas não pode ser negativa.")
+    gerador = compilar_configuracao(config, politica, estatisticas)
+    return (gerador.gerar() for _ in range(quantidade))
+
+def gerar_resultados(config: ConfiguracaoSenha,
+                     quantidade: int,
+                     politica: PoliticaForca | None = None,
+                     estatisticas: EstatisticasGeracao | None = None) -> Iterator[ResultadoGeracao]:
+    #como gerar_senhas, mas inclui o score e o numero de tentativas de cada senha
+    if quantidade < 0:
+        raise ValueError("A quantidade de senhas não pode ser negativa.")
+    gerador = compilar_configuracao(config, politica, estatisticas)
+    return (gerador.gerar_resultado() for _ in range(quantidade))
@@ -0,0 +1,113 @@
+import secrets
+from typing import BinaryIO, Iterator
+
+from gerador_senha import ConfiguracaoSenha, GeradorSenhaCompilado, PoliticaForca
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _exigir_numpy() -> None:
+    if np is None:
+        raise ImportError("O backend vetorizado requer o numpy (pip install numpy).")
+
+class GeradorVetorizado:
+    #backend opcional para fixtures de carga: gera N senhas de uma vez como uma matriz N x comprimento
+    #de code points (uint8 quando o alfabeto cabe em latin-1, uint32 caso contrario).
+    #nao verifica forca com zxcvbn e nao suporta texto_necessario, um bloco de varias colunas
+    def __init__(self, config: ConfiguracaoSenha):
+        _exigir_numpy()
+        if config.modo != "caracteres":
+            raise ValueError("O backend vetorizado só suporta o modo caracteres.")
+        if config.texto_necessario:
+            raise ValueError("O backend vetorizado não suporta texto_necessario.")
+
+        #reaproveita a validacao e os alfabetos do gerador compilado
+        compilado = GeradorSenhaCompilado(config, PoliticaForca(modo="nenhuma"))
+        if not isinstance(compilado.alfabeto, str):
+            raise ValueError("O backend vetorizado não suporta clusters de grafemas com mais de um caractere.")
+        self.config = config
+        self.comprimento = config.comprimento
+        self.alfabeto = compilado.alfabeto
+        self.bytes_consumidos = 0
+
+        #posicoes de cada conjunto garantido no alfabeto (o alfabeto nao repete os caracteres comuns a mais
+        #de um conjunto, entao um conjunto nem sempre e uma faixa contigua dele)
+        posicao = {caractere: i for i, caractere in enumerate(self.alfabeto)}
+        self.indices_garantidos = [np.array([posicao[c] for c in conjunto], dtype=np.uint32)
+                                   for conjunto in compilado.conjuntos_garantidos]
+
+        codigos = [ord(c) for c in self.alfabeto]
+        self.dtype = np.uint8 if max(codigos) < 0x100 else np.dtype("<u4")
+        self.tabela = np.array(codigos, dtype=self.dtype)
+
+    def _bytes_aleatorios(self, quantidade: int) -> bytes:
+        self.bytes_consumidos += quantidade
+        return secrets.token_bytes(quantidade)
+
+    def _indices_uniformes(self, tamanho_alfabeto: int, quantidade: int) -> "np.ndarray":
+        #mesma amostragem por rejeicao de AmostradorSeguro, aplicada a vetores inteiros
+        if tamanho_alfabeto == 1:
+            return np.zeros(quantidade, dtype=np.uint32)
+        tipo = np.uint8 if tamanho_alfabeto <= 0x100 else np.uint16 if tamanho_alfabeto <= 0x10000 else np.uint32
+        espaco = 1 << (8 * np.dtype(tipo).itemsize)
+        limite = espaco - espaco % tamanho_alfabeto
+
+        saida = np.empty(quantidade, dtype=np.uint32)
+        preenchidos = 0
+        while preenchidos < quantidade:
+            faltam = quantidade - preenchidos
+            pedidos = faltam * espaco // limite + faltam // 32 + 16
+            valores = np.frombuffer(self._bytes_aleatorios(pedidos * np.dtype(tipo).itemsize), dtype=tipo)
+            aceitos = valores[valores < limite][:faltam]
+            saida[preenchidos:preenchidos + len(aceitos)] = aceitos % tamanho_alfabeto
+            preenchidos += len(aceitos)
+        return saida
+
+    def gerar_indices(self, quantidade: int) -> "np.ndarray":
+        #matriz quantidade x comprimento de indices no alfabeto, ja com os caracteres garantidos
+        if quantidade < 0:
+            raise ValueError("A quantidade de senhas não pode ser negativa.")
+        comprimento = self.comprimento
+        indices = self._indices_uniformes(len(self.alfabeto), quantidade * comprimento).reshape(quantidade, comprimento)
+
+        garantidos = len(self.indices_garantidos)
+        if garantidos and quantidade:
+            #chaves aleatorias de 64 bits ordenadas por linha formam uma permutacao uniforme;
+            #as primeiras colunas dela sao posicoes distintas para os caracteres garantidos.
+            #como o preenchimento e iid, isso equivale a embaralhar cada linha
+            chaves = np.frombuffer(self._bytes_aleatorios(quantidade * comprimento * 8), dtype=np.uint64)
+            posicoes = np.argsort(chaves.reshape(quantidade, comprimento), axis=1)[:, :garantidos]
+            linhas = np.arange(quantidade)
+            for coluna, conjunto in enumerate(self.indices_garantidos):
+                escolhidos = conjunto[self._indices_uniformes(len(conjunto), quantidade)]
+                indices[linhas, posicoes[:, coluna]] = escolhidos
+        return indices
+
+    def gerar_matriz(self, quantidade: int, quebra_linha: bool = False) -> "np.ndarray":
+        #matriz de code points; com quebra_linha=True ganha uma coluna final com "\n",
+        #e o buffer da matriz ja e um arquivo de texto com uma senha por linha
+        codigos = self.tabela[self.gerar_indices(quantidade)]
+        if not quebra_linha:
+            return codigos
+        matriz = np.empty((quantidade, self.comprimento + 1), dtype=self.dtype)
+        matriz[:, :-1] = codigos
+        matriz[:, -1] = ord("\n")
+        return matriz
+
+    def codificacao(self) -> str:
+        return "latin-1" if self.dtype == np.uint8 else "utf-32-le"
+
+    def para_strings(self, matriz: "np.ndarray") -> Iterator[str]:
+        #converte as linhas em str apenas quando consumidas
+        codificacao = self.codificacao()
+        for linha in matriz:
+            yield linha.tobytes().decode(codificacao)
+
+    def escrever(self, matriz: "np.ndarray", destino: BinaryIO) -> int:
+        #grava o buffer da matriz diretamente, sem copias nem str intermediarias
+        return destino.write(memoryview(np.ascontiguousarray(matriz)).cast("B"))
+
+def gerar_matriz_senhas(config: ConfiguracaoSenha, quantidade: int) -> "np.ndarray":
+    return GeradorVetorizado(config).gerar_matriz(quantidade)
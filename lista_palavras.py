@@ -0,0 +1,112 @@
+import hashlib
+import mmap
+import os
+import struct
+from typing import Iterable
+
+#formato binario da lista compilada (inteiros uint32 little-endian):
+#  MAGICA | quantidade | menor comprimento | maior comprimento | quantidade+1 offsets | palavras em UTF-8
+#a palavra i ocupa blob[offsets[i]:offsets[i+1]], entao ler uma palavra e O(1) e o arquivo
+#e so mapeado em memoria, sem virar uma lista de str no processo
+MAGICA = b"GSPALAV1"
+_CABECALHO = struct.Struct("<8sIII")
+_OFFSET = struct.Struct("<I")
+VERSAO_LISTA_PADRAO = "zxcvbn-1"
+LISTAS_ZXCVBN = ("english_wikipedia", "us_tv_and_film", "surnames", "female_names", "male_names")
+COMPRIMENTO_MIN_PALAVRA = 3
+COMPRIMENTO_MAX_PALAVRA = 10
+
+def palavras_padrao() -> list[str]:
+    #lista padrao: palavras alfabeticas ascii dos dicionarios de frequencia do zxcvbn (~56 mil)
+    from zxcvbn.frequency_lists import FREQUENCY_LISTS
+    vistas = {}
+    for nome in LISTAS_ZXCVBN:
+        for palavra in FREQUENCY_LISTS[nome]:
+            if palavra.isascii() and palavra.isalpha() and COMPRIMENTO_MIN_PALAVRA <= len(palavra) <= COMPRIMENTO_MAX_PALAVRA:
+                vistas.setdefault(palavra.lower(), None)
+    return list(vistas)
+
+def ler_arquivo_palavras(caminho: str) -> list[str]:
+    #um arquivo de texto com uma palavra por linha; linhas vazias e repetidas sao ignoradas.
+    #aceita listas diceware ("11111<tab>palavra"), usando a ultima coluna
+    vistas = {}
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if partes:
+                vistas.setdefault(partes[-1], None)
+    return list(vistas)
+
+def compilar_lista(palavras: Iterable[str], destino: str) -> int:
+    blob = bytearray()
+    offsets = [0]
+    menor, maior = None, 0
+    for palavra in palavras:
+        blob += palavra.encode("utf-8")
+        offsets.append(len(blob))
+        menor = len(palavra) if menor is None else min(menor, len(palavra))
+        maior = max(maior, len(palavra))
+    quantidade = len(offsets) - 1
+    if quantidade < 2:
+        raise ValueError("A lista de palavras precisa de pelo menos 2 palavras.")
+
+    #grava em um temporario e renomeia, para que leitores concorrentes nunca vejam um arquivo pela metade
+    temporario = f"{destino}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(MAGICA, quantidade, menor, maior))
+        arquivo.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        arquivo.write(blob)
+    os.replace(temporario, destino)
+    return quantidade
+
+class ListaPalavras:
+    def __init__(self, caminho: str):
+        with open(caminho, "rb") as arquivo:
+            self._mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapa) < _CABECALHO.size:
+            raise ValueError(f"Lista de palavras inválida: {caminho}.")
+        magica, self.quantidade, self.menor_comprimento, self.maior_comprimento = _CABECALHO.unpack_from(self._mapa)
+        if magica != MAGICA:
+            raise ValueError(f"Lista de palavras inválida: {caminho}.")
+        self.caminho = caminho
+        self._inicio_offsets = _CABECALHO.size
+        self._inicio_palavras = _CABECALHO.size + _OFFSET.size * (self.quantidade + 1)
+
+    def __len__(self) -> int:
+        return self.quantidade
+
+    def __getitem__(self, indice: int) -> str:
+        if not 0 <= indice < self.quantidade:
+            raise IndexError(indice)
+        inicio, fim = struct.unpack_from("<II", self._mapa, self._inicio_offsets + _OFFSET.size * indice)
+        return self._mapa[self._inicio_palavras + inicio:self._inicio_palavras + fim].decode("utf-8")
+
+    def fechar(self) -> None:
+        self._mapa.close()
+
+#listas abertas neste processo, por arquivo compilado
+_listas_abertas: dict[str, ListaPalavras] = {}
+
+def caminho_compilado(origem: str | None) -> str:
+    from gerador_senha import diretorio_cache
+    if origem is None:
+        identificador = VERSAO_LISTA_PADRAO
+    else:
+        info = os.stat(origem)
+        identificador = f"{os.path.abspath(origem)}:{info.st_size}:{info.st_mtime_ns}"
+    resumo = hashlib.sha256(identificador.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(diretorio_cache(), f"palavras-{resumo}.bin")
+
+def abrir_lista_palavras(origem: str | None = None) -> ListaPalavras:
+    #compila a lista (a padrao ou um arquivo de texto) na primeira vez e depois so a mapeia
+    try:
+        destino = caminho_compilado(origem)
+    except OSError as e:
+        raise ValueError(f"Não foi possível ler a lista de palavras {origem}: {e}")
+    lista = _listas_abertas.get(destino)
+    if lista is not None:
+        return lista
+    if not os.path.exists(destino):
+        compilar_lista(palavras_padrao() if origem is None else ler_arquivo_palavras(origem), destino)
+    lista = _listas_abertas[destino] = ListaPalavras(destino)
+    return lista
@@ -0,0 +1,227 @@
+import json
+import os
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Iterator
+
+from gerador_senha import (CacheLRU, ConfiguracaoSenha, GeradorSenhaCompilado, PoliticaForca, compilar_configuracao,
+                           MAX_GERADORES_EM_CACHE)
+
+#um manifesto lista entradas com os campos de ConfiguracaoSenha, mais "id", "quantidade" (padrao 1),
+#"politica" e "score_minimo" opcionais. formatos aceitos:
+#  NDJSON (.ndjson/.jsonl): um objeto JSON por linha. .json nao e aceito: seria lido como um array inteiro
+#  na memoria, e nao linha a linha
+#  XML (.xml): <manifesto><config id="..." quantidade="..."><comprimento>14</comprimento>...</config>...</manifesto>
+CAMPOS_SAIDA_MANIFESTO = ("id", "senha", "comprimento", "score", "tentativas", "erro")
+CAMPOS_INTEIROS = {"comprimento", "quantidade", "score_minimo"}
+CAMPOS_BOOLEANOS = {"incluir_maiusculas", "incluir_minusculas", "incluir_numeros", "incluir_simbolos", "agrupar_grafemas"}
+CAMPOS_TEXTO = {"simbolos_personalizados", "texto_necessario", "modo", "separador", "lista_palavras", "politica"}
+SENHAS_POR_TAREFA = 512
+
+def _valor_xml(campo: str, texto: str | None):
+    texto = (texto or "").strip() if campo not in ("simbolos_personalizados", "texto_necessario") else (texto or "")
+    if campo in CAMPOS_INTEIROS:
+        return int(texto)
+    if campo in CAMPOS_BOOLEANOS:
+        return texto.lower() in ("true", "1", "sim")
+    return texto
+
+def _ler_xml(caminho: str) -> Iterator[dict]:
+    #iterparse + clear: cada <config> e descartada assim que lida, entao a memoria nao cresce com o arquivo
+    try:
+        contexto = ET.iterparse(caminho, events=("start", "end"))
+        _, raiz = next(contexto)
+        for evento, elemento in contexto:
+            if evento != "end" or elemento.tag != "config":
+                continue
+            try:
+                entrada = {campo: _valor_xml(campo, valor) for campo, valor in elemento.attrib.items()}
+                for filho in elemento:
+                    entrada[filho.tag] = _valor_xml(filho.tag, filho.text)
+            except ValueError:
+                entrada = {"erro": "Campo numérico inválido no manifesto."}
+                if "id" in elemento.attrib:
+                    entrada["id"] = elemento.get("id")
+            elemento.clear()
+            raiz.clear()
+            yield entrada
+    except ET.ParseError as e:
+        raise ValueError(f"Manifesto XML inválido: {e}")
+
+def _ler_ndjson(caminho: str) -> Iterator[dict]:
+    with open(caminho, encoding="utf-8") as arquivo:
+        for numero, linha in enumerate(arquivo, start=1):
+            if not linha.strip():
+                continue
+            try:
+                entrada = json.loads(linha)
+            except json.JSONDecodeError:
+                entrada = {"erro": f"Linha {numero} do manifesto não é um JSON válido."}
+            if not isinstance(entrada, dict):
+                entrada = {"erro": f"Linha {numero} do manifesto não é um objeto JSON."}
+            yield entrada
+
+def ler_manifesto(caminho: str) -> Iterator[dict]:
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".xml":
+        leitor = _ler_xml(caminho)
+    elif extensao in (".ndjson", ".jsonl"):
+        leitor = _ler_ndjson(caminho)
+    else:
+        raise ValueError(f"Formato de manifesto não suportado: {extensao or caminho}. Use .ndjson, .jsonl ou .xml.")
+    for indice, entrada in enumerate(leitor):
+        entrada.setdefault("id", indice)
+        yield entrada
+
+#campos de uma entrada que nao pertencem a configuracao; "_parte" numera os pedacos de uma entrada grande
+CAMPOS_DA_ENTRADA = ("id", "quantidade", "_parte")
+
+def chave_entrada(entrada: dict) -> str:
+    #configuracoes identicas (independente de id e quantidade) compartilham um gerador compilado
+    return json.dumps({k: v for k, v in entrada.items() if k not in CAMPOS_DA_ENTRADA}, sort_keys=True)
+
+def _erro_de_tipo(entrada: dict) -> str | None:
+    #o JSON aceita qualquer tipo em qualquer campo; um 12.5 em comprimento compilaria e so falharia ao gerar
+    for campo, valor in entrada.items():
+        if campo in CAMPOS_INTEIROS and (not isinstance(valor, int) or isinstance(valor, bool)):
+            return f"O campo {campo} deve ser um inteiro."
+        if campo in CAMPOS_BOOLEANOS and not isinstance(valor, bool):
+            return f"O campo {campo} deve ser verdadeiro ou falso."
+        if campo in CAMPOS_TEXTO and valor is not None and not isinstance(valor, str):
+            return f"O campo {campo} deve ser um texto."
+    return None
+
+class CacheGeradores:
+    #LRU de geradores compilados (ou do erro de configuracao) por chave_entrada
+    def __init__(self, capacidade: int = MAX_GERADORES_EM_CACHE):
+        self._itens = CacheLRU(capacidade)
+
+    def obter(self, entrada: dict) -> GeradorSenhaCompilado | str:
+        return self._itens.obter(chave_entrada(entrada), lambda: self._compilar(entrada))
+
+    @staticmethod
+    def _compilar(entrada: dict) -> GeradorSenhaCompilado | str:
+        if "erro" in entrada:
+            return entrada["erro"]
+        erro = _erro_de_tipo(entrada)
+        if erro is not None:
+            return erro
+        dados = {k: v for k, v in entrada.items() if k not in CAMPOS_DA_ENTRADA}
+        try:
+            politica = PoliticaForca(modo=dados.pop("politica", "adaptativa"), score_minimo=dados.pop("score_minimo", 3))
+            return compilar_configuracao(ConfiguracaoSenha(**dados), politica)
+        except TypeError as e:
+            return f"Campo de configuração inválido: {e}"
+        except ValueError as e:
+            return str(e)
+
+_cache_worker: CacheGeradores | None = None
+
+def processar_entradas(entradas: list[dict]) -> list[dict]:
+    #roda em um worker (ou no proprio processo): gera as senhas de um grupo de entradas
+    global _cache_worker
+    if _cache_worker is None:
+        _cache_worker = CacheGeradores()
+    registros = []
+    for entrada in entradas:
+        gerador = _cache_worker.obter(entrada)
+        if isinstance(gerador, str):
+            #o erro de uma entrada dividida sai uma vez so, no primeiro pedaco
+            if entrada.get("_parte", 0) == 0:
+                registros.append({"id": entrada["id"], "erro": gerador})
+            continue
+        try:
+            for _ in range(entrada.get("quantidade", 1)):
+                resultado = gerador.gerar_resultado()
+                registros.append({"id": entrada["id"], "senha": resultado.senha, "comprimento": len(resultado.senha),
+                                  "score": resultado.score, "tentativas": resultado.tentativas})
+        except (TypeError, ValueError) as e:
+            #uma entrada que falha ao gerar vira um registro de erro, sem interromper o manifesto
+            registros.append({"id": entrada["id"], "erro": f"Erro ao gerar senhas: {e}"})
+    return registros
+
+def _agrupar(entradas: Iterator[dict], senhas_por_tarefa: int) -> Iterator[list[dict]]:
+    #grupos de no maximo senhas_por_tarefa senhas: uma entrada grande e dividida em pedacos com a mesma
+    #configuracao, para que nenhuma tarefa monte (ou devolva) a lista de registros de uma entrada inteira
+    grupo, senhas = [], 0
+    for entrada in entradas:
+        quantidade = entrada.get("quantidade", 1)
+        if isinstance(quantidade, bool) or not isinstance(quantidade, int) or quantidade < 0:
+            entrada = {"id": entrada.get("id"), "erro": "A quantidade deve ser um inteiro não negativo."}
+            quantidade = 0
+        restante, parte = quantidade, 0
+        while True:
+            pedaco = min(restante, senhas_por_tarefa - senhas)
+            grupo.append(entrada if pedaco == quantidade else {**entrada, "quantidade": pedaco, "_parte": parte})
+            senhas += pedaco
+            restante -= pedaco
+            parte += 1
+            if senhas >= senhas_por_tarefa:
+                yield grupo
+                grupo, senhas = [], 0
+            if restante == 0:
+                break
+    if grupo:
+        yield grupo
+
+class ResumoManifesto:
+    def __init__(self):
+        self.entradas = 0
+        self.senhas = 0
+        self.erros = 0
+        self.configuracoes_distintas = 0
+        self._chaves: set[int] = set()
+
+    def contar_entrada(self, entrada: dict) -> None:
+        self.entradas += 1
+        chave = hash(chave_entrada(entrada))
+        if chave not in self._chaves:
+            self._chaves.add(chave)
+            self.configuracoes_distintas += 1
+
+    def contar_registro(self, registro: dict) -> None:
+        if "erro" in registro:
+            self.erros += 1
+        else:
+            self.senhas += 1
+
+def processar_manifesto(caminho: str,
+                        workers: int = 1,
+                        senhas_por_tarefa: int = SENHAS_POR_TAREFA,
+                        resumo: ResumoManifesto | None = None) -> Iterator[dict]:
+    #le o manifesto sob demanda e devolve os registros de saida a medida que ficam prontos.
+    #com workers > 1, no maximo 2 tarefas por worker ficam pendentes e a ordem de saida pode variar
+    if workers <= 0:
+        raise ValueError("O número de workers deve ser positivo.")
+    if senhas_por_tarefa <= 0:
+        raise ValueError("O número de senhas por tarefa deve ser positivo.")
+    resumo = resumo if resumo is not None else ResumoManifesto()
+
+    def entradas_contadas():
+        for entrada in ler_manifesto(caminho):
+            resumo.contar_entrada(entrada)
+            yield entrada
+
+    grupos = _agrupar(entradas_contadas(), senhas_por_tarefa)
+    if workers == 1:
+        for grupo in grupos:
+            for registro in processar_entradas(grupo):
+                resumo.contar_registro(registro)
+                yield registro
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pendentes = set()
+        for grupo in grupos:
+            pendentes.add(executor.submit(processar_entradas, grupo))
+            if len(pendentes) >= 2 * workers:
+                break
+        while pendentes:
+            concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                for registro in futuro.result():
+                    resumo.contar_registro(registro)
+                    yield registro
+                grupo = next(grupos, None)
+                if grupo is not None:
+                    pendentes.add(executor.submit(processar_entradas, grupo))
@@ -1,24 +1,154 @@
 import argparse
-from gerador_senha import ConfiguracaoSenha, gerar_senha
+import os
+import sys
+import time
+from gerador_senha import (ConfiguracaoSenha, EstatisticasGeracao, PoliticaForca, ResultadoGeracao, gerar_resultados,
+                           AVALIADORES, FORMATO_BINARIO, FORMATOS_SAIDA, MODOS_POLITICA, SCORE_MINIMO_PADRAO,
+                           TAMANHO_LOTE_PADRAO)
+
+#modulos de lote, paralelismo e servico sao importados apenas quando usados, para manter rapida
+#a inicializacao do caso comum (e de --help); pelo mesmo motivo o zxcvbn so carrega sob demanda
+
+def contar_abaixo_da_meta(resultados, contagem: list[int]):
+    #repassa os resultados contando em contagem[0] os que ficaram abaixo do score minimo
+    for resultado in resultados:
+        if not resultado.atingiu_meta:
+            contagem[0] += 1
+        yield resultado
+
+def continuar_localmente(remotos, quantidade: int, gerar_localmente):
+    #repassa os resultados do servico aquecido; se a conexao cair no meio, as senhas que faltam sao geradas
+    #localmente (o gerador do servico so conecta e conversa enquanto e consumido)
+    entregues = 0
+    try:
+        for resultado in remotos:
+            yield resultado
+            entregues += 1
+    except OSError as e:
+        print(f"Aviso: {e}. Gerando localmente as {quantidade - entregues} senhas restantes.", file=sys.stderr)
+        yield from gerar_localmente(quantidade - entregues)
 
 if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Gerador de Senhas Seguras")
-    parser.add_argument("-c", "--comprimento", type=int, default=12, help="Comprimento da senha (padrão: 12)")
+    parser.add_argument("-c", "--comprimento", type=int, help="Comprimento da senha, ou número de palavras com --frase (padrão: 12 e 6)")
     parser.add_argument("--maiusculas", action="store_true", help="Incluir letras maiúsculas")
     parser.add_argument("--minusculas", action="store_true", help="Incluir letras minúsculas")
     parser.add_argument("--numeros", action="store_true", help="Incluir números")
     parser.add_argument("--simbolos", action="store_true", help="Incluir símbolos padrão")
     parser.add_argument("--simbolos_custom", type=str, help="String de símbolos personalizados para usar")
     parser.add_argument("--texto_necessario", type=str, help="String de texto que deve estar na senha")
+    parser.add_argument("--grafemas", action="store_true",
+                        help="Trata cada cluster de grafemas (ex.: emoji com tom de pele, bandeiras) de --simbolos_custom e --texto_necessario como um caractere")
+    parser.add_argument("--frase", action="store_true", help="Gera uma frase-senha (palavras sorteadas); maiúsculas capitalizam e números/símbolos são injetados")
+    parser.add_argument("--separador", type=str, default="-", help="Separador das palavras no modo --frase (padrão: -)")
+    parser.add_argument("--lista_palavras", type=str, help="Arquivo com uma palavra por linha para o modo --frase (padrão: lista embutida)")
+    parser.add_argument("--padrao", type=str, metavar="MODELO",
+                        help="Gera senhas no formato de um modelo: a minúscula, A maiúscula, 9 dígito, ! símbolo, * qualquer, \\x literal (ex.: Aaaa-9999-!!)")
+    parser.add_argument("--politica", choices=MODOS_POLITICA, default="adaptativa", help="Como verificar a força da senha (padrão: adaptativa)")
+    parser.add_argument("--score_minimo", type=int, default=SCORE_MINIMO_PADRAO, help=f"Score mínimo exigido na verificação de força (padrão: {SCORE_MINIMO_PADRAO})")
+    parser.add_argument("--avaliador", choices=AVALIADORES, default="zxcvbn",
+                        help="Implementação do score do zxcvbn: a biblioteca ou o autômato de dicionários compilado, mais rápido (padrão: zxcvbn)")
+    parser.add_argument("--prazo_ms", type=float, metavar="MS",
+                        help="Tempo máximo das tentativas de cada senha; ao esgotar, usa a candidata de maior score (padrão: sem prazo)")
+    parser.add_argument("--calibrar", action="store_true",
+                        help="Ajusta o número de tentativas à taxa de aceitação do zxcvbn medida para a configuração (medição guardada em cache)")
+    parser.add_argument("-n", "--quantidade", type=int, default=1, help="Quantidade de senhas a gerar (padrão: 1)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Processos usados na geração em lote (padrão: 1)")
+    parser.add_argument("--lote", type=int, default=TAMANHO_LOTE_PADRAO, help=f"Senhas por tarefa enviada aos workers (padrão: {TAMANHO_LOTE_PADRAO})")
+    parser.add_argument("--formato", choices=FORMATOS_SAIDA + (FORMATO_BINARIO,), default="texto", help="Formato de saída em lote: uma senha por linha, NDJSON, CSV ou binário com acesso direto (arquivo_senhas.py; exige -o) (padrão: texto)")
+    parser.add_argument("-o", "--saida", type=str, help="Arquivo de saída (padrão: saída padrão)")
+    parser.add_argument("--stats", action="store_true", help="Mostra estatísticas de geração (tentativas, tempos, entropia) no stderr")
+    parser.add_argument("--servico", nargs="?", const="", metavar="SOCKET",
+                        help="Usa o serviço aquecido (servico_aquecido.py), com dicionários já carregados; sem SOCKET usa o caminho padrão")
+    parser.add_argument("--unicas", choices=("exata", "bloom"),
+                        help="Garante senhas distintas no lote com memória limitada: tabela de resumos (exata) ou filtro de Bloom")
+    parser.add_argument("--taxa_fp", type=float, default=1e-6, help="Taxa de falsos positivos do modo --unicas bloom (padrão: 1e-6)")
+    parser.add_argument("--deterministico", type=str, metavar="ARQUIVO_SEGREDO",
+                        help="Apenas para testes de carga: senhas reproduzíveis derivadas do segredo no arquivo (nunca use em produção)")
+    parser.add_argument("--fluxo", type=str, default="padrao", help="Identificador do fluxo no modo --deterministico (padrão: padrao)")
+    parser.add_argument("--fragmento", type=str, metavar="K/N",
+                        help="No modo --deterministico, gera só a fatia K (0..N-1) de N das --quantidade senhas")
+    parser.add_argument("--auditar", type=str, metavar="ARQUIVO",
+                        help="Audita um arquivo de senhas (uma por linha) contra a configuração e o --score_minimo; "
+                             "escreve as violações (número da linha e motivos) e um resumo no stderr")
+    parser.add_argument("--manifesto", type=str, metavar="ARQUIVO",
+                        help="Processa um lote de configurações de um manifesto NDJSON ou XML (usa --workers, --formato e --saida)")
 
     args = parser.parse_args()
 
-    if not (args.maiusculas or args.minusculas or args.numeros or args.simbolos):
-        print("Aviso: Nenhum tipo de caractere foi explicitamente solicitado. Usando minúsculas por padrão.")
+    if args.manifesto is not None:
+        from exportacao import abrir_saida, escrever_registros
+        from lote_manifesto import CAMPOS_SAIDA_MANIFESTO, ResumoManifesto, processar_manifesto
+        resumo = ResumoManifesto()
+        inicio = time.perf_counter()
+        try:
+            with abrir_saida(args.saida) as destino:
+                escrever_registros(processar_manifesto(args.manifesto, args.workers, resumo=resumo),
+                                   destino, CAMPOS_SAIDA_MANIFESTO, args.formato)
+        except (ValueError, OSError) as e:
+            print(f"Erro ao processar manifesto: {e}", file=sys.stderr)
+            exit(1)
+        duracao = time.perf_counter() - inicio
+        print(f"Manifesto: {resumo.entradas} entradas, {resumo.configuracoes_distintas} configurações distintas, "
+              f"{resumo.senhas} senhas, {resumo.erros} erros em {duracao:.2f}s", file=sys.stderr)
+        exit(1 if resumo.erros else 0)
+
+    #opcoes da configuracao que o modelo de --padrao substitui (antes de preencher os valores padrao)
+    opcoes_sem_efeito_no_padrao = [opcao for opcao, informada in (
+        ("-c", args.comprimento is not None), ("--maiusculas", args.maiusculas), ("--minusculas", args.minusculas),
+        ("--numeros", args.numeros), ("--simbolos", args.simbolos), ("--texto_necessario", args.texto_necessario is not None),
+        ("--grafemas", args.grafemas), ("--frase", args.frase), ("--separador", args.separador != parser.get_default("separador")),
+        ("--lista_palavras", args.lista_palavras is not None), ("--avaliador", args.avaliador != parser.get_default("avaliador")),
+    ) if informada]
+
+    if args.comprimento is None:
+        args.comprimento = 6 if args.frase else 12
+
+    if not args.frase and args.padrao is None and not (args.maiusculas or args.minusculas or args.numeros or args.simbolos):
+        #em formatos estruturados o aviso vai para stderr para nao corromper a saida
+        print("Aviso: Nenhum tipo de caractere foi explicitamente solicitado. Usando minúsculas por padrão.",
+              file=sys.stdout if args.formato == "texto" else sys.stderr)
         if not args.maiusculas and not args.minusculas and not args.numeros and not args.simbolos:
             args.minusculas = True
     try:
+        if args.formato == FORMATO_BINARIO and args.saida in (None, "-"):
+            raise ValueError("O formato binário exige um arquivo de saída (-o).")
+        if args.deterministico is not None and (args.padrao is not None or args.unicas is not None or args.servico is not None):
+            raise ValueError("O modo determinístico não pode ser combinado com --padrao, --unicas ou --servico.")
+        #as estatisticas sao medidas no gerador local; com o servico nao haveria o que mostrar
+        if args.servico is not None and args.stats:
+            raise ValueError("--stats não pode ser combinado com --servico.")
+        if args.padrao is not None:
+            #o padrao nao passa pelas tentativas da politica; so o score minimo se aplica, contra o score estimado
+            if (args.politica != parser.get_default("politica") or args.unicas is not None or args.calibrar or
+                    args.prazo_ms is not None):
+                raise ValueError("O modo --padrao não pode ser combinado com --politica, --unicas, --calibrar ou --prazo_ms.")
+            if opcoes_sem_efeito_no_padrao:
+                raise ValueError(f"O modelo de --padrao define a senha inteira; remova {', '.join(opcoes_sem_efeito_no_padrao)}.")
+            from padrao_senha import gerar_resultados_padrao
+            inicio = time.perf_counter()
+            abaixo_da_meta = [0]
+            resultados = contar_abaixo_da_meta(
+                gerar_resultados_padrao(args.padrao, args.quantidade, args.simbolos_custom, score_minimo=args.score_minimo),
+                abaixo_da_meta)
+            if args.quantidade == 1 and args.formato == "texto" and args.saida is None:
+                print("Senha Gerada:", next(resultados).senha)
+            elif args.formato == FORMATO_BINARIO:
+                from arquivo_senhas import escrever_arquivo_senhas, largura_registro
+                from padrao_senha import compilar_padrao
+                largura = largura_registro(compilar_padrao(args.padrao, args.simbolos_custom))
+                total = escrever_arquivo_senhas(resultados, args.saida, args.quantidade, largura)
+                print(f"{total} senhas geradas em {time.perf_counter() - inicio:.2f}s", file=sys.stderr)
+            else:
+                from exportacao import abrir_saida, escrever_resultados
+                with abrir_saida(args.saida) as destino:
+                    total = escrever_resultados(resultados, destino, args.formato)
+                print(f"{total} senhas geradas em {time.perf_counter() - inicio:.2f}s", file=sys.stderr)
+            if abaixo_da_meta[0]:
+                print(f"Aviso: o padrão tem score estimado abaixo do score mínimo {args.score_minimo}.", file=sys.stderr)
+            exit(0)
+
         config = ConfiguracaoSenha(
             comprimento=args.comprimento,
             incluir_maiusculas=args.maiusculas,
@@ -26,10 +156,116 @@ if __name__ == "__main__":
             incluir_numeros=args.numeros,
             incluir_simbolos=args.simbolos,
             simbolos_personalizados=args.simbolos_custom,
-            texto_necessario=args.texto_necessario
+            texto_necessario=args.texto_necessario,
+            modo="frase" if args.frase else "caracteres",
+            separador=args.separador,
+            lista_palavras=args.lista_palavras,
+            agrupar_grafemas=args.grafemas
         )
-        senha_gerada = gerar_senha(config)
-        print("Senha Gerada:", senha_gerada)
+        politica = PoliticaForca(modo=args.politica, score_minimo=args.score_minimo, avaliador=args.avaliador,
+                                 prazo_ms=args.prazo_ms)
+        estatisticas = EstatisticasGeracao() if args.stats else None
+
+        if args.auditar is not None:
+            from auditoria import CAMPOS_VIOLACAO, ResumoAuditoria, auditar_arquivo
+            from exportacao import abrir_saida, escrever_registros
+            resumo = ResumoAuditoria()
+            inicio = time.perf_counter()
+            with abrir_saida(args.saida) as destino:
+                escrever_registros(auditar_arquivo(args.auditar, config, politica, args.workers, resumo=resumo),
+                                   destino, CAMPOS_VIOLACAO, args.formato,
+                                   formatar_texto=lambda v: f"linha {v['linha']}: {v['motivos']}")
+            print(f"{resumo.resumo()} em {time.perf_counter() - inicio:.2f}s", file=sys.stderr)
+            exit(1 if resumo.reprovadas else 0)
+
+        if args.calibrar:
+            from calibracao import calibrar
+            politica, calibracao = calibrar(config, politica)
+            if calibracao is not None:
+                print(f"Calibração: {calibracao.taxa_aceitacao(politica.score_minimo):.1%} das candidatas atingem o score "
+                      f"mínimo, {calibracao.custo_ms:.2f} ms por avaliação; até {politica.max_tentativas} tentativas por senha",
+                      file=sys.stderr)
+                if not calibracao.atinge(politica.score_minimo):
+                    print(f"Aviso: nenhuma de {calibracao.amostras} candidatas atingiu o score mínimo {politica.score_minimo}; "
+                          f"aumente o comprimento ou inclua mais tipos de caracteres.", file=sys.stderr)
+
+        def gerar_localmente(quantidade: int):
+            if args.workers > 1:
+                from geracao_paralela import gerar_resultados_paralelo
+                return gerar_resultados_paralelo(config, quantidade, args.workers, args.lote, politica, estatisticas)
+            return gerar_resultados(config, quantidade, politica, estatisticas)
+
+        inicio = time.perf_counter()
+        resultados = None
+        if args.deterministico is not None:
+            from geracao_deterministica import faixa_fragmento, gerar_resultados_deterministicos, ler_segredo
+            indices = range(args.quantidade)
+            if args.fragmento is not None:
+                try:
+                    fragmento, fragmentos = (int(parte) for parte in args.fragmento.split("/"))
+                except ValueError:
+                    raise ValueError("Use --fragmento no formato K/N, por exemplo 0/4.")
+                indices = faixa_fragmento(args.quantidade, fragmentos, fragmento)
+            print("Aviso: modo determinístico; as senhas podem ser recriadas por quem tiver o segredo.", file=sys.stderr)
+            resultados = gerar_resultados_deterministicos(config, ler_segredo(args.deterministico), args.fluxo,
+                                                          indices, politica, args.workers, args.lote)
+        elif args.servico is not None:
+            from servico_aquecido import gerar_via_servico
+            dados = {**vars(config), "politica": politica.modo, "score_minimo": politica.score_minimo,
+                     "avaliador": politica.avaliador, "prazo_ms": politica.prazo_ms,
+                     "max_tentativas": politica.max_tentativas}
+            if config.lista_palavras:
+                #o servico roda em outro diretorio
+                dados["lista_palavras"] = os.path.abspath(config.lista_palavras)
+            try:
+                remotos = (ResultadoGeracao(*r) for r in gerar_via_servico(dados, args.quantidade, args.servico or None))
+                resultados = continuar_localmente(remotos, args.quantidade, gerar_localmente)
+            except ConnectionError as e:
+                print(f"Aviso: {e}. Gerando localmente.", file=sys.stderr)
+        if resultados is None:
+            resultados = gerar_localmente(args.quantidade)
+
+        guarda = None
+        if args.unicas is not None:
+            from gerador_senha import compilar_configuracao
+            from unicidade import criar_guarda, garantir_unicidade, verificar_espaco
+            gerador = compilar_configuracao(config, politica)
+            verificar_espaco(gerador, args.quantidade)
+            guarda = criar_guarda(args.unicas, max(args.quantidade, 1), args.taxa_fp)
+            resultados = garantir_unicidade(resultados, guarda, gerador.gerar_resultado)
+
+        abaixo_da_meta = [0]
+        resultados = contar_abaixo_da_meta(resultados, abaixo_da_meta)
+        if args.quantidade == 1 and args.formato == "texto" and args.saida is None:
+            resultado = next(resultados)
+            print("Senha Gerada:", resultado.senha)
+            if not resultado.atingiu_meta:
+                print(f"Aviso: score mínimo {politica.score_minimo} não atingido (score {resultado.score} "
+                      f"em {resultado.tentativas} tentativas).", file=sys.stderr)
+        else:
+            if args.formato == FORMATO_BINARIO:
+                from arquivo_senhas import escrever_arquivo_senhas, largura_registro
+                from gerador_senha import compilar_configuracao
+                largura = largura_registro(compilar_configuracao(config, politica))
+                total = escrever_arquivo_senhas(resultados, args.saida, args.quantidade, largura)
+            else:
+                from exportacao import abrir_saida, escrever_resultados
+                with abrir_saida(args.saida) as destino:
+                    total = escrever_resultados(resultados, destino, args.formato)
+            duracao = time.perf_counter() - inicio
+            vazao = total / duracao if duracao > 0 else float("inf")
+            print(f"{total} senhas geradas em {duracao:.2f}s ({vazao:.0f} senhas/s, {args.workers} workers)", file=sys.stderr)
+            if abaixo_da_meta[0]:
+                print(f"Aviso: {abaixo_da_meta[0]} senhas abaixo do score mínimo {politica.score_minimo}.", file=sys.stderr)
+            if guarda is not None:
+                print(f"Unicidade ({args.unicas}): {guarda.rejeitadas} repetidas descartadas, "
+                      f"{guarda.memoria_bytes() / 2**20:.1f} MiB de memória", file=sys.stderr)
+        if estatisticas is not None:
+            print(estatisticas.resumo(), file=sys.stderr)
     except ValueError as e:
         print(f"Erro ao gerar senha: {e}")
-        exit(1)
\ No newline at end of file
+        exit(1)
+    except OSError as e:
+        #saida (-o) ou arquivos de entrada inacessiveis: erro do CLI, como no modo manifesto
+        print(f"Erro ao acessar arquivo: {e}", file=sys.stderr)
+        exit(1)
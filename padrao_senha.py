@@ -0,0 +1,107 @@
+import math
+from functools import lru_cache
+from typing import Iterator
+
+from alfabeto import compilar_alfabeto
+from gerador_senha import (AmostradorSeguro, ResultadoGeracao, estimar_log10_palpites, score_por_palpites,
+                           SCORE_MINIMO_PADRAO, CARACTERES_MAIUSCULOS, CARACTERES_MINUSCULOS, CARACTERES_NUMERICOS,
+                           CARACTERES_SIMBOLOS_PADRAO)
+
+#cada caractere do padrao vira o alfabeto de uma posicao:
+#  a minuscula, A maiuscula, 9 digito, ! simbolo, * qualquer um dos anteriores
+#  \x usa x literalmente; os demais caracteres tambem sao literais (ex.: "Aaaa-9999-!!")
+CLASSES_PADRAO = {
+    "a": CARACTERES_MINUSCULOS,
+    "A": CARACTERES_MAIUSCULOS,
+    "9": CARACTERES_NUMERICOS,
+}
+TAMANHO_CACHE_PADROES = 256
+SENHAS_POR_BLOCO = 1024
+
+class PadraoCompilado:
+    #sequencia de alfabetos por posicao. as posicoes sao agrupadas por alfabeto para que cada
+    #alfabeto seja sorteado com um unico pedido ao amostrador, mesmo em lote
+    def __init__(self, padrao: str, simbolos: str | None = None):
+        if not padrao:
+            raise ValueError("O padrão não pode ser vazio.")
+        simbolos = CARACTERES_SIMBOLOS_PADRAO if simbolos is None else compilar_alfabeto(simbolos)
+        classes = {**CLASSES_PADRAO, "!": simbolos,
+                   "*": compilar_alfabeto(CARACTERES_MINUSCULOS, CARACTERES_MAIUSCULOS, CARACTERES_NUMERICOS, simbolos)}
+
+        alfabetos = []
+        escapar = False
+        for caractere in padrao:
+            if escapar:
+                alfabetos.append(caractere)
+                escapar = False
+            elif caractere == "\\":
+                escapar = True
+            elif caractere in classes:
+                if not classes[caractere]:
+                    raise ValueError("O padrão usa símbolos, mas o conjunto de símbolos está vazio.")
+                alfabetos.append(classes[caractere])
+            else:
+                alfabetos.append(caractere)
+        if escapar:
+            raise ValueError("O padrão termina com um escape (\\) incompleto.")
+
+        self.padrao = padrao
+        self.alfabetos = tuple(alfabetos)
+        self.comprimento = len(alfabetos)
+        self.modelo = [alfabeto if len(alfabeto) == 1 else "" for alfabeto in alfabetos]
+        grupos = {}
+        for posicao, alfabeto in enumerate(alfabetos):
+            if len(alfabeto) > 1:
+                grupos.setdefault(alfabeto, []).append(posicao)
+        if not grupos:
+            raise ValueError("O padrão não tem nenhuma posição aleatória.")
+        self.grupos = tuple((alfabeto, tuple(posicoes)) for alfabeto, posicoes in grupos.items())
+        self.entropia_bits = sum(math.log2(len(alfabeto)) for alfabeto in alfabetos)
+        self.score_estimado = score_por_palpites(estimar_log10_palpites(self.entropia_bits, self.comprimento))
+
+    def gerar(self, amostrador: AmostradorSeguro) -> str:
+        return self.gerar_lote(amostrador, 1)[0]
+
+    def gerar_lote(self, amostrador: AmostradorSeguro, quantidade: int) -> list[str]:
+        senhas = [self.modelo.copy() for _ in range(quantidade)]
+        for alfabeto, posicoes in self.grupos:
+            sorteados = iter(amostrador.escolher(alfabeto, quantidade * len(posicoes)))
+            for senha in senhas:
+                for posicao in posicoes:
+                    senha[posicao] = next(sorteados)
+        return ["".join(senha) for senha in senhas]
+
+@lru_cache(maxsize=TAMANHO_CACHE_PADROES)
+def compilar_padrao(padrao: str, simbolos: str | None = None) -> PadraoCompilado:
+    #o padrao compilado e imutavel, entao pode ser compartilhado; o amostrador fica com quem gera
+    return PadraoCompilado(padrao, simbolos)
+
+def gerar_senha_padrao(padrao: str, simbolos: str | None = None) -> str:
+    return compilar_padrao(padrao, simbolos).gerar(AmostradorSeguro())
+
+def gerar_resultados_padrao(padrao: str,
+                            quantidade: int,
+                            simbolos: str | None = None,
+                            senhas_por_bloco: int = SENHAS_POR_BLOCO,
+                            score_minimo: int = SCORE_MINIMO_PADRAO) -> Iterator[ResultadoGeracao]:
+    #variante em lote: sorteia blocos de senhas de uma vez e os entrega sob demanda. o padrao fixa a
+    #estrutura e nao ha novas tentativas: a meta e atingida ou nao por todas as senhas, pelo score estimado
+    if quantidade < 0:
+        raise ValueError("A quantidade de senhas não pode ser negativa.")
+    if not 0 <= score_minimo <= 4:
+        raise ValueError("O score mínimo deve estar entre 0 e 4.")
+    compilado = compilar_padrao(padrao, simbolos)
+    atingiu_meta = compilado.score_estimado >= score_minimo
+
+    def resultados():
+        amostrador = AmostradorSeguro()
+        restante = quantidade
+        while restante > 0:
+            bloco = min(restante, senhas_por_bloco)
+            for senha in compilado.gerar_lote(amostrador, bloco):
+                yield ResultadoGeracao(senha, compilado.score_estimado, 1, atingiu_meta)
+            restante -= bloco
+    return resultados()
+
+def gerar_senhas_padrao(padrao: str, quantidade: int, simbolos: str | None = None) -> Iterator[str]:
+    return (resultado.senha for resultado in gerar_resultados_padrao(padrao, quantidade, simbolos))
@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import deque
+
+from gerador_senha import ConfiguracaoSenha, GeradorSenhaCompilado, PoliticaForca, compilar_configuracao
+
+CAPACIDADE_POOL_PADRAO = 256
+
+class PoolSenhas:
+    #mantem um buffer limitado de senhas ja validadas para uma configuracao. uma thread em segundo plano
+    #repoe o buffer sempre que ele cai abaixo do nivel minimo; cada senha e entregue uma unica vez
+    def __init__(self,
+                 config: ConfiguracaoSenha,
+                 capacidade: int = CAPACIDADE_POOL_PADRAO,
+                 nivel_minimo: int | None = None,
+                 politica: PoliticaForca | None = None):
+        if capacidade <= 0:
+            raise ValueError("A capacidade do pool deve ser positiva.")
+        if nivel_minimo is None:
+            nivel_minimo = capacidade // 4
+        if not 0 <= nivel_minimo < capacidade:
+            raise ValueError("O nível mínimo do pool deve estar entre 0 e a capacidade.")
+
+        self.config = config
+        self.politica = politica
+        self.capacidade = capacidade
+        self.nivel_minimo = nivel_minimo
+
+        #o amostrador de um gerador compilado nao e thread-safe: a thread de reposicao tem o seu,
+        #e cada thread consumidora que precisar gerar sincronamente ganha um proprio
+        self._gerador_reposicao = compilar_configuracao(config, politica)
+        self._geradores_locais = threading.local()
+
+        self._senhas = deque()
+        self._condicao = threading.Condition()
+        self._fechado = False
+        self._inicio_falta: float | None = None
+        #excecao que encerrou a thread de reposicao; repassada a quem usar o pool depois disso
+        self._erro: Exception | None = None
+
+        self.acertos = 0
+        self.falhas = 0
+        self.reposicoes = 0
+        self.senhas_repostas = 0
+        self.atraso_reposicao_total = 0.0
+        self.atraso_reposicao_max = 0.0
+
+        self._thread = threading.Thread(target=self._repor, name="PoolSenhas-reposicao", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "PoolSenhas":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        self.fechar()
+
+    def __len__(self) -> int:
+        with self._condicao:
+            return len(self._senhas)
+
+    def _gerador_local(self) -> GeradorSenhaCompilado:
+        gerador = getattr(self._geradores_locais, "gerador", None)
+        if gerador is None:
+            gerador = compilar_configuracao(self.config, self.politica)
+            self._geradores_locais.gerador = gerador
+        return gerador
+
+    def obter(self) -> str:
+        #entrega uma senha do buffer; se ele estiver vazio, gera na hora (conta como falha)
+        with self._condicao:
+            if self._fechado:
+                raise RuntimeError("O pool de senhas está fechado.")
+            if self._erro is not None:
+                raise self._erro
+            if self._senhas:
+                senha = self._senhas.popleft()
+                self.acertos += 1
+            else:
+                senha = None
+                self.falhas += 1
+            if len(self._senhas) < self.nivel_minimo or not self._senhas:
+                self._sinalizar_falta()
+        if senha is None:
+            senha = self._gerador_local().gerar()
+        return senha
+
+    def _sinalizar_falta(self) -> None:
+        if self._inicio_falta is None:
+            self._inicio_falta = time.perf_counter()
+            self._condicao.notify()
+
+    def aguardar_cheio(self, timeout: float | None = None) -> bool:
+        with self._condicao:
+            cheio = self._condicao.wait_for(
+                lambda: len(self._senhas) >= self.capacidade or self._fechado or self._erro is not None, timeout)
+            if self._erro is not None:
+                raise self._erro
+            return cheio
+
+    def _repor(self) -> None:
+        with self._condicao:
+            self._inicio_falta = time.perf_counter()
+        try:
+            while True:
+                with self._condicao:
+                    self._condicao.wait_for(lambda: self._fechado or self._inicio_falta is not None)
+                    if self._fechado:
+                        return
+                    faltam = self.capacidade - len(self._senhas)
+                    if faltam <= 0:
+                        self._concluir_reposicao()
+
+                #gera fora do lock para nao bloquear quem esta consumindo
+                while faltam > 0:
+                    senha = self._gerador_reposicao.gerar()
+                    with self._condicao:
+                        if self._fechado:
+                            return
+                        self._senhas.append(senha)
+                        self.senhas_repostas += 1
+                        faltam = self.capacidade - len(self._senhas)
+                        if faltam <= 0:
+                            self._concluir_reposicao()
+        except Exception as e:
+            #sem a thread ninguem repoe o buffer: guarda o erro para obter e aguardar_cheio o levantarem
+            with self._condicao:
+                self._erro = e
+                self._condicao.notify_all()
+
+    def _concluir_reposicao(self) -> None:
+        #chamado com o lock e o buffer cheio, na mesma secao critica do ultimo append: um obter entre
+        #encher o buffer e limpar _inicio_falta veria a falta ainda marcada e nao sinalizaria a proxima
+        atraso = time.perf_counter() - self._inicio_falta
+        self._inicio_falta = None
+        self.reposicoes += 1
+        self.atraso_reposicao_total += atraso
+        self.atraso_reposicao_max = max(self.atraso_reposicao_max, atraso)
+        self._condicao.notify_all()
+
+    def estatisticas(self) -> dict:
+        with self._condicao:
+            pedidos = self.acertos + self.falhas
+            return {
+                "disponiveis": len(self._senhas),
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / pedidos if pedidos else 0.0,
+                "reposicoes": self.reposicoes,
+                "senhas_repostas": self.senhas_repostas,
+                "atraso_reposicao_medio": self.atraso_reposicao_total / self.reposicoes if self.reposicoes else 0.0,
+                "atraso_reposicao_max": self.atraso_reposicao_max,
+            }
+
+    def fechar(self) -> None:
+        with self._condicao:
+            self._fechado = True
+            self._condicao.notify_all()
+        self._thread.join()
+
+class RegistroPools:
+    #um PoolSenhas por configuracao distinta (ConfiguracaoSenha.chave), criado sob demanda
+    def __init__(self, capacidade: int = CAPACIDADE_POOL_PADRAO, politica: PoliticaForca | None = None):
+        self.capacidade = capacidade
+        self.politica = politica
+        self._pools: dict[tuple, PoolSenhas] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, config: ConfiguracaoSenha) -> PoolSenhas:
+        chave = config.chave()
+        with self._lock:
+            pool = self._pools.get(chave)
+            if pool is None:
+                pool = PoolSenhas(config, self.capacidade, politica=self.politica)
+                self._pools[chave] = pool
+            return pool
+
+    def obter(self, config: ConfiguracaoSenha) -> str:
+        return self.pool(config).obter()
+
+    def fechar(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.fechar()
@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import socket
+import stat
+from typing import Iterator
+
+#protocolo: cada linha enviada e um JSON com os campos de ConfiguracaoSenha mais "quantidade", "politica",
+#"score_minimo", "avaliador", "prazo_ms" e "max_tentativas" (os mesmos do servidor HTTP); cada linha de resposta
+#traz {"resultados": [[senha, score, tentativas, atingiu_meta], ...]} ou {"erro": mensagem}
+NOME_SOCKET = "servico.sock"
+MAX_SENHAS_POR_MENSAGEM = 1000
+
+def caminho_socket_padrao() -> str:
+    from gerador_senha import diretorio_cache
+    return os.path.join(diretorio_cache(), NOME_SOCKET)
+
+def _verificar_dono(caminho: str) -> None:
+    #o socket fica numa pasta privada, mas ainda assim so confiamos em um socket do proprio usuario:
+    #outro usuario poderia publicar um "servico" que entrega senhas conhecidas
+    info = os.stat(caminho)
+    if not stat.S_ISSOCK(info.st_mode):
+        raise ConnectionError(f"{caminho} não é um socket.")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise ConnectionError(f"O socket {caminho} pertence a outro usuário.")
+
+def gerar_via_servico(dados: dict, quantidade: int, caminho: str | None = None) -> Iterator[tuple]:
+    #pede as senhas ao servico aquecido em mensagens de ate MAX_SENHAS_POR_MENSAGEM, sem importar
+    #gerador_senha nem zxcvbn no processo cliente. levanta ConnectionError se o servico nao responder
+    if not hasattr(socket, "AF_UNIX"):
+        raise ConnectionError("Sockets Unix não são suportados nesta plataforma.")
+    caminho = caminho or caminho_socket_padrao()
+    try:
+        _verificar_dono(caminho)
+        conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conexao.connect(caminho)
+    except OSError as e:
+        raise ConnectionError(f"Serviço aquecido indisponível em {caminho}: {e}") from e
+    return _conversar(conexao, dados, quantidade)
+
+def _conversar(conexao: socket.socket, dados: dict, quantidade: int) -> Iterator[tuple]:
+    with conexao, conexao.makefile("rwb") as canal:
+        restante = quantidade
+        while restante > 0:
+            parte = min(restante, MAX_SENHAS_POR_MENSAGEM)
+            canal.write(json.dumps({**dados, "quantidade": parte}).encode("utf-8") + b"\n")
+            canal.flush()
+            linha = canal.readline()
+            if not linha:
+                raise ConnectionError("O serviço aquecido encerrou a conexão.")
+            resposta = json.loads(linha)
+            if "erro" in resposta:
+                raise ValueError(resposta["erro"])
+            for resultado in resposta["resultados"]:
+                yield tuple(resultado)
+            restante -= parte
+
+def criar_servico(caminho: str):
+    import socketserver
+    import threading
+
+    from gerador_senha import CacheLRU, carregar_zxcvbn, compilar_configuracao
+    from servidor import ErroPedido, interpretar_pedido
+
+    #carrega os dicionarios do zxcvbn uma vez; e isso que as chamadas do CLI deixam de pagar
+    carregar_zxcvbn()
+    #cada gerador tem o seu lock: o lock do cache so protege a busca e a insercao, e clientes com
+    #configuracoes diferentes geram em paralelo
+    geradores = CacheLRU()
+    lock = threading.Lock()
+
+    def _compilar(config, politica):
+        return compilar_configuracao(config, politica), threading.Lock()
+
+    class TratadorPedidos(socketserver.StreamRequestHandler):
+        def handle(self):
+            for linha in self.rfile:
+                try:
+                    config, politica, quantidade = interpretar_pedido(linha, permitir_arquivos=True)
+                    with lock:
+                        gerador, lock_gerador = geradores.obter((config.chave(), politica.chave()),
+                                                                lambda: _compilar(config, politica))
+                    with lock_gerador:
+                        resultados = [tuple(gerador.gerar_resultado()) for _ in range(quantidade)]
+                    resposta = {"resultados": resultados}
+                except (ErroPedido, ValueError) as e:
+                    resposta = {"erro": str(e)}
+                self.wfile.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    #so substitui um socket antigo; qualquer outro arquivo no caminho e um erro, nao algo a apagar
+    try:
+        if not stat.S_ISSOCK(os.lstat(caminho).st_mode):
+            raise ValueError(f"{caminho} existe e não é um socket.")
+        os.unlink(caminho)
+    except FileNotFoundError:
+        pass
+    #o socket ja nasce com permissao 0600: um chmod depois do bind deixaria uma janela aberta a outros usuarios
+    umask = os.umask(0o177)
+    try:
+        servico = socketserver.ThreadingUnixStreamServer(caminho, TratadorPedidos)
+    finally:
+        os.umask(umask)
+    servico.daemon_threads = True
+    return servico
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço aquecido do Gerador de Senhas (socket Unix local)")
+    parser.add_argument("--socket", type=str, help="Caminho do socket (padrão: pasta de cache do usuário)")
+    args = parser.parse_args()
+
+    caminho = args.socket or caminho_socket_padrao()
+    servico = criar_servico(caminho)
+    print(f"Serviço aquecido ouvindo em {caminho}", flush=True)
+    try:
+        servico.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servico.server_close()
+        os.unlink(caminho)
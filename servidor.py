@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from gerador_senha import CacheLRU, ConfiguracaoSenha, PoliticaForca, compilar_configuracao, MAX_TENTATIVAS_PADRAO
+
+JANELA_AGRUPAMENTO_PADRAO = 0.002
+MAX_SENHAS_POR_LOTE = 1024
+MAX_SENHAS_POR_PEDIDO = 1000
+MAX_TENTATIVAS_POR_PEDIDO = 100
+MAX_COMPRIMENTO = 1024
+TAMANHO_MAXIMO_CORPO = 64 * 1024
+
+#geradores compilados no processo executor, reaproveitados entre lotes da mesma configuracao.
+#a compilacao tambem e a validacao final do pedido: um ValueError daqui vira uma resposta 400
+_geradores_compilados = CacheLRU()
+
+def _gerar_lote(config: ConfiguracaoSenha, politica: PoliticaForca, quantidade: int) -> list[str]:
+    gerador = _geradores_compilados.obter((config.chave(), politica.chave()),
+                                          lambda: compilar_configuracao(config, politica))
+    return [gerador.gerar() for _ in range(quantidade)]
+
+class AgrupadorPedidos:
+    #junta pedidos simultaneos com a mesma configuracao em uma unica chamada de geracao.
+    #o primeiro pedido de uma configuracao abre uma janela curta; o que chegar nela entra no mesmo lote
+    def __init__(self, executor: Executor, janela: float = JANELA_AGRUPAMENTO_PADRAO,
+                 max_por_lote: int = MAX_SENHAS_POR_LOTE):
+        self.executor = executor
+        self.janela = janela
+        self.max_por_lote = max_por_lote
+        self._pendentes: dict[tuple, list] = {}
+        self.pedidos = 0
+        self.lotes = 0
+
+    async def gerar(self, config: ConfiguracaoSenha, politica: PoliticaForca, quantidade: int) -> list[str]:
+        loop = asyncio.get_running_loop()
+        futuro = loop.create_future()
+        chave = (config.chave(), politica.chave())
+        self.pedidos += 1
+
+        grupo = self._pendentes.get(chave)
+        if grupo is None:
+            grupo = self._pendentes[chave] = []
+            loop.call_later(self.janela, self._despachar, chave, config, politica)
+        grupo.append((futuro, quantidade))
+        return await futuro
+
+    def _despachar(self, chave, config: ConfiguracaoSenha, politica: PoliticaForca) -> None:
+        grupo = self._pendentes.pop(chave, [])
+        lote, total = [], 0
+        for futuro, quantidade in grupo:
+            if lote and total + quantidade > self.max_por_lote:
+                self._executar(config, politica, lote, total)
+                lote, total = [], 0
+            lote.append((futuro, quantidade))
+            total += quantidade
+        if lote:
+            self._executar(config, politica, lote, total)
+
+    def _executar(self, config, politica, lote, total) -> None:
+        self.lotes += 1
+        loop = asyncio.get_running_loop()
+        tarefa = loop.run_in_executor(self.executor, _gerar_lote, config, politica, total)
+        tarefa.add_done_callback(lambda t: self._distribuir(t, lote))
+
+    @staticmethod
+    def _distribuir(tarefa, lote) -> None:
+        erro = tarefa.exception()
+        senhas = None if erro else tarefa.result()
+        inicio = 0
+        for futuro, quantidade in lote:
+            #um pedido cancelado (cliente desconectou) ja esta concluido; sua fatia e descartada
+            if not futuro.done():
+                if erro:
+                    futuro.set_exception(erro)
+                else:
+                    futuro.set_result(senhas[inicio:inicio + quantidade])
+            inicio += quantidade
+
+class ErroPedido(Exception):
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+def interpretar_pedido(corpo: bytes, permitir_arquivos: bool = False) -> tuple[ConfiguracaoSenha, PoliticaForca, int]:
+    #o corpo tem os mesmos campos de ConfiguracaoSenha, mais "quantidade", "politica", "score_minimo", "avaliador",
+    #"prazo_ms" e "max_tentativas" opcionais. quantidade, comprimento e max_tentativas sao limitados, para que um pedido
+    #nao prenda o servidor.
+    #lista_palavras e um caminho no servidor: clientes remotos nao podem escolher arquivos para serem lidos.
+    #so valida os campos; compilar (e validar a combinacao deles) fica para o executor, fora do event loop
+    try:
+        dados = json.loads(corpo)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        raise ErroPedido(400, "Corpo do pedido não é um JSON válido.")
+    if not isinstance(dados, dict):
+        raise ErroPedido(400, "O corpo do pedido deve ser um objeto JSON.")
+    if not permitir_arquivos and dados.get("lista_palavras") is not None:
+        raise ErroPedido(400, "O campo lista_palavras não é aceito por este serviço.")
+
+    quantidade = dados.pop("quantidade", 1)
+    #bool e subclasse de int: true/false do JSON nao sao quantidades
+    if not isinstance(quantidade, int) or isinstance(quantidade, bool) or not 1 <= quantidade <= MAX_SENHAS_POR_PEDIDO:
+        raise ErroPedido(400, f"A quantidade deve ser um inteiro entre 1 e {MAX_SENHAS_POR_PEDIDO}.")
+    comprimento = dados.get("comprimento")
+    if comprimento is not None and (not isinstance(comprimento, int) or isinstance(comprimento, bool) or
+                                    comprimento > MAX_COMPRIMENTO):
+        raise ErroPedido(400, f"O comprimento deve ser um inteiro de até {MAX_COMPRIMENTO}.")
+    max_tentativas = dados.pop("max_tentativas", MAX_TENTATIVAS_PADRAO)
+    if (not isinstance(max_tentativas, int) or isinstance(max_tentativas, bool) or
+            not 1 <= max_tentativas <= MAX_TENTATIVAS_POR_PEDIDO):
+        raise ErroPedido(400, f"O número máximo de tentativas deve ser um inteiro entre 1 e {MAX_TENTATIVAS_POR_PEDIDO}.")
+    try:
+        politica = PoliticaForca(modo=dados.pop("politica", "adaptativa"),
+                                 score_minimo=dados.pop("score_minimo", 3),
+                                 avaliador=dados.pop("avaliador", "zxcvbn"),
+                                 prazo_ms=dados.pop("prazo_ms", None),
+                                 max_tentativas=max_tentativas)
+        config = ConfiguracaoSenha(**dados)
+    except TypeError as e:
+        raise ErroPedido(400, f"Campo de configuração inválido: {e}")
+    except ValueError as e:
+        raise ErroPedido(400, str(e))
+    return config, politica, quantidade
+
+MOTIVOS_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  413: "Payload Too Large", 500: "Internal Server Error"}
+
+class ServidorSenhas:
+    def __init__(self, agrupador: AgrupadorPedidos):
+        self.agrupador = agrupador
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        #HTTP/1.1 minimo com keep-alive: uma conexao pode carregar muitos pedidos
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, caminho, _ = linha.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    await self._responder(escritor, 400, {"erro": "Linha de pedido inválida."}, False)
+                    break
+
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = linha.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+
+                manter = cabecalhos.get("connection", "").lower() != "close"
+                try:
+                    tamanho = int(cabecalhos.get("content-length", "0") or 0)
+                except ValueError:
+                    await self._responder(escritor, 400, {"erro": "Content-Length inválido."}, False)
+                    break
+                if tamanho > TAMANHO_MAXIMO_CORPO:
+                    await self._responder(escritor, 413, {"erro": "Corpo do pedido grande demais."}, False)
+                    break
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+
+                status, resposta = await self._processar(metodo, caminho, corpo)
+                await self._responder(escritor, status, resposta, manter)
+                if not manter:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _processar(self, metodo: str, caminho: str, corpo: bytes) -> tuple[int, dict]:
+        if caminho == "/saude":
+            return 200, {"status": "ok", "pedidos": self.agrupador.pedidos, "lotes": self.agrupador.lotes}
+        if caminho != "/senhas":
+            return 404, {"erro": "Caminho não encontrado."}
+        if metodo != "POST":
+            return 405, {"erro": "Use POST em /senhas."}
+        try:
+            config, politica, quantidade = interpretar_pedido(corpo)
+            senhas = await self.agrupador.gerar(config, politica, quantidade)
+        except ErroPedido as e:
+            return e.status, {"erro": str(e)}
+        except ValueError as e:
+            return 400, {"erro": str(e)}
+        except Exception:
+            #qualquer outra falha do executor ainda recebe uma resposta, em vez de derrubar a conexao
+            return 500, {"erro": "Erro interno ao gerar as senhas."}
+        return 200, {"senhas": senhas}
+
+    @staticmethod
+    async def _responder(escritor: asyncio.StreamWriter, status: int, dados: dict, manter: bool) -> None:
+        corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        cabecalho = (f"HTTP/1.1 {status} {MOTIVOS_STATUS.get(status, '')}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(corpo)}\r\n"
+                     f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n")
+        escritor.write(cabecalho.encode("latin-1") + corpo)
+        await escritor.drain()
+
+async def iniciar_servidor(host: str, porta: int, executor: Executor,
+                           janela: float = JANELA_AGRUPAMENTO_PADRAO) -> asyncio.AbstractServer:
+    servidor = ServidorSenhas(AgrupadorPedidos(executor, janela))
+    return await asyncio.start_server(servidor.atender, host, porta)
+
+async def _executar(args) -> None:
+    if args.workers > 0:
+        executor = ProcessPoolExecutor(max_workers=args.workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=1)
+    with executor:
+        servidor = await iniciar_servidor(args.host, args.porta, executor, args.janela_ms / 1000)
+        print(f"Servidor de senhas em http://{args.host}:{args.porta}/senhas", flush=True)
+        async with servidor:
+            await servidor.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serviço HTTP residente do Gerador de Senhas")
+    parser.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1)")
+    parser.add_argument("--porta", type=int, default=8080, help="Porta de escuta (padrão: 8080)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processos para geração e verificação de força; 0 usa uma thread (padrão: núcleos da CPU)")
+    parser.add_argument("--janela_ms", type=float, default=JANELA_AGRUPAMENTO_PADRAO * 1000,
+                        help="Janela para agrupar pedidos com a mesma configuração, em ms (padrão: 2)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_executar(args))
+    except KeyboardInterrupt:
+        pass
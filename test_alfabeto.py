@@ -0,0 +1,82 @@
+from collections import Counter
+
+import pytest
+
+from alfabeto import TabelaAlfabeto, compilar_alfabeto, separar_grafemas, separar_unidades
+from gerador_senha import ConfiguracaoSenha, PoliticaForca, compilar_configuracao, gerar_senhas, CARACTERES_MINUSCULOS
+from padrao_senha import compilar_padrao
+
+POLEGAR_MORENO = "\U0001F44D\U0001F3FD"
+FAMILIA = "\U0001F468\u200d\U0001F469\u200d\U0001F467"
+BANDEIRA_BR = "\U0001F1E7\U0001F1F7"
+BANDEIRA_PT = "\U0001F1F5\U0001F1F9"
+E_AGUDO_DECOMPOSTO = "e\u0301"
+
+
+def test_normaliza_e_remove_repeticoes_na_ordem():
+    assert compilar_alfabeto("★✪★♛✪") == "★✪♛"
+    assert compilar_alfabeto(E_AGUDO_DECOMPOSTO + "é") == "é"
+    assert compilar_alfabeto("abc", "cba!") == "abc!"
+    assert compilar_alfabeto("") == ""
+
+def test_separar_grafemas():
+    texto = POLEGAR_MORENO + FAMILIA + BANDEIRA_BR + BANDEIRA_PT + "a\u0323\u0301" + "x"
+    assert separar_grafemas(texto) == [POLEGAR_MORENO, FAMILIA, BANDEIRA_BR, BANDEIRA_PT, "a\u0323\u0301", "x"]
+    #sem agrupar, cada code point e uma unidade (apos NFC)
+    assert separar_unidades(POLEGAR_MORENO) == list(POLEGAR_MORENO)
+    assert separar_unidades(E_AGUDO_DECOMPOSTO, True) == ["é"]
+
+def test_tabela_alfabeto():
+    unidades = [POLEGAR_MORENO, "★", FAMILIA, BANDEIRA_BR]
+    tabela = compilar_alfabeto("".join(unidades) + POLEGAR_MORENO, agrupar_grafemas=True)
+    assert isinstance(tabela, TabelaAlfabeto)
+    assert len(tabela) == 4
+    assert list(tabela) == unidades
+    assert tabela[2] == FAMILIA and tabela[-1] == BANDEIRA_BR
+    assert tabela.escolher([3, 0, 0]) == [BANDEIRA_BR, POLEGAR_MORENO, POLEGAR_MORENO]
+    assert str(tabela) == "".join(unidades)
+    with pytest.raises(IndexError):
+        tabela[4]
+    #unidades de um code point continuam em um str
+    assert compilar_alfabeto("★✪", agrupar_grafemas=True) == "★✪"
+
+def test_repeticoes_nao_enviesam_o_sorteio():
+    config = ConfiguracaoSenha(comprimento=1, incluir_simbolos=True, simbolos_personalizados="aaab")
+    contagens = Counter(gerar_senhas(config, 4000, PoliticaForca(modo="nenhuma")))
+    assert set(contagens) == {"a", "b"}
+    assert abs(contagens["a"] - 2000) < 200
+
+def test_simbolos_que_repetem_outras_classes():
+    config = ConfiguracaoSenha(comprimento=12, incluir_minusculas=True, incluir_simbolos=True, simbolos_personalizados="ab!a")
+    gerador = compilar_configuracao(config, PoliticaForca(modo="nenhuma"))
+    assert gerador.alfabeto == CARACTERES_MINUSCULOS + "!"
+    assert gerador.conjuntos_garantidos == (CARACTERES_MINUSCULOS, "ab!")
+    assert compilar_padrao("!!!!", "ab!a").alfabetos[0] == "ab!"
+
+def test_gerador_com_clusters_de_grafemas():
+    simbolos = POLEGAR_MORENO + FAMILIA + BANDEIRA_BR
+    config = ConfiguracaoSenha(comprimento=8, incluir_simbolos=True, incluir_numeros=True, simbolos_personalizados=simbolos,
+                               texto_necessario=E_AGUDO_DECOMPOSTO + POLEGAR_MORENO, agrupar_grafemas=True)
+    gerador = compilar_configuracao(config, PoliticaForca(modo="nenhuma"))
+    assert len(gerador.alfabeto) == 13
+    for senha in gerar_senhas(config, 50, PoliticaForca(modo="nenhuma")):
+        grafemas = separar_grafemas(senha)
+        assert len(grafemas) == 8
+        assert E_AGUDO_DECOMPOSTO + POLEGAR_MORENO in senha
+        assert any(grafema in (POLEGAR_MORENO, FAMILIA, BANDEIRA_BR) for grafema in grafemas)
+
+def test_texto_necessario_inserido_literalmente():
+    texto = "caf" + E_AGUDO_DECOMPOSTO
+    config = ConfiguracaoSenha(comprimento=8, incluir_numeros=True, texto_necessario=texto)
+    for senha in gerar_senhas(config, 20, PoliticaForca(modo="nenhuma")):
+        assert texto in senha and "café" not in senha
+        assert len(senha) == 8
+    #agrupando grafemas o "é" decomposto conta como uma unidade, mas continua decomposto na senha
+    agrupada = ConfiguracaoSenha(comprimento=8, incluir_numeros=True, texto_necessario=texto, agrupar_grafemas=True)
+    assert all(texto in senha and len(senha) == 9 for senha in gerar_senhas(agrupada, 20, PoliticaForca(modo="nenhuma")))
+
+def test_texto_necessario_conta_grafemas_so_quando_agrupados():
+    config = dict(comprimento=3, incluir_numeros=True, texto_necessario=FAMILIA)
+    with pytest.raises(ValueError, match="pelo menos 6 caracteres"):
+        compilar_configuracao(ConfiguracaoSenha(**config))
+    assert compilar_configuracao(ConfiguracaoSenha(**config, agrupar_grafemas=True)).comprimento_restante == 1
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from arquivo_senhas import ArquivoSenhas, escrever_arquivo_senhas, largura_registro
+from gerador_senha import ConfiguracaoSenha, PoliticaForca, ResultadoGeracao, compilar_configuracao, gerar_resultados
+from padrao_senha import compilar_padrao
+
+
+def _resultados(senhas):
+    return (ResultadoGeracao(senha, None, 1) for senha in senhas)
+
+def test_largura_fixa_acesso_direto(tmp_path):
+    config = ConfiguracaoSenha(comprimento=12, incluir_minusculas=True, incluir_numeros=True)
+    senhas = [r.senha for r in gerar_resultados(config, 500, PoliticaForca(modo="nenhuma"))]
+    caminho = str(tmp_path / "senhas.bin")
+    assert escrever_arquivo_senhas(_resultados(senhas), caminho, 500, largura=12) == 500
+
+    with ArquivoSenhas(caminho) as arquivo:
+        assert (len(arquivo), arquivo.largura) == (500, 12)
+        assert arquivo[0] == senhas[0] and arquivo[499] == senhas[499] and arquivo[250] == senhas[250]
+        assert list(arquivo.faixa(100, 110)) == senhas[100:110]
+        assert list(arquivo) == senhas
+        with pytest.raises(IndexError):
+            arquivo[500]
+    #so o cabecalho alem dos registros
+    assert os.path.getsize(caminho) == 32 + 500 * 12
+
+def test_largura_variavel_cresce_alem_da_estimativa(tmp_path):
+    senhas = ["a", "", "çãé", "文字" * 100, "x" * 1000, "ok"]
+    caminho = str(tmp_path / "senhas.bin")
+    assert escrever_arquivo_senhas(_resultados(senhas), caminho, len(senhas), bytes_por_senha=1) == len(senhas)
+    with ArquivoSenhas(caminho) as arquivo:
+        assert arquivo.largura == 0
+        assert [arquivo[i] for i in reversed(range(len(senhas)))] == senhas[::-1]
+        visao = arquivo.bytes_senha(2)
+        assert bytes(visao) == "çãé".encode("utf-8")
+        visao.release()
+
+def test_menos_senhas_que_o_previsto_e_limite(tmp_path):
+    caminho = str(tmp_path / "senhas.bin")
+    assert escrever_arquivo_senhas(_resultados(["um", "dois"]), caminho, 10) == 2
+    with ArquivoSenhas(caminho) as arquivo:
+        assert list(arquivo) == ["um", "dois"]
+    assert escrever_arquivo_senhas(_resultados(["ab", "cd", "ef"]), caminho, 2, largura=2) == 2
+    with ArquivoSenhas(caminho) as arquivo:
+        assert list(arquivo) == ["ab", "cd"]
+    assert os.path.getsize(caminho) == 32 + 4
+
+def test_largura_errada_nao_deixa_arquivo(tmp_path):
+    caminho = str(tmp_path / "senhas.bin")
+    with pytest.raises(ValueError, match="tem 3 bytes, mas os registros têm 2"):
+        escrever_arquivo_senhas(_resultados(["ab", "abc"]), caminho, 2, largura=2)
+    assert os.listdir(tmp_path) == []
+
+def test_arquivo_invalido(tmp_path):
+    caminho = tmp_path / "texto.bin"
+    caminho.write_bytes(b"isto nao e um arquivo de senhas")
+    with pytest.raises(ValueError, match="Arquivo de senhas inválido"):
+        ArquivoSenhas(str(caminho))
+
+def test_largura_registro():
+    ascii_ = ConfiguracaoSenha(comprimento=10, incluir_minusculas=True, incluir_simbolos=True, texto_necessario="ok")
+    unicode_ = ConfiguracaoSenha(comprimento=10, incluir_simbolos=True, simbolos_personalizados="★✪")
+    assert largura_registro(compilar_configuracao(ascii_)) == 10
+    assert largura_registro(compilar_configuracao(unicode_)) is None
+    assert largura_registro(compilar_padrao("Aaa-99")) == 6
+    assert largura_registro(compilar_padrao("Aaa-99-!", "★")) is None
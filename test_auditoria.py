@@ -0,0 +1,110 @@
+import pytest
+
+from auditoria import RegrasAuditoria, ResumoAuditoria, auditar_arquivo, ler_linhas
+from gerador_senha import ConfiguracaoSenha, PoliticaForca, gerar_senhas
+
+CONFIG = ConfiguracaoSenha(comprimento=8, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True)
+SEM_SCORE = PoliticaForca(modo="nenhuma")
+
+
+def _arquivo(tmp_path, conteudo: bytes):
+    caminho = tmp_path / "senhas.txt"
+    caminho.write_bytes(conteudo)
+    return str(caminho)
+
+@pytest.mark.parametrize("senha, motivos", [
+    ("Abcdefg1", []),
+    ("Abcdef1", ["comprimento"]),
+    ("abcdefg1", ["sem_maiusculas"]),
+    ("ABCDEFGH", ["sem_minusculas", "sem_numeros"]),
+    ("Abcdefg1!", ["caractere_nao_permitido"]),
+    ("Abcdéfg1", ["caractere_nao_permitido"]),
+])
+def test_regras_estruturais(senha, motivos):
+    assert RegrasAuditoria(CONFIG, SEM_SCORE).verificar(senha.encode("utf-8"))[0] == motivos
+
+def test_regras_com_simbolos_unicode_e_texto_necessario():
+    config = ConfiguracaoSenha(comprimento=4, incluir_minusculas=True, incluir_simbolos=True,
+                               simbolos_personalizados="★✪", texto_necessario="_ok")
+    regras = RegrasAuditoria(config, SEM_SCORE)
+    assert regras.verificar("ab★_ok".encode("utf-8"))[0] == []
+    assert regras.verificar("ab!_ok".encode("utf-8"))[0] == ["sem_simbolos", "caractere_nao_permitido"]
+    assert regras.verificar("ab★cd".encode("utf-8"))[0] == ["sem_texto_necessario"]
+    assert regras.verificar(b"ab\xff_ok")[0] == ["utf8_invalido"]
+
+def test_regras_aceitam_texto_necessario_decomposto_gerado():
+    config = ConfiguracaoSenha(comprimento=8, incluir_numeros=True, texto_necessario="cafe\u0301")
+    regras = RegrasAuditoria(config, SEM_SCORE)
+    assert all(regras.verificar(senha.encode("utf-8"))[0] == [] for senha in gerar_senhas(config, 10, SEM_SCORE))
+
+@pytest.mark.parametrize("simbolos, sem_simbolos", [("xyz#", "abcde1"), ("a1★", "bcde23")])
+def test_regras_aceitam_a_saida_do_gerador_com_simbolos_sobrepostos(simbolos, sem_simbolos):
+    #um simbolo personalizado que tambem e minuscula ou digito conta nas duas classes, como no gerador
+    config = ConfiguracaoSenha(comprimento=6, incluir_minusculas=True, incluir_numeros=True, incluir_simbolos=True,
+                               simbolos_personalizados=simbolos)
+    regras = RegrasAuditoria(config, SEM_SCORE)
+    assert all(regras.verificar(senha.encode("utf-8"))[0] == [] for senha in gerar_senhas(config, 2000, SEM_SCORE))
+    assert regras.verificar(sem_simbolos.encode())[0] == ["sem_simbolos"]
+    assert regras.verificar(b"xyzxy1")[0] == []
+
+def test_regras_rejeitam_modo_frase():
+    with pytest.raises(ValueError, match="só suporta o modo caracteres"):
+        RegrasAuditoria(ConfiguracaoSenha(comprimento=4, modo="frase"))
+
+def test_ler_linhas_mapeado(tmp_path):
+    assert list(ler_linhas(_arquivo(tmp_path, b"um\r\ndois\n\ntres"))) == [b"um", b"dois", b"", b"tres"]
+    assert list(ler_linhas(_arquivo(tmp_path, b""))) == []
+
+def test_auditar_arquivo_ordem_e_resumo(tmp_path):
+    caminho = _arquivo(tmp_path, b"Abcdefg1\nabc\nAbcdefg1\nABCDEFG1\n")
+    resumo = ResumoAuditoria()
+    violacoes = list(auditar_arquivo(caminho, CONFIG, SEM_SCORE, linhas_por_tarefa=2, resumo=resumo))
+    assert violacoes == [
+        {"linha": 2, "motivos": "comprimento,sem_maiusculas,sem_numeros", "score": None},
+        {"linha": 4, "motivos": "sem_minusculas", "score": None},
+    ]
+    assert (resumo.linhas, resumo.aprovadas, resumo.reprovadas, resumo.avaliadas_zxcvbn) == (4, 2, 2, 0)
+    assert resumo.como_dict()["motivos"]["comprimento"] == 1
+
+def test_auditar_arquivo_zxcvbn_so_nas_sobreviventes(tmp_path):
+    fortes = list(gerar_senhas(ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True,
+                                                 incluir_numeros=True), 5))
+    linhas = ["Password1", "abc", *fortes, "Qwerty123"]
+    caminho = _arquivo(tmp_path, "\n".join(linhas).encode())
+    politica = PoliticaForca(modo="zxcvbn", score_minimo=3)
+    resumo = ResumoAuditoria()
+    violacoes = list(auditar_arquivo(caminho, CONFIG, politica, resumo=resumo))
+    assert [(v["linha"], v["motivos"]) for v in violacoes] == [(1, "score"), (2, "comprimento,sem_maiusculas,sem_numeros"),
+                                                               (8, "score")]
+    assert violacoes[0]["score"] < 3
+    #a linha 2 nao passa pelo zxcvbn
+    assert resumo.avaliadas_zxcvbn == 7
+
+def test_auditar_arquivo_senha_acima_do_limite_do_avaliador(tmp_path):
+    longa = "Ab1" * 40
+    caminho = _arquivo(tmp_path, f"Password1\n{longa}\n{longa[:72]}\n".encode())
+    resumo = ResumoAuditoria()
+    violacoes = list(auditar_arquivo(caminho, CONFIG, PoliticaForca(modo="zxcvbn"), resumo=resumo))
+    assert [(v["linha"], v["motivos"], v["score"]) for v in violacoes][1] == (2, "acima_do_limite_do_avaliador", None)
+    #72 caracteres ainda passam pelo avaliador
+    assert [v["motivos"] for v in violacoes if v["linha"] == 3] == ["score"]
+    assert resumo.linhas == 3 and resumo.avaliadas_zxcvbn == 2
+    #sem verificacao de score o comprimento nao importa
+    assert list(auditar_arquivo(caminho, CONFIG, SEM_SCORE)) == []
+
+def test_auditar_arquivo_em_paralelo_igual_sequencial(tmp_path):
+    linhas = [s.encode() for s in gerar_senhas(ConfiguracaoSenha(comprimento=10, incluir_minusculas=True), 60)]
+    linhas[::7] = [b"Password1"] * len(linhas[::7])
+    caminho = _arquivo(tmp_path, b"\n".join(linhas))
+    politica = PoliticaForca(modo="zxcvbn", score_minimo=4)
+    config = ConfiguracaoSenha(comprimento=8, incluir_minusculas=True)
+    sequencial = list(auditar_arquivo(caminho, config, politica))
+    paralelo = list(auditar_arquivo(caminho, config, politica, workers=2, linhas_por_tarefa=8))
+    assert paralelo == sequencial
+    assert {v["linha"] for v in sequencial} >= set(range(1, 61, 7))
+
+def test_auditar_arquivo_parametros_invalidos(tmp_path):
+    with pytest.raises(ValueError, match="não encontrado"):
+        auditar_arquivo(str(tmp_path / "nada.txt"), CONFIG)
+    with pytest.raises(ValueError, match="workers"):
+        auditar_arquivo(_arquivo(tmp_path, b"x"), CONFIG, workers=0)
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from zxcvbn import matching, zxcvbn
+
+from avaliador_automato import AutomatoDicionarios, carregar_automato, corpus_validacao, validar
+from gerador_senha import ConfiguracaoSenha, PoliticaForca, carregar_avaliador, compilar_configuracao, gerar_resultados
+
+
+@pytest.fixture(scope="module", autouse=True)
+def cache_automato(tmp_path_factory):
+    #o automato e compilado uma vez para todo o modulo (alguns segundos)
+    anterior = os.environ.get("GERADOR_SENHA_CACHE")
+    os.environ["GERADOR_SENHA_CACHE"] = str(tmp_path_factory.mktemp("cache"))
+    yield
+    if anterior is None:
+        del os.environ["GERADOR_SENHA_CACHE"]
+    else:
+        os.environ["GERADOR_SENHA_CACHE"] = anterior
+
+def _chave(casamento: dict) -> tuple:
+    campos = ("i", "j", "pattern", "token", "matched_word", "rank", "dictionary_name", "reversed", "l33t",
+              "sub_display", "graph", "turns", "shifted_count")
+    return tuple(str(casamento.get(campo)) for campo in campos)
+
+def test_score_concorda_com_zxcvbn_no_corpus():
+    resultado = validar()
+    assert resultado["senhas"] > 600
+    assert resultado["divergentes"] == []
+    assert resultado["concordancia"] == 1.0
+
+@pytest.mark.parametrize("senha", ["P@ssw0rd", "drowssap", "qwertyuiop", "!QAZ@WSX", "Tr0ub4dor&3", "|ov3|y", "ação123",
+                                   "01/01/1990", "abcabcabc", "aaaaaaa", "İstanbul1", "x", ""])
+def test_casamentos_iguais_ao_omnimatch(senha):
+    automato = carregar_automato()
+    assert sorted(map(_chave, automato.casamentos(senha))) == sorted(map(_chave, matching.omnimatch(senha)))
+
+def test_automato_compilado_uma_vez_e_mapeado():
+    automato = carregar_automato()
+    assert carregar_automato() is automato
+    assert os.path.dirname(automato.caminho) == os.environ["GERADOR_SENHA_CACHE"]
+    assert automato.dicionarios == [nome for nome in matching.RANKED_DICTIONARIES if nome != "user_inputs"]
+    #um segundo mapeamento do mesmo arquivo da os mesmos resultados, sem recompilar
+    modificado = os.path.getmtime(automato.caminho)
+    outro = AutomatoDicionarios(automato.caminho)
+    assert outro.score("correcthorse") == automato.score("correcthorse")
+    outro.fechar()
+    assert os.path.getmtime(automato.caminho) == modificado
+
+def test_carregar_e_pontuar_sem_importar_zxcvbn():
+    #com o arquivo ja compilado, abrir o automato e pontuar nao importa o zxcvbn (nem zxcvbn.matching,
+    #que monta todos os dicionarios ranqueados)
+    carregar_automato()
+    senhas = ["Tr0ub4dor&3", "qwertyuiop", "01/01/1990aaa"]
+    codigo = ("import sys, avaliador_automato as a; "
+              f"print([a.score(senha) for senha in {senhas!r}]); "
+              "print(sorted(m for m in sys.modules if m.split('.')[0] == 'zxcvbn'))")
+    resultado = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    scores, modulos = resultado.stdout.splitlines()
+    assert scores == str([zxcvbn(senha)["score"] for senha in senhas])
+    assert modulos == "[]"
+
+def test_arquivo_invalido(tmp_path):
+    caminho = tmp_path / "automato.bin"
+    caminho.write_bytes(b"GSPALAV1" + bytes(32))
+    with pytest.raises(ValueError, match="Automato de dicionários inválido"):
+        AutomatoDicionarios(str(caminho))
+
+def test_corpus_reprodutivel():
+    assert corpus_validacao(10) == corpus_validacao(10)
+    assert corpus_validacao(10, semente=1) != corpus_validacao(10)
+
+def test_gerador_com_avaliador_automato():
+    config = ConfiguracaoSenha(comprimento=10, incluir_minusculas=True, incluir_numeros=True)
+    politica = PoliticaForca(modo="zxcvbn", avaliador="automato")
+    assert compilar_configuracao(config, politica)._avaliar is carregar_avaliador("automato")
+    for resultado in gerar_resultados(config, 30, politica):
+        assert resultado.score == zxcvbn(resultado.senha)["score"]
+
+@pytest.mark.parametrize("avaliador", ["zxcvbn", "automato"])
+def test_limite_de_comprimento_igual_nos_avaliadores(avaliador):
+    avaliar = carregar_avaliador(avaliador)
+    assert avaliar("x" * 72) == zxcvbn("x" * 72)["score"]
+    with pytest.raises(ValueError, match="até 72 caracteres, mas a senha tem 73"):
+        avaliar("x" * 73)
+
+def test_avaliador_invalido():
+    with pytest.raises(ValueError, match="Avaliador de força inválido"):
+        PoliticaForca(avaliador="outro")
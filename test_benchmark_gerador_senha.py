@@ -0,0 +1,60 @@
+from benchmark_gerador_senha import bench_alfabeto, bench_avaliador, bench_calibracao, bench_frase, bench_prazo, casos_suite, comparar_resultados, executar_suite, medir_caso
+from gerador_senha import MAX_TENTATIVAS_PADRAO
+
+
+def test_casos_suite_cobrem_dimensoes_e_ignoram_combinacoes_invalidas():
+    nomes = [nome for nome, _ in casos_suite((1, 16), comprimento_max_zxcvbn=8)]
+    assert "c1-min-sem_texto-sem_score" in nomes
+    assert "c16-unicode-com_texto-sem_score" in nomes
+    #comprimento 1 nao comporta varias classes nem texto necessario junto com uma classe
+    assert not any(n.startswith("c1-alnum") or n.startswith("c1-todos") for n in nomes)
+    #acima do limite do zxcvbn so ha casos sem score
+    assert not any(n.startswith("c16") and n.endswith("com_score") for n in nomes)
+
+def test_medir_caso_reporta_metricas():
+    _, gerador = next(casos_suite((16,), comprimento_max_zxcvbn=0))
+    medicao = medir_caso(gerador, tempo_minimo=0.01, repeticoes=1)
+    assert medicao["ops_s"] > 0
+    assert medicao["us_por_char"] > 0
+    assert medicao["tentativas_media"] == 1.0
+
+def test_executar_suite_gera_baseline_serializavel():
+    resultado = executar_suite(tempo_minimo=0.001, comprimentos=(8,), comprimento_max_zxcvbn=0)
+    assert resultado["casos"]
+    assert all(set(m) == {"ops_s", "us_por_char", "tentativas_media"} for m in resultado["casos"].values())
+
+def test_comparar_detecta_apenas_lentidao_acima_da_tolerancia():
+    base = {"casos": {"a": {"ops_s": 1000.0}, "b": {"ops_s": 1000.0}, "c": {"ops_s": 1000.0}}}
+    atual = {"casos": {"a": {"ops_s": 900.0}, "b": {"ops_s": 500.0}, "novo": {"ops_s": 1.0}}}
+    regressoes = comparar_resultados(base, atual, tolerancia=0.25)
+    assert [r["caso"] for r in regressoes] == ["b"]
+    assert regressoes[0]["lentidao"] == 1.0
+
+def test_bench_frase_mede_lista_padrao_e_sintetica():
+    resultado = bench_frase(10, palavras_sinteticas=100)
+    assert resultado["sintetica"]["palavras"] == 100
+    assert resultado["padrao"]["palavras"] > 50000
+    assert all(r["frase_us"] > 0 and r["abrir_ms"] >= 0 for r in resultado.values())
+
+def test_bench_avaliador_mede_aceleracao_e_concordancia():
+    resultado = bench_avaliador(20)
+    assert resultado["geradas"]["senhas"] == 20
+    assert resultado["corpus"]["concordancia"] == resultado["geradas"]["concordancia"] == 1.0
+    assert resultado["abrir_ms"] < resultado["compilar_ms"]
+
+def test_bench_prazo_limita_tentativas():
+    resultado = bench_prazo(5, prazos=(None, 0.001))
+    assert resultado["sem_prazo"]["tentativas_media"] == 10
+    assert resultado["0.001ms"]["tentativas_media"] == 1
+
+def test_bench_alfabeto_remove_repeticoes():
+    resultado = bench_alfabeto(10)
+    assert resultado["cjk"]["unidades"] == resultado["cjk"]["informados"] // 2 == 0xA000 - 0x4E00
+    assert resultado["emoji"]["unidades"] == resultado["emoji"]["informados"] // 2
+    assert resultado["emoji"]["tabela_kib"] < resultado["emoji"]["tupla_kib"]
+
+def test_bench_calibracao():
+    resultado = bench_calibracao(5, amostras=30)
+    #taxa medida zero nao corta tentativas: a politica fixa e mantida
+    assert resultado["numerica_8"]["taxa"] == 0 and resultado["numerica_8"]["tentativas"] == MAX_TENTATIVAS_PADRAO
+    assert resultado["alnum_16"]["calibrada_meta"] > 0.5
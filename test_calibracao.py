@@ -0,0 +1,93 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import calibracao
+from calibracao import CacheCalibracao, Calibracao, calibrar, chave_calibracao, tentativas_necessarias
+from gerador_senha import MAX_TENTATIVAS_PADRAO, ConfiguracaoSenha, PoliticaForca, compilar_configuracao, gerar_resultados
+
+NUMERICA_CURTA = ConfiguracaoSenha(comprimento=8, incluir_numeros=True)
+FORTE = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CacheCalibracao(str(tmp_path / "calibracao.json"))
+
+def test_tentativas_necessarias():
+    assert tentativas_necessarias(1.0) == 1
+    assert tentativas_necessarias(0.0) is None
+    #1 - 0.5^7 >= 0.99 > 1 - 0.5^6
+    assert tentativas_necessarias(0.5) == 7
+    assert tentativas_necessarias(0.5, confianca=0.9) == 4
+    assert tentativas_necessarias(0.001) == calibracao.TETO_TENTATIVAS
+    with pytest.raises(ValueError, match="confiança"):
+        tentativas_necessarias(0.5, confianca=1)
+
+def test_configuracao_que_nunca_atinge_mantem_as_tentativas(cache):
+    politica, medida = calibrar(NUMERICA_CURTA, PoliticaForca(modo="zxcvbn", max_tentativas=7), cache, amostras=50)
+    assert medida.amostras == 50 and medida.custo_ms > 0
+    assert not medida.atinge(3)
+    #nenhuma aceita em 50 nao prova taxa zero: a politica nao perde tentativas
+    assert politica.max_tentativas == 7 and politica.modo == "zxcvbn"
+    assert all(r.tentativas == 7 and not r.atingiu_meta for r in gerar_resultados(NUMERICA_CURTA, 5, politica))
+    assert tentativas_necessarias(3 / 50) > 7
+
+def test_configuracao_forte_precisa_de_poucas_tentativas(cache):
+    politica, medida = calibrar(FORTE, PoliticaForca(modo="zxcvbn", prazo_ms=50), cache, amostras=50)
+    assert medida.taxa_aceitacao(3) > 0.9
+    assert politica.max_tentativas <= 2 and politica.prazo_ms == 50
+
+def test_calibracao_reaproveitada_do_cache(cache, monkeypatch):
+    calibrar(NUMERICA_CURTA, PoliticaForca(modo="zxcvbn"), cache, amostras=20)
+    def medir(*args):
+        raise AssertionError("a calibracao deveria vir do cache")
+    monkeypatch.setattr(calibracao, "medir_calibracao", medir)
+    #outra instancia le o arquivo gravado; score_minimo diferente usa a mesma medicao
+    relido = CacheCalibracao(cache.caminho)
+    politica, medida = calibrar(NUMERICA_CURTA, PoliticaForca(modo="zxcvbn", score_minimo=1), relido)
+    assert medida.amostras == 20 and medida.atinge(1)
+
+def test_chave_canonica():
+    def chave(simbolos, **extras):
+        config = ConfiguracaoSenha(comprimento=12, incluir_simbolos=True, simbolos_personalizados=simbolos, **extras)
+        return chave_calibracao(compilar_configuracao(config, PoliticaForca(modo="zxcvbn")))
+    assert chave("ab!b") == chave("!ba") != chave("ab!c")
+    assert chave("ab!", incluir_numeros=True) != chave("ab!")
+
+def test_cache_remove_as_menos_usadas(tmp_path, monkeypatch):
+    caminho = str(tmp_path / "calibracao.json")
+    cache = CacheCalibracao(caminho, max_entradas=2)
+    relogio = iter(range(100))
+    monkeypatch.setattr(calibracao.time, "time", lambda: next(relogio))
+    for chave in ("a", "b", "c"):
+        cache.guardar(chave, Calibracao((1, 0, 0, 0, 1), 1.0))
+    cache.obter("a")
+    cache.salvar()
+    assert set(CacheCalibracao(caminho).entradas) == {"a", "c"}
+
+def test_cache_invalido_ou_de_outra_versao(tmp_path):
+    caminho = tmp_path / "calibracao.json"
+    caminho.write_text("{nao e json")
+    assert CacheCalibracao(str(caminho)).entradas == {}
+    entrada = {"scores": [1, 0, 0, 0, 0], "custo_ms": 1.0, "usada_em": 0}
+    caminho.write_text(json.dumps({"versao": calibracao.VERSAO_CALIBRACAO, "zxcvbn": "0.0", "entradas": {"x": entrada}}))
+    assert CacheCalibracao(str(caminho)).entradas == {}
+
+def test_sem_zxcvbn_nao_calibra(cache):
+    politica = PoliticaForca(modo="entropia")
+    assert calibrar(FORTE, politica, cache) == (politica, None)
+    assert not os.path.exists(cache.caminho)
+
+def test_cli_calibrar_avisa_antes_de_gerar(tmp_path):
+    ambiente = {**os.environ, "GERADOR_SENHA_CACHE": str(tmp_path)}
+    comando = [sys.executable, "main.py", "-c", "8", "--numeros", "--politica", "zxcvbn", "--calibrar", "-n", "3"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore', env=ambiente)
+    assert resultado.returncode == 0
+    assert len(resultado.stdout.split()) == 3
+    assert f"até {MAX_TENTATIVAS_PADRAO} tentativas por senha" in resultado.stderr
+    assert resultado.stderr.index("Aviso: nenhuma de 200 candidatas") < resultado.stderr.index("senhas geradas")
+    assert os.path.exists(tmp_path / calibracao.NOME_ARQUIVO_CALIBRACAO)
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import tracemalloc
+
+import pytest
+
+from gerador_senha import ConfiguracaoSenha, PoliticaForca, ResultadoGeracao, gerar_resultados
+from exportacao import abrir_saida, escrever_resultados
+
+
+class DestinoContador(io.TextIOBase):
+    #destino que so conta bytes e escritas, para medir o pipeline sem guardar a saida
+    def __init__(self):
+        self.escritas = 0
+        self.caracteres = 0
+
+    def write(self, texto):
+        self.escritas += 1
+        self.caracteres += len(texto)
+        return len(texto)
+
+
+def test_escrever_ndjson():
+    resultados = [ResultadoGeracao("abc★", 3, 2), ResultadoGeracao("xyz", None, 1)]
+    destino = io.StringIO()
+    total = escrever_resultados(resultados, destino, "ndjson")
+    linhas = [json.loads(linha) for linha in destino.getvalue().splitlines()]
+    assert total == 2
+    assert linhas[0] == {"senha": "abc★", "comprimento": 4, "score": 3, "tentativas": 2}
+    assert linhas[1]["score"] is None
+
+def test_escrever_csv_com_cabecalho_e_escape():
+    resultados = [ResultadoGeracao('a,b"c', 4, 1)]
+    destino = io.StringIO()
+    escrever_resultados(resultados, destino, "csv")
+    linhas = list(csv.reader(io.StringIO(destino.getvalue())))
+    assert linhas[0] == ["senha", "comprimento", "score", "tentativas"]
+    assert linhas[1] == ['a,b"c', "5", "4", "1"]
+
+def test_escrever_texto_uma_senha_por_linha():
+    destino = io.StringIO()
+    escrever_resultados([ResultadoGeracao("um", 1, 1), ResultadoGeracao("dois", 1, 1)], destino, "texto")
+    assert destino.getvalue() == "um\ndois\n"
+
+def test_escrever_agrupa_em_blocos():
+    destino = DestinoContador()
+    resultados = (ResultadoGeracao("senha", 4, 1) for _ in range(1000))
+    escrever_resultados(resultados, destino, "texto", linhas_por_escrita=100)
+    assert destino.escritas == 11
+    assert destino.caracteres == 6000
+
+def test_pipeline_memoria_constante():
+    config = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_numeros=True)
+    politica = PoliticaForca(modo="nenhuma")
+
+    def pico_memoria(quantidade):
+        tracemalloc.start()
+        escrever_resultados(gerar_resultados(config, quantidade, politica), DestinoContador(), "ndjson", linhas_por_escrita=256)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return pico
+
+    pico_pequeno = pico_memoria(2000)
+    pico_grande = pico_memoria(20000)
+    assert pico_grande < pico_pequeno * 1.5
+
+def test_formato_invalido():
+    with pytest.raises(ValueError, match="Formato de saída inválido"):
+        escrever_resultados([], io.StringIO(), "xml")
+
+def test_abrir_saida_arquivo(tmp_path):
+    caminho = tmp_path / "senhas.ndjson"
+    with abrir_saida(str(caminho)) as destino:
+        escrever_resultados([ResultadoGeracao("abc", 1, 1)], destino, "ndjson")
+    assert json.loads(caminho.read_text(encoding="utf-8"))["senha"] == "abc"
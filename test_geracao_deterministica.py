@@ -0,0 +1,84 @@
+import pytest
+
+from gerador_senha import AmostradorSeguro, ConfiguracaoSenha, PoliticaForca, compilar_configuracao
+from geracao_deterministica import (
+    AmostradorDeterministico,
+    GeradorDeterministico,
+    faixa_fragmento,
+    gerar_resultados_deterministicos,
+    ler_segredo
+)
+
+SEGREDO = b"segredo-de-teste-com-32-bytes!!!"
+CONFIG = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True,
+                           incluir_simbolos=True, texto_necessario="ok")
+
+
+def test_mesmo_segredo_fluxo_e_indice_geram_a_mesma_senha():
+    a = GeradorDeterministico(CONFIG, SEGREDO, "carga")
+    b = GeradorDeterministico(CONFIG, SEGREDO, "carga")
+    assert [a.gerar_resultado(i) for i in range(20)] == [b.gerar_resultado(i) for i in reversed(range(20))][::-1]
+    assert a.gerar_resultado(7) == a.gerar_resultado(7)
+
+def test_indices_lidos_em_little_endian():
+    #os valores nao dependem da ordem de bytes da maquina: fixtures geradas em qualquer uma coincidem
+    amostrador = AmostradorDeterministico(SEGREDO, "carga")
+    bloco = amostrador._ler_bytes(8)
+    amostrador.reposicionar(0)
+    assert amostrador.indices(1 << 16, 2) == [int.from_bytes(bloco[i:i + 2], "little") for i in (0, 2)]
+    amostrador.reposicionar(0)
+    assert amostrador.indices_mistos([1 << 31]) == [int.from_bytes(bloco[:4], "little") % (1 << 31)]
+
+def test_fluxos_e_segredos_diferentes_sao_independentes():
+    base = GeradorDeterministico(CONFIG, SEGREDO, "carga").gerar_faixa(0, 50)
+    outro_fluxo = GeradorDeterministico(CONFIG, SEGREDO, "carga-2").gerar_faixa(0, 50)
+    outro_segredo = GeradorDeterministico(CONFIG, SEGREDO[::-1], "carga").gerar_faixa(0, 50)
+    assert not {r.senha for r in base} & {r.senha for r in outro_fluxo}
+    assert not {r.senha for r in base} & {r.senha for r in outro_segredo}
+    assert len({r.senha for r in base}) == 50
+
+def test_senhas_deterministicas_respeitam_a_configuracao():
+    for resultado in GeradorDeterministico(CONFIG, SEGREDO, "carga").gerar_faixa(0, 50):
+        assert len(resultado.senha) == 16
+        assert "ok" in resultado.senha
+
+def test_frase_deterministica():
+    config = ConfiguracaoSenha(comprimento=5, modo="frase")
+    a = GeradorDeterministico(config, SEGREDO, "frases").gerar_faixa(0, 10)
+    b = GeradorDeterministico(config, SEGREDO, "frases").gerar_faixa(0, 10)
+    assert a == b
+
+def test_fragmentos_cobrem_a_quantidade_sem_sobreposicao():
+    faixas = [faixa_fragmento(103, 4, k) for k in range(4)]
+    assert [i for faixa in faixas for i in faixa] == list(range(103))
+    with pytest.raises(ValueError, match="fragmento deve estar entre 0 e 3"):
+        faixa_fragmento(10, 4, 4)
+    with pytest.raises(ValueError, match="fragmentos deve ser positivo"):
+        faixa_fragmento(10, 0, 0)
+
+def test_fragmentos_em_paralelo_igualam_execucao_unica():
+    politica = PoliticaForca(modo="zxcvbn")
+    unica = list(gerar_resultados_deterministicos(CONFIG, SEGREDO, "carga", range(60), politica))
+    fragmentos = []
+    for k in range(3):
+        fragmentos += gerar_resultados_deterministicos(CONFIG, SEGREDO, "carga", faixa_fragmento(60, 3, k), politica,
+                                                       workers=2, tamanho_lote=7)
+    assert fragmentos == unica
+
+def test_segredo_curto_e_parametros_invalidos(tmp_path):
+    with pytest.raises(ValueError, match="pelo menos 16 bytes"):
+        AmostradorDeterministico(b"curto", "fluxo")
+    with pytest.raises(ValueError, match="workers"):
+        gerar_resultados_deterministicos(CONFIG, SEGREDO, "x", range(3), workers=0)
+    with pytest.raises(ValueError, match="índice"):
+        GeradorDeterministico(CONFIG, SEGREDO, "x").gerar_resultado(-1)
+    with pytest.raises(ValueError, match="não aceita prazo"):
+        GeradorDeterministico(CONFIG, SEGREDO, "x", PoliticaForca(prazo_ms=50))
+    with pytest.raises(ValueError, match="Não foi possível ler o segredo"):
+        ler_segredo(str(tmp_path / "inexistente"))
+
+def test_caminho_padrao_continua_aleatorio():
+    #o modo deterministico nao altera o amostrador do caminho padrao
+    gerador = compilar_configuracao(CONFIG)
+    assert type(gerador.amostrador) is AmostradorSeguro
+    assert gerador.gerar() != gerador.gerar()
@@ -0,0 +1,52 @@
+import pytest
+
+from gerador_senha import (
+    ConfiguracaoSenha,
+    EstatisticasGeracao,
+    PoliticaForca,
+    CARACTERES_MINUSCULOS,
+    CARACTERES_NUMERICOS
+)
+from geracao_paralela import gerar_senhas_paralelo, _tamanhos_lotes
+
+
+def test_tamanhos_lotes_cobrem_quantidade():
+    assert list(_tamanhos_lotes(10, 4)) == [4, 4, 2]
+    assert list(_tamanhos_lotes(8, 4)) == [4, 4]
+    assert list(_tamanhos_lotes(0, 4)) == []
+
+def test_gerar_senhas_paralelo_quantidade_e_alfabeto():
+    config = ConfiguracaoSenha(comprimento=14, incluir_minusculas=True, incluir_numeros=True)
+    senhas = list(gerar_senhas_paralelo(config, 103, workers=2, tamanho_lote=10))
+    assert len(senhas) == 103
+    assert len(set(senhas)) == 103
+    assert all(len(s) == 14 for s in senhas)
+    assert all(c in CARACTERES_MINUSCULOS + CARACTERES_NUMERICOS for s in senhas for c in s)
+
+def test_gerar_senhas_paralelo_com_politica_zxcvbn():
+    config = ConfiguracaoSenha(comprimento=12, incluir_numeros=True)
+    senhas = list(gerar_senhas_paralelo(config, 20, workers=2, tamanho_lote=5, politica=PoliticaForca(modo="zxcvbn")))
+    assert len(senhas) == 20
+
+def test_gerar_senhas_paralelo_erro_de_configuracao_antes_do_pool():
+    config = ConfiguracaoSenha(comprimento=2, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True)
+    with pytest.raises(ValueError, match="Não é possível garantir"):
+        gerar_senhas_paralelo(config, 10, workers=2)
+
+@pytest.mark.parametrize("quantidade, workers, tamanho_lote, msg", [
+    (-1, 2, 10, "A quantidade de senhas não pode ser negativa."),
+    (10, 0, 10, "O número de workers deve ser positivo."),
+    (10, 2, 0, "O tamanho do lote deve ser positivo."),
+])
+def test_gerar_senhas_paralelo_parametros_invalidos(quantidade, workers, tamanho_lote, msg):
+    config = ConfiguracaoSenha(comprimento=8, incluir_minusculas=True)
+    with pytest.raises(ValueError, match=msg):
+        gerar_senhas_paralelo(config, quantidade, workers=workers, tamanho_lote=tamanho_lote)
+
+def test_gerar_senhas_paralelo_mescla_estatisticas_dos_workers():
+    estatisticas = EstatisticasGeracao()
+    config = ConfiguracaoSenha(comprimento=12, incluir_minusculas=True)
+    senhas = list(gerar_senhas_paralelo(config, 30, workers=2, tamanho_lote=7, estatisticas=estatisticas))
+    assert len(senhas) == 30
+    assert estatisticas.senhas == 30
+    assert sum(estatisticas.histograma_tentativas.values()) == 30
@@ -1,16 +1,30 @@
 import pytest
+import math
 import random
 import requests
 from zxcvbn import zxcvbn
 import subprocess
 import sys
 import tempfile
+import os
+import time
 import json
 import xml.etree.ElementTree as ET
 
 from gerador_senha import (
     ConfiguracaoSenha,
     gerar_senha,
+    gerar_senhas,
+    gerar_resultados,
+    ResultadoGeracao,
+    compilar_configuracao,
+    AmostradorSeguro,
+    EstatisticasGeracao,
+    GeradorSenhaCompilado,
+    GeradorSenhaInstrumentado,
+    PoliticaForca,
+    score_por_palpites,
+    estimar_log10_palpites,
     CARACTERES_MINUSCULOS,
     CARACTERES_MAIUSCULOS,
     CARACTERES_NUMERICOS,
@@ -142,6 +156,318 @@ def test_gerar_senha_unicidade():
         assert senha not in senhas
         senhas.add(senha)
 
+def test_gerar_senhas_quantidade_e_unicidade():
+    config = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True, incluir_simbolos=True)
+    senhas = list(gerar_senhas(config, 50))
+    assert len(senhas) == 50
+    assert len(set(senhas)) == 50
+    conjunto_esperado = CARACTERES_MINUSCULOS + CARACTERES_MAIUSCULOS + CARACTERES_NUMERICOS + CARACTERES_SIMBOLOS_PADRAO
+    for senha in senhas:
+        assert len(senha) == 16
+        assert contem_apenas(senha, conjunto_esperado)
+        assert contem_algum(senha, CARACTERES_MINUSCULOS)
+        assert contem_algum(senha, CARACTERES_MAIUSCULOS)
+        assert contem_algum(senha, CARACTERES_NUMERICOS)
+        assert contem_algum(senha, CARACTERES_SIMBOLOS_PADRAO)
+
+def test_gerar_senhas_quantidade_zero_e_negativa():
+    config = ConfiguracaoSenha(comprimento=8, incluir_minusculas=True)
+    assert list(gerar_senhas(config, 0)) == []
+    with pytest.raises(ValueError, match="A quantidade de senhas não pode ser negativa."):
+        gerar_senhas(config, -1)
+
+def test_gerar_senhas_valida_configuracao_antes_de_iterar():
+    config = ConfiguracaoSenha(comprimento=2, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True)
+    with pytest.raises(ValueError, match="Não é possível garantir todos os tipos de caracteres selecionados"):
+        gerar_senhas(config, 10)
+
+def test_compilar_configuracao_reutilizavel():
+    config = ConfiguracaoSenha(comprimento=12, incluir_numeros=True, incluir_simbolos=True, simbolos_personalizados="#$")
+    gerador = compilar_configuracao(config)
+    assert gerador.alfabeto == CARACTERES_NUMERICOS + "#$"
+    for _ in range(5):
+        senha = gerador.gerar()
+        assert len(senha) == 12
+        assert contem_apenas(senha, CARACTERES_NUMERICOS + "#$")
+
+@pytest.mark.parametrize("tamanho_alfabeto", [1, 2, 10, 94, 256, 257, 1000, 70000])
+def test_amostrador_indices_dentro_do_intervalo(tamanho_alfabeto):
+    amostrador = AmostradorSeguro()
+    indices = amostrador.indices(tamanho_alfabeto, 500)
+    assert len(indices) == 500
+    assert all(0 <= i < tamanho_alfabeto for i in indices)
+
+def test_amostrador_distribuicao_aproximadamente_uniforme():
+    amostrador = AmostradorSeguro()
+    tamanho_alfabeto, quantidade = 94, 94000
+    contagens = [0] * tamanho_alfabeto
+    for i in amostrador.indices(tamanho_alfabeto, quantidade):
+        contagens[i] += 1
+    esperado = quantidade / tamanho_alfabeto
+    qui_quadrado = sum((c - esperado) ** 2 / esperado for c in contagens)
+    #93 graus de liberdade: o limite fica muito acima do valor critico de p=0.001 (~140)
+    assert qui_quadrado < 200
+
+def test_amostrador_le_entropia_em_blocos():
+    amostrador = AmostradorSeguro(tamanho_bloco=1024)
+    amostrador.escolher(CARACTERES_MINUSCULOS, 100)
+    assert amostrador.bytes_consumidos == 1024
+    amostrador.escolher(CARACTERES_MINUSCULOS, 100)
+    assert amostrador.bytes_consumidos == 1024
+
+def test_amostrador_parametros_invalidos():
+    with pytest.raises(ValueError, match="O tamanho do bloco de entropia deve ser positivo."):
+        AmostradorSeguro(tamanho_bloco=0)
+    with pytest.raises(ValueError, match="O alfabeto para amostragem não pode ser vazio."):
+        AmostradorSeguro().indices(0, 1)
+
+def test_amostrador_indices_mistos():
+    amostrador = AmostradorSeguro()
+    tamanhos = [1, 2, 26, 94, 1000, 70000]
+    for _ in range(200):
+        assert all(0 <= i < t for i, t in zip(amostrador.indices_mistos(tamanhos), tamanhos))
+    assert amostrador.indices_mistos([]) == []
+
+def test_amostrador_posicoes_distintas_e_uniformes():
+    amostrador = AmostradorSeguro()
+    contagens = [0] * 10
+    for _ in range(2000):
+        posicoes = amostrador.posicoes(10, 3)
+        assert len(set(posicoes)) == 3
+        for p in posicoes:
+            contagens[p] += 1
+    esperado = 600
+    assert sum((c - esperado) ** 2 / esperado for c in contagens) < 40
+    assert sorted(amostrador.posicoes(5, 5)) == [0, 1, 2, 3, 4]
+    with pytest.raises(ValueError, match="Não há posições suficientes"):
+        amostrador.posicoes(2, 3)
+
+@pytest.mark.parametrize("texto", ["x", "abc", "senha123", "★✪"])
+def test_texto_necessario_comprimento_exato(texto):
+    config = ConfiguracaoSenha(comprimento=12, incluir_maiusculas=True, incluir_numeros=True, texto_necessario=texto)
+    for senha in gerar_senhas(config, 50):
+        assert len(senha) == 12
+        assert texto in senha
+        assert contem_algum(senha.replace(texto, "", 1), CARACTERES_MAIUSCULOS)
+        assert contem_algum(senha.replace(texto, "", 1), CARACTERES_NUMERICOS)
+
+def test_texto_necessario_conta_todos_os_caracteres():
+    config = ConfiguracaoSenha(comprimento=9, incluir_minusculas=True, incluir_numeros=True, texto_necessario="abcdefgh")
+    with pytest.raises(ValueError, match="São necessários pelo menos 10 caracteres, mas o comprimento é 9."):
+        gerar_senha(config)
+    config = ConfiguracaoSenha(comprimento=8, incluir_minusculas=True, texto_necessario="abcdefg")
+    senha = gerar_senha(config)
+    assert len(senha) == 8
+    assert senha.startswith("abcdefg") or senha.endswith("abcdefg")
+
+def test_posicao_do_texto_necessario_uniforme():
+    #texto + 1 garantido + 2 de preenchimento = 4 unidades: o bloco cai em cada uma com prob. 1/4
+    config = ConfiguracaoSenha(comprimento=6, incluir_numeros=True, texto_necessario="AAA")
+    contagens = {}
+    for senha in gerar_senhas(config, 4000, PoliticaForca(modo="nenhuma")):
+        contagens[senha.index("AAA")] = contagens.get(senha.index("AAA"), 0) + 1
+    assert sorted(contagens) == [0, 1, 2, 3]
+    assert all(850 < c < 1150 for c in contagens.values())
+
+def test_geracao_nao_usa_random(monkeypatch):
+    def proibido(*args, **kwargs):
+        raise AssertionError("random não é um CSPRNG")
+    monkeypatch.setattr(random, "shuffle", proibido)
+    monkeypatch.setattr(random, "choice", proibido)
+    config = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True,
+                               incluir_simbolos=True, texto_necessario="ok")
+    assert len(gerar_senha(config)) == 16
+
+def _lista_frase(diretorio):
+    caminho = f"{diretorio}/palavras.txt"
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write("\n".join(["alfa", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"]))
+    return caminho
+
+def test_frase_senha_palavras_e_separador(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERADOR_SENHA_CACHE", str(tmp_path))
+    config = ConfiguracaoSenha(comprimento=5, modo="frase", separador=".", lista_palavras=_lista_frase(tmp_path))
+    palavras = {"alfa", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel"}
+    for senha in gerar_senhas(config, 30):
+        partes = senha.split(".")
+        assert len(partes) == 5
+        assert set(partes) <= palavras
+
+def test_frase_senha_capitalizacao_e_injecoes(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERADOR_SENHA_CACHE", str(tmp_path))
+    config = ConfiguracaoSenha(comprimento=4, modo="frase", incluir_maiusculas=True, incluir_numeros=True,
+                               incluir_simbolos=True, simbolos_personalizados="#", lista_palavras=_lista_frase(tmp_path))
+    gerador = compilar_configuracao(config, PoliticaForca(modo="nenhuma"))
+    #4 palavras de 8 (12 bits), mais numero (log2 4*10) e simbolo (log2 4*1)
+    assert gerador.entropia_bits == pytest.approx(12 + math.log2(40) + 2)
+    for _ in range(30):
+        partes = gerador.gerar().split("-")
+        assert len(partes) == 4
+        assert all(p[0].isupper() for p in partes)
+        assert sum(c.isdigit() for p in partes for c in p) == 1
+        assert sum(c == "#" for p in partes for c in p) == 1
+
+def test_frase_senha_lista_padrao(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERADOR_SENHA_CACHE", str(tmp_path))
+    config = ConfiguracaoSenha(comprimento=6, modo="frase")
+    resultado = compilar_configuracao(config).gerar_resultado()
+    assert len(resultado.senha.split("-")) == 6
+    assert resultado.score == 4
+
+def test_frase_senha_com_estatisticas(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERADOR_SENHA_CACHE", str(tmp_path))
+    estatisticas = EstatisticasGeracao()
+    config = ConfiguracaoSenha(comprimento=3, modo="frase", lista_palavras=_lista_frase(tmp_path))
+    assert len(list(gerar_senhas(config, 5, PoliticaForca(modo="nenhuma"), estatisticas))) == 5
+    assert estatisticas.senhas == 5
+
+def test_modo_senha_invalido():
+    with pytest.raises(ValueError, match="Modo de senha inválido"):
+        ConfiguracaoSenha(comprimento=4, incluir_minusculas=True, modo="palavras")
+    with pytest.raises(ValueError, match="O modo frase não suporta texto necessário."):
+        ConfiguracaoSenha(comprimento=4, modo="frase", texto_necessario="x")
+    #no modo frase nenhuma classe e obrigatoria
+    assert ConfiguracaoSenha(comprimento=4, modo="frase").modo == "frase"
+
+@pytest.mark.parametrize("log10_palpites, score_esperado", [
+    (0, 0), (3, 0), (3.1, 1), (6.5, 2), (8, 2), (9, 3), (10.5, 4), (30, 4),
+])
+def test_score_por_palpites_segue_limiares_zxcvbn(log10_palpites, score_esperado):
+    assert score_por_palpites(log10_palpites) == score_esperado
+
+def test_estimativa_limitada_pelo_comprimento():
+    assert estimar_log10_palpites(1000, 8) == 8
+    assert estimar_log10_palpites(10, 8) == pytest.approx(10 * 0.30103, rel=1e-4)
+
+def test_politica_invalida():
+    with pytest.raises(ValueError, match="Política de força inválida"):
+        PoliticaForca(modo="rapida")
+    with pytest.raises(ValueError, match="O score mínimo deve estar entre 0 e 4."):
+        PoliticaForca(score_minimo=5)
+    with pytest.raises(ValueError, match="A margem de entropia não pode ser negativa."):
+        PoliticaForca(margem_bits=-1)
+    with pytest.raises(ValueError, match="O prazo por senha deve ser positivo."):
+        PoliticaForca(prazo_ms=0)
+    with pytest.raises(ValueError, match="O número máximo de tentativas deve ser positivo."):
+        PoliticaForca(max_tentativas=0)
+
+@pytest.mark.parametrize("comprimento, inc_num, inc_todos, modo, usa_zxcvbn", [
+    (32, False, True, "adaptativa", False),
+    (10, True, False, "adaptativa", True),
+    (8, False, True, "adaptativa", False),
+    (32, False, True, "zxcvbn", True),
+    (10, True, False, "entropia", False),
+    (10, True, False, "nenhuma", False),
+])
+def test_politica_decide_quando_usar_zxcvbn(comprimento, inc_num, inc_todos, modo, usa_zxcvbn):
+    config = ConfiguracaoSenha(comprimento=comprimento, incluir_numeros=inc_num or inc_todos, incluir_minusculas=inc_todos,
+                               incluir_maiusculas=inc_todos, incluir_simbolos=inc_todos)
+    gerador = compilar_configuracao(config, PoliticaForca(modo=modo))
+    assert gerador.usar_zxcvbn == usa_zxcvbn
+
+@pytest.mark.parametrize("modo", ["adaptativa", "zxcvbn", "entropia", "nenhuma"])
+def test_gerar_senha_com_cada_politica(modo):
+    config = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_numeros=True)
+    senha = gerar_senha(config, PoliticaForca(modo=modo))
+    assert len(senha) == 16
+    assert contem_apenas(senha, CARACTERES_MINUSCULOS + CARACTERES_NUMERICOS)
+
+def test_politica_adaptativa_mantem_score_zxcvbn():
+    config = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True)
+    for senha in gerar_senhas(config, 20, PoliticaForca(modo="adaptativa")):
+        assert zxcvbn(senha)['score'] >= 3
+
+def test_gerar_resultados_inclui_score_e_tentativas():
+    config = ConfiguracaoSenha(comprimento=12, incluir_numeros=True)
+    for resultado in gerar_resultados(config, 5, PoliticaForca(modo="zxcvbn")):
+        assert len(resultado.senha) == 12
+        assert 1 <= resultado.tentativas <= 10
+        assert resultado.score == zxcvbn(resultado.senha)['score']
+
+def test_gerar_resultados_score_conforme_politica():
+    config = ConfiguracaoSenha(comprimento=20, incluir_minusculas=True, incluir_maiusculas=True)
+    estimado = next(gerar_resultados(config, 1, PoliticaForca(modo="entropia")))
+    sem_verificacao = next(gerar_resultados(config, 1, PoliticaForca(modo="nenhuma")))
+    assert estimado.score == 4 and estimado.tentativas == 1
+    assert sem_verificacao.score is None
+
+def _avaliador_sequencia(gerador, scores, espera=0.0):
+    #substitui o score do zxcvbn por uma sequencia fixa, guardando as candidatas avaliadas
+    avaliadas, scores = [], iter(scores)
+    def avaliar(senha):
+        time.sleep(espera)
+        avaliadas.append(senha)
+        return next(scores)
+    gerador._avaliar = avaliar
+    return avaliadas
+
+def test_tentativas_esgotadas_retornam_melhor_candidata():
+    config = ConfiguracaoSenha(comprimento=12, incluir_minusculas=True)
+    gerador = compilar_configuracao(config, PoliticaForca(modo="zxcvbn"))
+    avaliadas = _avaliador_sequencia(gerador, [1, 2, 0, 1, 1, 0, 2, 1, 0, 1])
+    resultado = gerador.gerar_resultado()
+    assert resultado == (avaliadas[1], 2, 10, False)
+
+    avaliadas = _avaliador_sequencia(gerador, [0, 3])
+    assert gerador.gerar_resultado() == (avaliadas[1], 3, 2, True)
+
+def test_prazo_interrompe_tentativas():
+    config = ConfiguracaoSenha(comprimento=12, incluir_minusculas=True)
+    #cada avaliacao leva 5ms: com prazo de 1ms nao ha tempo para uma segunda
+    gerador = compilar_configuracao(config, PoliticaForca(modo="zxcvbn", prazo_ms=1))
+    avaliadas = _avaliador_sequencia(gerador, [2] + [0] * 9, espera=0.005)
+    assert gerador.gerar_resultado() == (avaliadas[0], 2, 1, False)
+
+    sem_prazo = compilar_configuracao(config, PoliticaForca(modo="zxcvbn"))
+    _avaliador_sequencia(sem_prazo, [0] * 10, espera=0.005)
+    assert sem_prazo.gerar_resultado().tentativas == 10
+
+    folgado = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_maiusculas=True, incluir_numeros=True)
+    for resultado in gerar_resultados(folgado, 5, PoliticaForca(modo="zxcvbn", prazo_ms=10_000)):
+        assert resultado.atingiu_meta and resultado.score >= 3
+
+def test_meta_sem_zxcvbn_segue_estimativa():
+    curta = ConfiguracaoSenha(comprimento=4, incluir_numeros=True)
+    longa = ConfiguracaoSenha(comprimento=20, incluir_minusculas=True, incluir_maiusculas=True)
+    assert not next(gerar_resultados(curta, 1, PoliticaForca(modo="entropia"))).atingiu_meta
+    assert next(gerar_resultados(longa, 1, PoliticaForca(modo="entropia"))).atingiu_meta
+    assert next(gerar_resultados(curta, 1, PoliticaForca(modo="nenhuma"))).atingiu_meta
+
+def test_estatisticas_desligadas_usam_gerador_sem_instrumentacao():
+    config = ConfiguracaoSenha(comprimento=12, incluir_minusculas=True)
+    assert type(compilar_configuracao(config)) is GeradorSenhaCompilado
+    assert isinstance(compilar_configuracao(config, estatisticas=EstatisticasGeracao()), GeradorSenhaInstrumentado)
+
+def test_estatisticas_contam_tentativas_fallbacks_e_tempos():
+    estatisticas = EstatisticasGeracao()
+    #numerico de 8 digitos nunca chega a score 3 no zxcvbn: todas as senhas esgotam as tentativas
+    config = ConfiguracaoSenha(comprimento=8, incluir_numeros=True)
+    senhas = list(gerar_senhas(config, 3, PoliticaForca(modo="zxcvbn"), estatisticas))
+    assert len(senhas) == 3
+    assert estatisticas.senhas == 3
+    assert estatisticas.histograma_tentativas == {10: 3}
+    assert estatisticas.fallbacks == 3
+    assert estatisticas.tempo_score > 0
+    assert estatisticas.tempo_amostragem > 0
+    assert estatisticas.tempo_total >= estatisticas.tempo_score
+    assert estatisticas.bytes_aleatorios > 0
+
+def test_estatisticas_callback_e_mesclagem():
+    chamadas = []
+    estatisticas = EstatisticasGeracao(callback=lambda resultado, fallback: chamadas.append((resultado, fallback)))
+    config = ConfiguracaoSenha(comprimento=20, incluir_minusculas=True, incluir_numeros=True)
+    resultados = list(gerar_resultados(config, 4, PoliticaForca(modo="nenhuma"), estatisticas))
+    assert [r for r, _ in chamadas] == resultados
+    assert not any(fallback for _, fallback in chamadas)
+
+    total = EstatisticasGeracao()
+    total.mesclar(estatisticas)
+    total.mesclar(estatisticas)
+    assert total.senhas == 8
+    assert total.histograma_tentativas == {1: 8}
+    assert "Senhas: 8" in total.resumo()
+    assert total.como_dict()["bytes_aleatorios"] == 2 * estatisticas.bytes_aleatorios
+
 @pytest.mark.parametrize("comprimento, minus, maius, num, simb, simb_pers, msg_erro_parcial", [
     (1, True, True, False, False, None, "Não é possível garantir"),
     (3, True, True, True, True, None, "Não é possível garantir"),
@@ -336,6 +662,226 @@ def test_cli_integracao_argumentos():
     senha = resultado.stdout.strip().split(":")[-1].strip()
     assert len(senha) == 16
 
+def test_cli_politica_forca():
+    comando = [sys.executable, "main.py", "-c", "12", "--numeros", "--politica", "zxcvbn", "--score_minimo", "2"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+
+    assert resultado.returncode == 0
+    senha = resultado.stdout.strip().split(":")[-1].strip()
+    assert len(senha) == 12
+    assert contem_apenas(senha, CARACTERES_NUMERICOS)
+
+def test_cli_quantidade_com_workers():
+    comando = [sys.executable, "main.py", "-c", "10", "--minusculas", "--quantidade", "25", "--workers", "2", "--lote", "4"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+
+    assert resultado.returncode == 0
+    senhas = resultado.stdout.split()
+    assert len(senhas) == 25
+    assert all(len(s) == 10 and contem_apenas(s, CARACTERES_MINUSCULOS) for s in senhas)
+    assert "25 senhas geradas" in resultado.stderr
+
+def test_cli_saida_ndjson_em_arquivo():
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = f"{diretorio}/senhas.ndjson"
+        comando = [sys.executable, "main.py", "-c", "12", "--minusculas", "--numeros", "-n", "30", "--formato", "ndjson", "--saida", caminho]
+        resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+        assert resultado.returncode == 0
+
+        with open(caminho, encoding="utf-8") as arquivo:
+            linhas = [json.loads(linha) for linha in arquivo]
+    assert len(linhas) == 30
+    assert all(linha["comprimento"] == 12 == len(linha["senha"]) for linha in linhas)
+    assert all(set(linha) == {"senha", "comprimento", "score", "tentativas"} for linha in linhas)
+
+def test_cli_stats():
+    comando = [sys.executable, "main.py", "-c", "14", "--minusculas", "--numeros", "--stats"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+
+    assert resultado.returncode == 0
+    assert "Senha Gerada:" in resultado.stdout
+    assert "Tentativas por senha: 1: 1" in resultado.stderr
+    assert "Bytes aleatórios lidos:" in resultado.stderr
+
+def test_importar_gerador_nao_carrega_zxcvbn():
+    codigo = ("import sys, gerador_senha as g; assert 'zxcvbn' not in sys.modules; "
+              "g.gerar_senha(g.ConfiguracaoSenha(comprimento=32, incluir_minusculas=True)); assert 'zxcvbn' not in sys.modules; "
+              "g.gerar_senha(g.ConfiguracaoSenha(comprimento=32, incluir_minusculas=True), g.PoliticaForca(modo='zxcvbn')); "
+              "assert 'zxcvbn' in sys.modules")
+    resultado = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+
+def test_cli_servico_indisponivel_gera_localmente():
+    comando = [sys.executable, "main.py", "-c", "12", "--minusculas", "--servico", "/caminho/inexistente.sock"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 0
+    assert "Gerando localmente" in resultado.stderr
+    assert "Senha Gerada:" in resultado.stdout
+
+def test_servico_que_cai_no_meio_continua_localmente(capsys):
+    from main import continuar_localmente
+    def remotos():
+        yield ResultadoGeracao("remota1", 4, 1)
+        yield ResultadoGeracao("remota2", 4, 1)
+        raise ConnectionError("O serviço aquecido encerrou a conexão.")
+    locais = lambda quantidade: (ResultadoGeracao(f"local{i}", 4, 1) for i in range(quantidade))
+    senhas = [r.senha for r in continuar_localmente(remotos(), 5, locais)]
+    assert senhas == ["remota1", "remota2", "local0", "local1", "local2"]
+    assert "as 3 senhas restantes" in capsys.readouterr().err
+
+@pytest.mark.parametrize("opcoes", [["-c", "8", "--numeros"], ["-c", "8", "--numeros", "--formato", "binario"], ["--padrao", "aaaa"]])
+def test_cli_saida_inacessivel(opcoes):
+    comando = [sys.executable, "main.py", "-n", "3", "-o", "/inexistente/dir/x"] + opcoes
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 1
+    assert "Erro ao acessar arquivo" in resultado.stderr and "Traceback" not in resultado.stderr
+
+def test_cli_unicas():
+    comando = [sys.executable, "main.py", "-c", "3", "--numeros", "-n", "900", "--unicas", "exata", "--politica", "nenhuma"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 0
+    assert len(set(resultado.stdout.split())) == 900
+    assert "Unicidade (exata)" in resultado.stderr
+
+    comando = [sys.executable, "main.py", "-c", "3", "--numeros", "-n", "1001", "--unicas", "bloom"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 1
+    assert "não comporta 1001 senhas únicas" in resultado.stdout
+
+def test_cli_frase():
+    with tempfile.TemporaryDirectory() as diretorio:
+        ambiente = {**os.environ, "GERADOR_SENHA_CACHE": diretorio}
+        comando = [sys.executable, "main.py", "--frase", "-c", "5", "--separador", "_", "--maiusculas", "-n", "3"]
+        resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore', env=ambiente)
+    assert resultado.returncode == 0, resultado.stderr
+    frases = resultado.stdout.split()
+    assert len(frases) == 3
+    assert all(len(f.split("_")) == 5 and all(p[0].isupper() for p in f.split("_")) for f in frases)
+    assert "Aviso" not in resultado.stdout + resultado.stderr
+
+def test_cli_padrao():
+    comando = [sys.executable, "main.py", "--padrao", "Aaaa-9999-!!", "--simbolos_custom", "#", "-n", "5"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 0
+    senhas = resultado.stdout.split()
+    assert len(senhas) == 5
+    assert all(len(s) == 12 and s[4] == "-" and s[5:9].isdigit() and s.endswith("##") for s in senhas)
+    assert "Aviso" not in resultado.stdout
+
+def test_cli_padrao_score_minimo_e_opcoes_incompativeis():
+    base = [sys.executable, "main.py", "--padrao", "9999", "-n", "3"]
+    resultado = subprocess.run(base, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 0
+    assert "abaixo do score mínimo 3" in resultado.stderr
+    resultado = subprocess.run(base + ["--score_minimo", "0"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert "Aviso" not in resultado.stderr
+    for opcoes in (["--politica", "zxcvbn"], ["--unicas", "exata"], ["--calibrar"], ["--prazo_ms", "5"]):
+        resultado = subprocess.run(base + opcoes, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+        assert resultado.returncode == 1
+        assert "não pode ser combinado" in resultado.stdout
+    resultado = subprocess.run(base + ["-c", "12", "--numeros", "--avaliador", "automato"],
+                               capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 1
+    assert "remova -c, --numeros, --avaliador" in resultado.stdout
+    for score in ("5", "-1"):
+        resultado = subprocess.run(base + ["--score_minimo", score], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+        assert resultado.returncode == 1
+        assert "score mínimo deve estar entre 0 e 4" in resultado.stdout
+
+def test_cli_grafemas():
+    from alfabeto import separar_grafemas
+    simbolos = ["\U0001F44D\U0001F3FD", "\U0001F1E7\U0001F1F7"]
+    comando = [sys.executable, "main.py", "-c", "4", "--simbolos", "--simbolos_custom", "".join(simbolos), "--grafemas", "-n", "5"]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 0
+    senhas = resultado.stdout.split()
+    assert len(senhas) == 5
+    assert all(len(separar_grafemas(s)) == 4 and set(separar_grafemas(s)) <= set(simbolos) for s in senhas)
+
+def test_cli_deterministico_fragmentos():
+    with tempfile.TemporaryDirectory() as diretorio:
+        segredo = f"{diretorio}/segredo"
+        with open(segredo, "w") as arquivo:
+            arquivo.write("x" * 32)
+        base = [sys.executable, "main.py", "-c", "14", "--minusculas", "--numeros", "-n", "10", "--deterministico", segredo]
+        unica = subprocess.run(base, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+        partes = [subprocess.run(base + ["--fragmento", f"{k}/3"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+                  for k in range(3)]
+        combinado = subprocess.run(base + ["--servico"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+
+    assert unica.returncode == 0
+    assert len(unica.stdout.split()) == 10
+    assert "modo determinístico" in unica.stderr
+    assert [s for parte in partes for s in parte.stdout.split()] == unica.stdout.split()
+    assert combinado.returncode == 1
+    assert "não pode ser combinado" in combinado.stdout
+
+def test_cli_formato_binario():
+    from arquivo_senhas import ArquivoSenhas
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = f"{diretorio}/senhas.bin"
+        comando = [sys.executable, "main.py", "-c", "10", "--numeros", "-n", "50", "--formato", "binario", "-o", caminho]
+        resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+        assert resultado.returncode == 0, resultado.stdout
+        with ArquivoSenhas(caminho) as arquivo:
+            assert (len(arquivo), arquivo.largura) == (50, 10)
+            assert all(senha.isdigit() and len(senha) == 10 for senha in arquivo)
+
+    sem_saida = subprocess.run(comando[:-2], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert sem_saida.returncode == 1
+    assert "exige um arquivo de saída" in sem_saida.stdout
+
+def test_cli_prazo_avisa_score_nao_atingido():
+    #numerico de 8 digitos nunca chega a score 3; com prazo minimo cada senha fica com a primeira candidata
+    comando = [sys.executable, "main.py", "-c", "8", "--numeros", "--politica", "zxcvbn", "--prazo_ms", "0.001"]
+    unica = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert unica.returncode == 0
+    assert "Senha Gerada:" in unica.stdout
+    assert "score mínimo 3 não atingido" in unica.stderr and "em 1 tentativas" in unica.stderr
+
+    lote = subprocess.run(comando + ["-n", "4", "--formato", "ndjson"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert lote.returncode == 0
+    assert [json.loads(linha)["tentativas"] for linha in lote.stdout.splitlines()] == [1] * 4
+    assert "4 senhas abaixo do score mínimo 3" in lote.stderr
+
+    invalido = subprocess.run(comando[:-1] + ["0"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert invalido.returncode == 1
+    assert "prazo por senha deve ser positivo" in invalido.stdout
+
+def test_cli_auditar():
+    with tempfile.TemporaryDirectory() as diretorio:
+        senhas = f"{diretorio}/senhas.txt"
+        with open(senhas, "w") as arquivo:
+            arquivo.write("Abcdefgh12\nabc\nABCDEFGH12\n")
+        comando = [sys.executable, "main.py", "--auditar", senhas, "-c", "10", "--minusculas", "--maiusculas", "--numeros",
+                   "--politica", "nenhuma"]
+        resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+        ndjson = subprocess.run(comando + ["--formato", "ndjson"], capture_output=True, text=True, encoding='utf-8', errors='ignore')
+
+    assert resultado.returncode == 1
+    assert resultado.stdout.splitlines() == ["linha 2: comprimento,sem_maiusculas,sem_numeros", "linha 3: sem_minusculas"]
+    assert "3 senhas, 1 aprovadas, 2 reprovadas" in resultado.stderr
+    assert [json.loads(l)["linha"] for l in ndjson.stdout.splitlines()] == [2, 3]
+    #a senha auditada nao aparece na saida
+    assert "ABCDEFGH12" not in resultado.stdout + ndjson.stdout
+
+def test_cli_manifesto_xml():
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = f"{diretorio}/manifesto.xml"
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write('<manifesto><config id="web" quantidade="5"><comprimento>16</comprimento>'
+                          '<incluir_numeros>true</incluir_numeros></config>'
+                          '<config id="pin" quantidade="3"><comprimento>6</comprimento>'
+                          '<incluir_numeros>true</incluir_numeros><politica>nenhuma</politica></config></manifesto>')
+        comando = [sys.executable, "main.py", "--manifesto", caminho, "--formato", "ndjson"]
+        resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+
+    assert resultado.returncode == 0, resultado.stderr
+    linhas = [json.loads(linha) for linha in resultado.stdout.splitlines()]
+    assert [linha["id"] for linha in linhas] == ["web"] * 5 + ["pin"] * 3
+    assert all(len(linha["senha"]) == (16 if linha["id"] == "web" else 6) for linha in linhas)
+    assert "2 entradas, 2 configurações distintas, 8 senhas, 0 erros" in resultado.stderr
+
 def test_integracao_arquivo_simbolos_personalizados():
     #testa integracao com filesystem, fazendo leitura de um arquivo com simbolos
     with tempfile.NamedTemporaryFile(mode='w+', encoding='utf-8', delete=True) as temp_file:
@@ -0,0 +1,82 @@
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from gerador_senha import (
+    ConfiguracaoSenha,
+    CARACTERES_MINUSCULOS,
+    CARACTERES_MAIUSCULOS,
+    CARACTERES_NUMERICOS,
+    CARACTERES_SIMBOLOS_PADRAO
+)
+from gerador_vetorizado import GeradorVetorizado, gerar_matriz_senhas
+
+
+def test_matriz_formato_e_tipo():
+    config = ConfiguracaoSenha(comprimento=16, incluir_minusculas=True, incluir_numeros=True)
+    matriz = gerar_matriz_senhas(config, 1000)
+    assert matriz.shape == (1000, 16)
+    assert matriz.dtype == np.uint8
+
+def test_garantias_por_classe_em_todas_as_linhas():
+    config = ConfiguracaoSenha(comprimento=4, incluir_minusculas=True, incluir_maiusculas=True,
+                               incluir_numeros=True, incluir_simbolos=True)
+    gerador = GeradorVetorizado(config)
+    for senha in gerador.para_strings(gerador.gerar_matriz(2000)):
+        assert len(senha) == 4
+        assert any(c in CARACTERES_MINUSCULOS for c in senha)
+        assert any(c in CARACTERES_MAIUSCULOS for c in senha)
+        assert any(c in CARACTERES_NUMERICOS for c in senha)
+        assert any(c in CARACTERES_SIMBOLOS_PADRAO for c in senha)
+
+def test_posicoes_garantidas_embaralhadas():
+    config = ConfiguracaoSenha(comprimento=8, incluir_numeros=True, incluir_simbolos=True, simbolos_personalizados="#")
+    gerador = GeradorVetorizado(config)
+    matriz = gerador.gerar_matriz(4000)
+    #o unico simbolo possivel deve aparecer em todas as colunas, nao so na primeira
+    colunas_com_simbolo = (matriz == ord("#")).any(axis=0)
+    assert colunas_com_simbolo.all()
+
+def test_alfabeto_unicode_usa_uint32():
+    config = ConfiguracaoSenha(comprimento=12, incluir_simbolos=True, simbolos_personalizados="★✪♛♜")
+    gerador = GeradorVetorizado(config)
+    matriz = gerador.gerar_matriz(50)
+    assert matriz.dtype == np.dtype("<u4")
+    senhas = list(gerador.para_strings(matriz))
+    assert all(len(s) == 12 and all(c in "★✪♛♜" for c in s) for s in senhas)
+
+def test_escrever_sem_copia_com_quebra_de_linha():
+    config = ConfiguracaoSenha(comprimento=10, incluir_minusculas=True)
+    gerador = GeradorVetorizado(config)
+    destino = io.BytesIO()
+    escritos = gerador.escrever(gerador.gerar_matriz(100, quebra_linha=True), destino)
+    assert escritos == 100 * 11
+    linhas = destino.getvalue().decode("latin-1").splitlines()
+    assert len(linhas) == 100
+    assert all(len(l) == 10 and all(c in CARACTERES_MINUSCULOS for c in l) for l in linhas)
+
+def test_distribuicao_do_preenchimento_uniforme():
+    config = ConfiguracaoSenha(comprimento=50, incluir_numeros=True)
+    gerador = GeradorVetorizado(config)
+    contagens = np.bincount(gerador.gerar_indices(2000).ravel(), minlength=10)
+    esperado = contagens.sum() / 10
+    assert ((contagens - esperado) ** 2 / esperado).sum() < 40
+
+def test_rejeita_texto_necessario_e_config_invalida():
+    with pytest.raises(ValueError, match="não suporta texto_necessario"):
+        GeradorVetorizado(ConfiguracaoSenha(comprimento=10, incluir_minusculas=True, texto_necessario="abc"))
+    with pytest.raises(ValueError, match="Não é possível garantir"):
+        GeradorVetorizado(ConfiguracaoSenha(comprimento=1, incluir_minusculas=True, incluir_numeros=True))
+    with pytest.raises(ValueError, match="não suporta clusters de grafemas"):
+        GeradorVetorizado(ConfiguracaoSenha(comprimento=10, incluir_simbolos=True, simbolos_personalizados="\U0001F44D\U0001F3FD",
+                                            agrupar_grafemas=True))
+
+def test_simbolos_repetidos_em_outras_classes():
+    #"a" e "b" ja estao nas minusculas: o simbolo garantido continua saindo de "ab#"
+    config = ConfiguracaoSenha(comprimento=2, incluir_minusculas=True, incluir_simbolos=True, simbolos_personalizados="ab#")
+    gerador = GeradorVetorizado(config)
+    assert gerador.alfabeto == CARACTERES_MINUSCULOS + "#"
+    for senha in gerador.para_strings(gerador.gerar_matriz(500)):
+        assert any(c in "ab#" for c in senha)
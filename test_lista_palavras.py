@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from lista_palavras import (
+    ListaPalavras,
+    abrir_lista_palavras,
+    caminho_compilado,
+    compilar_lista,
+    ler_arquivo_palavras,
+    palavras_padrao
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_temporario(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERADOR_SENHA_CACHE", str(tmp_path / "cache"))
+
+def test_compilar_e_ler_lista(tmp_path):
+    palavras = ["casa", "árvore", "ok", "pão", "文字"]
+    destino = str(tmp_path / "lista.bin")
+    assert compilar_lista(palavras, destino) == 5
+
+    lista = ListaPalavras(destino)
+    assert len(lista) == 5
+    assert [lista[i] for i in range(5)] == palavras
+    assert (lista.menor_comprimento, lista.maior_comprimento) == (2, 6)
+    with pytest.raises(IndexError):
+        lista[5]
+    lista.fechar()
+
+def test_compilar_lista_pequena_demais(tmp_path):
+    with pytest.raises(ValueError, match="pelo menos 2 palavras"):
+        compilar_lista(["unica"], str(tmp_path / "lista.bin"))
+
+def test_arquivo_invalido(tmp_path):
+    caminho = tmp_path / "lixo.bin"
+    caminho.write_bytes(b"nao e uma lista de palavras")
+    with pytest.raises(ValueError, match="Lista de palavras inválida"):
+        ListaPalavras(str(caminho))
+
+def test_ler_arquivo_palavras_aceita_formato_diceware(tmp_path):
+    caminho = tmp_path / "palavras.txt"
+    caminho.write_text("11111\tabacate\n11112\tbanana\n\nbanana\ncaju\n", encoding="utf-8")
+    assert ler_arquivo_palavras(str(caminho)) == ["abacate", "banana", "caju"]
+
+def test_lista_padrao_grande_e_sem_repeticoes():
+    palavras = palavras_padrao()
+    assert len(palavras) > 50000
+    assert len(set(palavras)) == len(palavras)
+    assert all(p.isalpha() and p.islower() and 3 <= len(p) <= 10 for p in palavras)
+
+def test_abrir_lista_compila_uma_vez(tmp_path):
+    caminho = tmp_path / "palavras.txt"
+    caminho.write_text("\n".join(f"palavra{i}" for i in range(100)), encoding="utf-8")
+    lista = abrir_lista_palavras(str(caminho))
+    assert len(lista) == 100
+    assert lista[42] == "palavra42"
+    assert os.path.exists(caminho_compilado(str(caminho)))
+    assert abrir_lista_palavras(str(caminho)) is lista
+
+def test_abrir_lista_inexistente():
+    with pytest.raises(ValueError, match="Não foi possível ler a lista de palavras"):
+        abrir_lista_palavras("/caminho/inexistente.txt")
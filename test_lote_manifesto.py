@@ -0,0 +1,155 @@
+import io
+import json
+
+import pytest
+
+from gerador_senha import CARACTERES_MINUSCULOS, CARACTERES_NUMERICOS
+from exportacao import escrever_registros
+from lote_manifesto import (
+    CAMPOS_SAIDA_MANIFESTO,
+    CacheGeradores,
+    ResumoManifesto,
+    ler_manifesto,
+    processar_manifesto
+)
+
+
+def _manifesto_ndjson(tmp_path, entradas):
+    caminho = tmp_path / "manifesto.ndjson"
+    caminho.write_text("\n".join(json.dumps(e) for e in entradas) + "\n", encoding="utf-8")
+    return str(caminho)
+
+def test_ler_manifesto_xml_converte_tipos(tmp_path):
+    caminho = tmp_path / "manifesto.xml"
+    caminho.write_text("""
+    <manifesto>
+        <config id="a" quantidade="3">
+            <comprimento>14</comprimento>
+            <incluir_minusculas>true</incluir_minusculas>
+            <incluir_numeros>False</incluir_numeros>
+            <simbolos_personalizados>#$&amp;</simbolos_personalizados>
+        </config>
+        <config><comprimento>8</comprimento></config>
+    </manifesto>
+    """, encoding="utf-8")
+    entradas = list(ler_manifesto(str(caminho)))
+    assert entradas[0] == {"id": "a", "quantidade": 3, "comprimento": 14, "incluir_minusculas": True,
+                           "incluir_numeros": False, "simbolos_personalizados": "#$&"}
+    assert entradas[1] == {"id": 1, "comprimento": 8}
+
+@pytest.mark.parametrize("nome", ["manifesto.txt", "manifesto.json"])
+def test_ler_manifesto_extensao_desconhecida(tmp_path, nome):
+    with pytest.raises(ValueError, match="Formato de manifesto não suportado"):
+        list(ler_manifesto(str(tmp_path / nome)))
+
+def test_ler_manifesto_xml_invalido(tmp_path):
+    caminho = tmp_path / "manifesto.xml"
+    caminho.write_text("<manifesto><config>", encoding="utf-8")
+    with pytest.raises(ValueError, match="Manifesto XML inválido"):
+        list(ler_manifesto(str(caminho)))
+
+def test_cache_geradores_compartilha_configuracoes_identicas():
+    cache = CacheGeradores(capacidade=2)
+    a = cache.obter({"id": 1, "quantidade": 5, "comprimento": 10, "incluir_numeros": True})
+    b = cache.obter({"id": 2, "quantidade": 1, "incluir_numeros": True, "comprimento": 10})
+    assert a is b
+    cache.obter({"comprimento": 11, "incluir_numeros": True})
+    cache.obter({"comprimento": 12, "incluir_numeros": True})
+    assert cache.obter({"comprimento": 10, "incluir_numeros": True}) is not a
+
+def test_processar_manifesto_gera_senhas_e_erros(tmp_path):
+    caminho = _manifesto_ndjson(tmp_path, [
+        {"id": "x", "quantidade": 4, "comprimento": 12, "incluir_minusculas": True, "incluir_numeros": True},
+        {"id": "y", "comprimento": 0, "incluir_minusculas": True},
+        {"id": "z", "comprimento": 10, "campo_estranho": 1},
+        {"id": "x2", "quantidade": 2, "comprimento": 12, "incluir_numeros": True, "incluir_minusculas": True},
+    ])
+    resumo = ResumoManifesto()
+    registros = list(processar_manifesto(caminho, resumo=resumo))
+
+    senhas = [r for r in registros if "senha" in r]
+    assert [r["id"] for r in senhas] == ["x"] * 4 + ["x2"] * 2
+    assert all(len(r["senha"]) == 12 == r["comprimento"] for r in senhas)
+    assert all(c in CARACTERES_MINUSCULOS + CARACTERES_NUMERICOS for r in senhas for c in r["senha"])
+    erros = {r["id"]: r["erro"] for r in registros if "erro" in r}
+    assert erros["y"] == "O comprimento da senha deve ser positivo."
+    assert "Campo de configuração inválido" in erros["z"]
+    assert (resumo.entradas, resumo.configuracoes_distintas, resumo.senhas, resumo.erros) == (4, 3, 6, 2)
+
+def test_processar_manifesto_tipos_invalidos(tmp_path):
+    caminho = _manifesto_ndjson(tmp_path, [
+        {"id": "a", "comprimento": 12.5, "incluir_numeros": True},
+        {"id": "b", "comprimento": 8, "incluir_numeros": "sim"},
+        {"id": "c", "comprimento": 8, "incluir_simbolos": True, "simbolos_personalizados": 5},
+        {"id": "d", "comprimento": 8, "incluir_numeros": True},
+    ])
+    registros = list(processar_manifesto(caminho))
+    erros = {r["id"]: r["erro"] for r in registros if "erro" in r}
+    assert erros == {"a": "O campo comprimento deve ser um inteiro.",
+                     "b": "O campo incluir_numeros deve ser verdadeiro ou falso.",
+                     "c": "O campo simbolos_personalizados deve ser um texto."}
+    assert [r["id"] for r in registros if "senha" in r] == ["d"]
+
+def test_erro_ao_gerar_vira_registro(monkeypatch):
+    import lote_manifesto
+    class GeradorQuebrado:
+        def gerar_resultado(self):
+            raise ValueError("falhou")
+    class Cache:
+        def obter(self, entrada):
+            return GeradorQuebrado() if entrada["id"] == "quebrado" else CacheGeradores().obter(entrada)
+    monkeypatch.setattr(lote_manifesto, "_cache_worker", Cache())
+    registros = lote_manifesto.processar_entradas([{"id": "quebrado", "quantidade": 3, "comprimento": 8},
+                                                   {"id": "ok", "comprimento": 8, "incluir_numeros": True}])
+    assert registros[0] == {"id": "quebrado", "erro": "Erro ao gerar senhas: falhou"}
+    assert registros[1]["id"] == "ok" and len(registros[1]["senha"]) == 8
+
+def test_processar_manifesto_quantidade_invalida(tmp_path):
+    caminho = _manifesto_ndjson(tmp_path, [{"id": 1, "quantidade": -1, "comprimento": 8}])
+    assert list(processar_manifesto(caminho)) == [{"id": 1, "erro": "A quantidade deve ser um inteiro não negativo."}]
+
+def test_processar_manifesto_paralelo(tmp_path):
+    entradas = [{"id": i, "quantidade": 7, "comprimento": 10 + i % 3, "incluir_numeros": True} for i in range(12)]
+    caminho = _manifesto_ndjson(tmp_path, entradas)
+    registros = list(processar_manifesto(caminho, workers=2, senhas_por_tarefa=10))
+    assert len(registros) == 84
+    assert sorted(r["id"] for r in registros) == sorted(i for i in range(12) for _ in range(7))
+    assert all(len(r["senha"]) == 10 + r["id"] % 3 for r in registros)
+
+def test_entrada_grande_dividida_em_tarefas(tmp_path, monkeypatch):
+    import lote_manifesto
+    caminho = _manifesto_ndjson(tmp_path, [
+        {"id": "grande", "quantidade": 25, "comprimento": 8, "incluir_numeros": True},
+        {"id": "erro", "quantidade": 25, "comprimento": 0, "incluir_numeros": True},
+    ])
+    tamanhos = []
+    processar = lote_manifesto.processar_entradas
+    def processar_medindo(entradas):
+        registros = processar(entradas)
+        tamanhos.append(len(registros))
+        return registros
+    monkeypatch.setattr(lote_manifesto, "processar_entradas", processar_medindo)
+    resumo = ResumoManifesto()
+    registros = list(processar_manifesto(caminho, senhas_por_tarefa=10, resumo=resumo))
+    assert [r["id"] for r in registros if "senha" in r] == ["grande"] * 25
+    assert [r["id"] for r in registros if "erro" in r] == ["erro"]
+    assert max(tamanhos) <= 10
+    assert (resumo.entradas, resumo.senhas, resumo.erros) == (2, 25, 1)
+
+def test_processar_manifesto_parametros_invalidos(tmp_path):
+    caminho = _manifesto_ndjson(tmp_path, [])
+    with pytest.raises(ValueError, match="workers"):
+        list(processar_manifesto(caminho, workers=0))
+    with pytest.raises(ValueError, match="senhas por tarefa"):
+        list(processar_manifesto(caminho, senhas_por_tarefa=0))
+
+def test_escrever_registros_csv_e_texto():
+    registros = [{"id": 1, "senha": "abc", "comprimento": 3, "score": None, "tentativas": 1},
+                 {"id": 2, "erro": "falhou"}]
+    destino = io.StringIO()
+    assert escrever_registros(registros, destino, CAMPOS_SAIDA_MANIFESTO, "csv") == 2
+    assert destino.getvalue().splitlines() == ["id,senha,comprimento,score,tentativas,erro", "1,abc,3,,1,", "2,,,,,falhou"]
+
+    destino = io.StringIO()
+    escrever_registros(registros, destino, CAMPOS_SAIDA_MANIFESTO, "texto")
+    assert destino.getvalue() == "abc\n"
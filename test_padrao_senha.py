@@ -0,0 +1,75 @@
+import math
+import re
+
+import pytest
+
+from gerador_senha import AmostradorSeguro, CARACTERES_SIMBOLOS_PADRAO
+from padrao_senha import (
+    PadraoCompilado,
+    compilar_padrao,
+    gerar_resultados_padrao,
+    gerar_senha_padrao,
+    gerar_senhas_padrao
+)
+
+
+def test_padrao_formato_legado():
+    simbolos = re.escape(CARACTERES_SIMBOLOS_PADRAO)
+    formato = re.compile(rf"[A-Z][a-z]{{3}}-[0-9]{{4}}-[{simbolos}]{{2}}")
+    for senha in gerar_senhas_padrao("Aaaa-9999-!!", 200):
+        assert formato.fullmatch(senha)
+
+def test_padrao_simbolos_personalizados_e_escape():
+    for senha in gerar_senhas_padrao("\\a\\9-!*", 100, simbolos="#"):
+        assert senha.startswith("a9-#")
+        assert len(senha) == 5
+
+def test_padrao_alfabetos_por_posicao_e_entropia():
+    compilado = PadraoCompilado("a9-!", simbolos="#$")
+    assert compilado.alfabetos == ("abcdefghijklmnopqrstuvwxyz", "0123456789", "-", "#$")
+    assert compilado.entropia_bits == pytest.approx(math.log2(26) + math.log2(10) + 1)
+    #posicoes do mesmo alfabeto sao sorteadas juntas
+    assert PadraoCompilado("9a9a9").grupos == (("0123456789", (0, 2, 4)), ("abcdefghijklmnopqrstuvwxyz", (1, 3)))
+
+def test_padrao_cache_por_padrao_e_simbolos():
+    compilar_padrao.cache_clear()
+    assert compilar_padrao("Aa9!") is compilar_padrao("Aa9!")
+    assert compilar_padrao("Aa9!", "#") is not compilar_padrao("Aa9!")
+    assert compilar_padrao.cache_info().hits == 2
+
+@pytest.mark.parametrize("padrao, simbolos, msg", [
+    ("", None, "não pode ser vazio"),
+    ("abc\\", None, "escape"),
+    ("9-!", "", "conjunto de símbolos está vazio"),
+    ("x-\\a", None, "nenhuma posição aleatória"),
+])
+def test_padrao_invalido(padrao, simbolos, msg):
+    with pytest.raises(ValueError, match=msg):
+        PadraoCompilado(padrao, simbolos)
+
+def test_padrao_lote_em_blocos():
+    resultados = list(gerar_resultados_padrao("AAAA-9999", 2500, senhas_por_bloco=1000))
+    assert len(resultados) == 2500
+    assert len({r.senha for r in resultados}) > 2490
+    assert all(r.tentativas == 1 and r.score == compilar_padrao("AAAA-9999").score_estimado for r in resultados)
+    with pytest.raises(ValueError, match="não pode ser negativa"):
+        gerar_resultados_padrao("AAAA", -1)
+
+def test_padrao_atingiu_meta_pelo_score_estimado():
+    assert not any(r.atingiu_meta for r in gerar_resultados_padrao("9999", 3))
+    assert all(r.atingiu_meta for r in gerar_resultados_padrao("9999", 3, score_minimo=0))
+    assert all(r.atingiu_meta for r in gerar_resultados_padrao("Aaaa-9999-!!aa", 3))
+    with pytest.raises(ValueError, match="entre 0 e 4"):
+        gerar_resultados_padrao("9999", 3, score_minimo=5)
+
+def test_padrao_distribuicao_uniforme_por_posicao():
+    amostrador = AmostradorSeguro()
+    contagens = [[0] * 10 for _ in range(3)]
+    for senha in compilar_padrao("999").gerar_lote(amostrador, 5000):
+        for posicao, digito in enumerate(senha):
+            contagens[posicao][int(digito)] += 1
+    for linha in contagens:
+        assert sum((c - 500) ** 2 / 500 for c in linha) < 40
+
+def test_gerar_senha_padrao():
+    assert re.fullmatch(r"[a-z]{4}", gerar_senha_padrao("aaaa"))
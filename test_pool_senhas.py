@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+from gerador_senha import ConfiguracaoSenha, PoliticaForca, CARACTERES_MINUSCULOS, CARACTERES_NUMERICOS
+from pool_senhas import PoolSenhas, RegistroPools
+
+
+def config_padrao(comprimento=12):
+    return ConfiguracaoSenha(comprimento=comprimento, incluir_minusculas=True, incluir_numeros=True)
+
+
+def test_pool_enche_ate_a_capacidade():
+    with PoolSenhas(config_padrao(), capacidade=50) as pool:
+        assert pool.aguardar_cheio(timeout=10)
+        assert len(pool) == 50
+        assert pool.estatisticas()["reposicoes"] == 1
+
+def test_pool_entrega_senhas_validas_e_conta_acertos():
+    with PoolSenhas(config_padrao(), capacidade=20) as pool:
+        pool.aguardar_cheio(timeout=10)
+        senhas = [pool.obter() for _ in range(5)]
+        assert all(len(s) == 12 and all(c in CARACTERES_MINUSCULOS + CARACTERES_NUMERICOS for c in s) for s in senhas)
+        estatisticas = pool.estatisticas()
+        assert estatisticas["acertos"] == 5
+        assert estatisticas["falhas"] == 0
+
+def test_pool_repoe_abaixo_do_nivel_minimo():
+    with PoolSenhas(config_padrao(), capacidade=20, nivel_minimo=10) as pool:
+        pool.aguardar_cheio(timeout=10)
+        for _ in range(15):
+            pool.obter()
+        assert pool.aguardar_cheio(timeout=10)
+        estatisticas = pool.estatisticas()
+        assert estatisticas["reposicoes"] >= 2
+        assert estatisticas["senhas_repostas"] >= 35
+        assert estatisticas["atraso_reposicao_max"] > 0
+
+def test_pool_cada_senha_entregue_uma_unica_vez():
+    entregues = []
+    lock = threading.Lock()
+    with PoolSenhas(config_padrao(16), capacidade=64, politica=PoliticaForca(modo="nenhuma")) as pool:
+        def consumir():
+            for _ in range(200):
+                senha = pool.obter()
+                with lock:
+                    entregues.append(senha)
+        threads = [threading.Thread(target=consumir) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        estatisticas = pool.estatisticas()
+    assert len(entregues) == 800
+    assert len(set(entregues)) == 800
+    assert estatisticas["acertos"] + estatisticas["falhas"] == 800
+
+def test_pool_fechado_recusa_pedidos():
+    pool = PoolSenhas(config_padrao(), capacidade=4)
+    pool.fechar()
+    with pytest.raises(RuntimeError, match="O pool de senhas está fechado."):
+        pool.obter()
+
+def test_pool_repassa_erro_da_reposicao(monkeypatch):
+    class GeradorQuebrado:
+        def gerar(self):
+            raise OSError("avaliador indisponível")
+    monkeypatch.setattr("pool_senhas.compilar_configuracao", lambda config, politica: GeradorQuebrado())
+    with PoolSenhas(config_padrao(), capacidade=4) as pool:
+        with pytest.raises(OSError, match="avaliador indisponível"):
+            pool.aguardar_cheio(timeout=10)
+        with pytest.raises(OSError, match="avaliador indisponível"):
+            pool.obter()
+
+def test_pool_nao_perde_sinal_de_falta():
+    #cada obter logo apos o buffer encher precisa disparar uma nova reposicao
+    with PoolSenhas(config_padrao(), capacidade=2, nivel_minimo=1) as pool:
+        for _ in range(200):
+            assert pool.aguardar_cheio(timeout=5)
+            pool.obter()
+            pool.obter()
+
+@pytest.mark.parametrize("capacidade, nivel_minimo, msg", [
+    (0, None, "A capacidade do pool deve ser positiva."),
+    (10, 10, "O nível mínimo do pool deve estar entre 0 e a capacidade."),
+])
+def test_pool_parametros_invalidos(capacidade, nivel_minimo, msg):
+    with pytest.raises(ValueError, match=msg):
+        PoolSenhas(config_padrao(), capacidade=capacidade, nivel_minimo=nivel_minimo)
+
+def test_registro_reaproveita_pool_por_configuracao():
+    registro = RegistroPools(capacidade=8)
+    try:
+        assert registro.pool(config_padrao()) is registro.pool(config_padrao())
+        assert registro.pool(config_padrao()) is not registro.pool(config_padrao(20))
+        assert len(registro.obter(config_padrao(20))) == 20
+    finally:
+        registro.fechar()
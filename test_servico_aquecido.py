@@ -0,0 +1,85 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+
+import pytest
+
+from gerador_senha import CARACTERES_NUMERICOS
+from servico_aquecido import gerar_via_servico
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requer sockets Unix")
+
+
+@pytest.fixture
+def servico():
+    from servico_aquecido import criar_servico
+    #caminhos de socket Unix tem limite de ~100 caracteres; o tmp_path do pytest pode passar disso
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "s.sock")
+        servico = criar_servico(caminho)
+        thread = threading.Thread(target=servico.serve_forever, daemon=True)
+        thread.start()
+        yield caminho
+        servico.shutdown()
+        servico.server_close()
+
+
+def test_servico_gera_senhas_em_varias_mensagens(servico, monkeypatch):
+    monkeypatch.setattr("servico_aquecido.MAX_SENHAS_POR_MENSAGEM", 7)
+    dados = {"comprimento": 12, "incluir_numeros": True, "politica": "zxcvbn"}
+    resultados = list(gerar_via_servico(dados, 20, servico))
+    assert len(resultados) == 20
+    for senha, score, tentativas, atingiu_meta in resultados:
+        assert len(senha) == 12 and all(c in CARACTERES_NUMERICOS for c in senha)
+        assert 0 <= score <= 4 and 1 <= tentativas <= 10
+        assert atingiu_meta == (score >= 3)
+
+def test_servico_repassa_erros_de_configuracao(servico):
+    with pytest.raises(ValueError, match="Não é possível garantir"):
+        list(gerar_via_servico({"comprimento": 1, "incluir_numeros": True, "incluir_minusculas": True}, 1, servico))
+
+def test_servico_valida_avaliador(servico):
+    with pytest.raises(ValueError, match="Avaliador de força inválido"):
+        list(gerar_via_servico({"comprimento": 8, "incluir_numeros": True, "avaliador": "outro"}, 1, servico))
+
+def test_cli_servico_rejeita_stats(servico):
+    comando = [sys.executable, "main.py", "-c", "10", "--numeros", "--stats", "--servico", servico]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 1
+    assert "--stats não pode ser combinado com --servico" in resultado.stdout
+
+def test_servico_indisponivel_ou_arquivo_comum(tmp_path):
+    with pytest.raises(ConnectionError, match="indisponível"):
+        gerar_via_servico({}, 1, str(tmp_path / "inexistente.sock"))
+    arquivo = tmp_path / "comum"
+    arquivo.write_text("x")
+    with pytest.raises(ConnectionError, match="não é um socket"):
+        gerar_via_servico({}, 1, str(arquivo))
+
+def test_socket_do_servico_privado(servico):
+    assert os.stat(servico).st_mode & 0o777 == 0o600
+
+def test_servico_so_substitui_sockets(tmp_path):
+    from servico_aquecido import criar_servico
+    arquivo = tmp_path / "comum"
+    arquivo.write_text("x")
+    with pytest.raises(ValueError, match="não é um socket"):
+        criar_servico(str(arquivo))
+    assert arquivo.read_text() == "x"
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "s.sock")
+        antigo = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        antigo.bind(caminho)
+        antigo.close()
+        criar_servico(caminho).server_close()
+
+@pytest.mark.parametrize("avaliador", ["zxcvbn", "automato"])
+def test_cli_usa_servico(servico, avaliador):
+    comando = [sys.executable, "main.py", "-c", "10", "--numeros", "-n", "5", "--avaliador", avaliador, "--servico", servico]
+    resultado = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8', errors='ignore')
+    assert resultado.returncode == 0
+    assert "Gerando localmente" not in resultado.stderr
+    assert len(resultado.stdout.split()) == 5
@@ -0,0 +1,126 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import servidor
+from gerador_senha import CARACTERES_MINUSCULOS, CARACTERES_MAIUSCULOS, CARACTERES_SIMBOLOS_PADRAO
+from servidor import AgrupadorPedidos, ErroPedido, ServidorSenhas, interpretar_pedido
+from carga_servidor import executar_carga, percentil
+
+
+async def _pedido(porta, corpo: bytes, caminho="/senhas", metodo="POST"):
+    leitor, escritor = await asyncio.open_connection("127.0.0.1", porta)
+    escritor.write(f"{metodo} {caminho} HTTP/1.1\r\nContent-Length: {len(corpo)}\r\nConnection: close\r\n\r\n".encode() + corpo)
+    await escritor.drain()
+    resposta = await leitor.read()
+    escritor.close()
+    cabecalho, _, corpo_resposta = resposta.partition(b"\r\n\r\n")
+    return int(cabecalho.split()[1]), json.loads(corpo_resposta)
+
+def _com_servidor(funcao, janela=0.01):
+    async def executar():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            agrupador = AgrupadorPedidos(executor, janela)
+            servidor = await asyncio.start_server(ServidorSenhas(agrupador).atender, "127.0.0.1", 0)
+            porta = servidor.sockets[0].getsockname()[1]
+            async with servidor:
+                return await funcao(porta, agrupador)
+    return asyncio.run(executar())
+
+
+def test_interpretar_pedido_campos_da_configuracao():
+    config, politica, quantidade = interpretar_pedido(json.dumps({
+        "comprimento": 14, "incluir_maiusculas": True, "incluir_minusculas": True,
+        "incluir_numeros": False, "incluir_simbolos": True, "simbolos_personalizados": "#$&",
+        "quantidade": 3, "politica": "zxcvbn", "prazo_ms": 20, "max_tentativas": 25, "avaliador": "automato",
+    }).encode())
+    assert config.comprimento == 14 and config.simbolos_personalizados == "#$&"
+    assert politica.modo == "zxcvbn" and politica.prazo_ms == 20 and politica.max_tentativas == 25
+    assert politica.avaliador == "automato"
+    assert quantidade == 3
+
+@pytest.mark.parametrize("corpo, msg", [
+    (b"{", "JSON válido"),
+    (b"[1]", "objeto JSON"),
+    (b'{"comprimento": 8, "incluir_numeros": true, "quantidade": 0}', "A quantidade deve ser"),
+    (b'{"comprimento": 8, "incluir_numeros": true, "quantidade": true}', "A quantidade deve ser"),
+    (b'{"comprimento": 8, "incluir_numeros": true, "max_tentativas": true}', "máximo de tentativas deve ser um inteiro"),
+    (b'{"comprimento": 100000000, "incluir_numeros": true}', "comprimento deve ser um inteiro de até 1024"),
+    (b'{"comprimento": 12.5, "incluir_numeros": true}', "comprimento deve ser um inteiro"),
+    (b'{"comprimento": 8, "incluir_numeros": true, "avaliador": "outro"}', "Avaliador de força inválido"),
+    (b'{"comprimento": 8, "cor": "azul"}', "Campo de configuração inválido"),
+    (b'{"comprimento": 8}', "Pelo menos um tipo de caractere"),
+    (b'{"comprimento": 4, "modo": "frase", "lista_palavras": "/etc/passwd"}', "lista_palavras não é aceito"),
+    (b'{"comprimento": 8, "incluir_numeros": true, "prazo_ms": -5}', "prazo por senha deve ser positivo"),
+    (b'{"comprimento": 8, "incluir_numeros": true, "max_tentativas": 1000000}', "máximo de tentativas deve ser um inteiro"),
+])
+def test_interpretar_pedido_invalido(corpo, msg):
+    with pytest.raises(ErroPedido, match=msg):
+        interpretar_pedido(corpo)
+
+def test_servidor_gera_senhas():
+    async def cenario(porta, _):
+        corpo = json.dumps({"comprimento": 14, "incluir_maiusculas": True, "incluir_minusculas": True,
+                            "incluir_simbolos": True, "quantidade": 4}).encode()
+        return await _pedido(porta, corpo)
+    status, resposta = _com_servidor(cenario)
+    assert status == 200
+    permitidos = CARACTERES_MINUSCULOS + CARACTERES_MAIUSCULOS + CARACTERES_SIMBOLOS_PADRAO
+    assert len(resposta["senhas"]) == 4
+    assert all(len(s) == 14 and all(c in permitidos for c in s) for s in resposta["senhas"])
+
+def test_servidor_erros_http():
+    async def cenario(porta, _):
+        return [await _pedido(porta, b"{}", caminho="/outro"),
+                await _pedido(porta, b"", metodo="GET"),
+                await _pedido(porta, b'{"comprimento": 0, "incluir_numeros": true}'),
+                await _pedido(porta, b'{"comprimento": 1, "incluir_numeros": true, "incluir_minusculas": true}'),
+                await _pedido(porta, b'{"comprimento": 1025, "incluir_numeros": true}')]
+    (s404, _), (s405, _), (s400, r400), (s400_compilar, r400_compilar), (s400_longo, _) = _com_servidor(cenario)
+    assert (s404, s405, s400, s400_compilar, s400_longo) == (404, 405, 400, 400, 400)
+    assert "positivo" in r400["erro"]
+    #a combinacao de campos so e validada ao compilar, no executor
+    assert "Não é possível garantir" in r400_compilar["erro"]
+
+def test_servidor_erro_inesperado_vira_500(monkeypatch):
+    def falhar(*args):
+        raise RuntimeError("falha no executor")
+    monkeypatch.setattr(servidor, "_gerar_lote", falhar)
+    async def cenario(porta, _):
+        return await _pedido(porta, b'{"comprimento": 8, "incluir_numeros": true}')
+    status, resposta = _com_servidor(cenario)
+    assert status == 500 and "falha" not in resposta["erro"]
+
+def test_geradores_compilados_limitados(monkeypatch):
+    monkeypatch.setattr(servidor, "_geradores_compilados", servidor.CacheLRU(2))
+    for comprimento in (8, 9, 10, 8):
+        config, politica, _ = interpretar_pedido(json.dumps({"comprimento": comprimento, "incluir_numeros": True}).encode())
+        assert len(servidor._gerar_lote(config, politica, 1)[0]) == comprimento
+    assert len(servidor._geradores_compilados) == 2
+
+def test_servidor_agrupa_pedidos_iguais():
+    async def cenario(porta, agrupador):
+        corpo = json.dumps({"comprimento": 12, "incluir_minusculas": True, "incluir_numeros": True}).encode()
+        respostas = await asyncio.gather(*(_pedido(porta, corpo) for _ in range(20)))
+        return respostas, agrupador.pedidos, agrupador.lotes
+    respostas, pedidos, lotes = _com_servidor(cenario, janela=0.05)
+    senhas = [s for _, r in respostas for s in r["senhas"]]
+    assert pedidos == 20
+    assert lotes < pedidos
+    assert len(set(senhas)) == 20
+
+def test_carga_mede_vazao_e_latencia():
+    async def cenario(porta, _):
+        return await executar_carga("127.0.0.1", porta, {"comprimento": 10, "incluir_numeros": True}, 4, 5)
+    resultado = _com_servidor(cenario, janela=0.001)
+    assert resultado["pedidos"] == 20
+    assert resultado["erros"] == 0
+    assert resultado["pedidos_por_s"] > 0
+    assert resultado["p50_ms"] <= resultado["p99_ms"] <= resultado["max_ms"]
+
+def test_percentil():
+    assert percentil([], 50) == 0.0
+    assert percentil([1.0, 2.0, 3.0, 4.0, 5.0], 50) == 3.0
+    assert percentil([1.0, 2.0, 3.0, 4.0, 5.0], 100) == 5.0
@@ -0,0 +1,79 @@
+import pytest
+
+from gerador_senha import ConfiguracaoSenha, GeradorSenhaCompilado, PoliticaForca, ResultadoGeracao
+from unicidade import (
+    GuardaUnicidadeBloom,
+    GuardaUnicidadeExata,
+    criar_guarda,
+    garantir_unicidade,
+    verificar_espaco
+)
+
+
+@pytest.mark.parametrize("modo", ["exata", "bloom"])
+def test_guarda_rejeita_repetidas(modo):
+    guarda = criar_guarda(modo, 1000)
+    senhas = [f"senha{i}" for i in range(1000)]
+    assert all(guarda.adicionar(s) for s in senhas)
+    assert not any(guarda.adicionar(s) for s in senhas[::7])
+    assert len(guarda) == 1000
+    assert guarda.rejeitadas == len(senhas[::7])
+    assert "senha10" in guarda
+
+def test_guarda_exata_memoria_fixa_e_cheia():
+    guarda = GuardaUnicidadeExata(100)
+    memoria = guarda.memoria_bytes()
+    assert memoria == 8 * 256
+    for i in range(100):
+        guarda.adicionar(str(i))
+    assert guarda.memoria_bytes() == memoria
+    assert not guarda.adicionar("5")
+    with pytest.raises(ValueError, match="cheia"):
+        guarda.adicionar("nova")
+
+def test_guarda_bloom_dimensionada_pela_taxa():
+    guarda = GuardaUnicidadeBloom(10**6, taxa_falsos_positivos=0.01)
+    #~9.6 bits por item e 7 funcoes para 1%
+    assert 1.1e6 < guarda.memoria_bytes() < 1.3e6
+    assert guarda.funcoes == 7
+
+def test_guarda_bloom_taxa_de_falsos_positivos():
+    guarda = GuardaUnicidadeBloom(5000, taxa_falsos_positivos=0.01)
+    for i in range(5000):
+        guarda.adicionar(f"a{i}")
+    falsos = sum(f"b{i}" in guarda for i in range(5000))
+    assert falsos < 5000 * 0.03
+
+def test_criar_guarda_parametros_invalidos():
+    with pytest.raises(ValueError, match="Modo de unicidade inválido"):
+        criar_guarda("lista", 10)
+    with pytest.raises(ValueError, match="capacidade"):
+        GuardaUnicidadeExata(0)
+    with pytest.raises(ValueError, match="falsos positivos"):
+        GuardaUnicidadeBloom(10, taxa_falsos_positivos=1.5)
+
+def test_garantir_unicidade_troca_repetidas():
+    repetidas = [ResultadoGeracao("a", None, 1), ResultadoGeracao("a", None, 1), ResultadoGeracao("b", None, 1)]
+    novas = iter([ResultadoGeracao("b", None, 1), ResultadoGeracao("c", None, 1)])
+    saida = list(garantir_unicidade(repetidas, GuardaUnicidadeExata(10), lambda: next(novas)))
+    assert [r.senha for r in saida] == ["a", "b", "c"]
+
+def test_garantir_unicidade_espaco_esgotado():
+    config = ConfiguracaoSenha(comprimento=1, incluir_numeros=True)
+    gerador = GeradorSenhaCompilado(config, PoliticaForca(modo="nenhuma"))
+    resultados = (gerador.gerar_resultado() for _ in range(11))
+    with pytest.raises(ValueError, match="esgotado"):
+        list(garantir_unicidade(resultados, GuardaUnicidadeExata(11), gerador.gerar_resultado))
+
+def test_garantir_unicidade_quase_todo_o_espaco():
+    config = ConfiguracaoSenha(comprimento=2, incluir_numeros=True)
+    gerador = GeradorSenhaCompilado(config, PoliticaForca(modo="nenhuma"))
+    resultados = (gerador.gerar_resultado() for _ in range(90))
+    senhas = [r.senha for r in garantir_unicidade(resultados, GuardaUnicidadeExata(100), gerador.gerar_resultado)]
+    assert len(set(senhas)) == 90
+
+def test_verificar_espaco():
+    gerador = GeradorSenhaCompilado(ConfiguracaoSenha(comprimento=3, incluir_numeros=True), PoliticaForca(modo="nenhuma"))
+    verificar_espaco(gerador, 1000)
+    with pytest.raises(ValueError, match="não comporta 1001 senhas únicas"):
+        verificar_espaco(gerador, 1001)
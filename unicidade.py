@@ -0,0 +1,140 @@
+import hashlib
+import math
+import secrets
+from array import array
+from typing import Callable, Iterable, Iterator
+
+from gerador_senha import GeradorSenhaCompilado, ResultadoGeracao
+
+#guardas de unicidade para lotes grandes: guardam resumos de tamanho fixo em vez das senhas,
+#com memoria alocada de uma vez a partir da capacidade. os dois modos so erram para o lado seguro:
+#uma colisao de resumo ou um falso positivo do Bloom descarta uma senha inedita (que e gerada de novo),
+#mas uma senha repetida nunca passa
+MODOS_UNICIDADE = ("exata", "bloom")
+CARGA_MAXIMA_TABELA = 0.75
+TAXA_FALSOS_POSITIVOS_PADRAO = 1e-6
+MAX_REPETICOES_SEGUIDAS = 1000
+
+class GuardaUnicidadeExata:
+    #tabela de enderecamento aberto (sondagem linear) em um array de uint64 com resumos BLAKE2b
+    #de 8 bytes, chaveados por um segredo aleatorio da instancia. o valor 0 marca posicao vazia
+    def __init__(self, capacidade: int):
+        if capacidade <= 0:
+            raise ValueError("A capacidade da guarda de unicidade deve ser positiva.")
+        self.capacidade = capacidade
+        posicoes = 1 << max(3, math.ceil(math.log2(capacidade / CARGA_MAXIMA_TABELA)))
+        self._mascara = posicoes - 1
+        self._tabela = array("Q", bytes(8 * posicoes))
+        self._chave = secrets.token_bytes(16)
+        self._ocupadas = 0
+        self.rejeitadas = 0
+
+    def _resumo(self, senha: str) -> int:
+        valor = int.from_bytes(hashlib.blake2b(senha.encode("utf-8"), digest_size=8, key=self._chave).digest(), "little")
+        return valor or 1
+
+    def adicionar(self, senha: str) -> bool:
+        #True se a senha e inedita (e passa a ser lembrada); False se ja foi vista
+        valor = self._resumo(senha)
+        tabela, mascara = self._tabela, self._mascara
+        posicao = valor & mascara
+        while True:
+            atual = tabela[posicao]
+            if atual == 0:
+                break
+            if atual == valor:
+                self.rejeitadas += 1
+                return False
+            posicao = (posicao + 1) & mascara
+        if self._ocupadas >= self.capacidade:
+            raise ValueError(f"A guarda de unicidade está cheia (capacidade {self.capacidade}).")
+        tabela[posicao] = valor
+        self._ocupadas += 1
+        return True
+
+    def __contains__(self, senha: str) -> bool:
+        valor = self._resumo(senha)
+        posicao = valor & self._mascara
+        while self._tabela[posicao]:
+            if self._tabela[posicao] == valor:
+                return True
+            posicao = (posicao + 1) & self._mascara
+        return False
+
+    def __len__(self) -> int:
+        return self._ocupadas
+
+    def memoria_bytes(self) -> int:
+        return self._tabela.itemsize * len(self._tabela)
+
+class GuardaUnicidadeBloom:
+    #filtro de Bloom com m e k dimensionados para a capacidade e a taxa de falsos positivos;
+    #as k posicoes saem de um unico resumo BLAKE2b de 16 bytes (duplo hashing de Kirsch-Mitzenmacher)
+    def __init__(self, capacidade: int, taxa_falsos_positivos: float = TAXA_FALSOS_POSITIVOS_PADRAO):
+        if capacidade <= 0:
+            raise ValueError("A capacidade da guarda de unicidade deve ser positiva.")
+        if not 0 < taxa_falsos_positivos < 1:
+            raise ValueError("A taxa de falsos positivos deve estar entre 0 e 1.")
+        self.capacidade = capacidade
+        self.taxa_falsos_positivos = taxa_falsos_positivos
+        self.bits = max(8, math.ceil(-capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2))
+        self.funcoes = max(1, round(self.bits / capacidade * math.log(2)))
+        self._filtro = bytearray((self.bits + 7) // 8)
+        self._chave = secrets.token_bytes(16)
+        self._inseridas = 0
+        self.rejeitadas = 0
+
+    def _posicoes(self, senha: str) -> Iterator[int]:
+        resumo = hashlib.blake2b(senha.encode("utf-8"), digest_size=16, key=self._chave).digest()
+        h1 = int.from_bytes(resumo[:8], "little")
+        h2 = int.from_bytes(resumo[8:], "little") | 1
+        bits = self.bits
+        return ((h1 + i * h2) % bits for i in range(self.funcoes))
+
+    def adicionar(self, senha: str) -> bool:
+        filtro = self._filtro
+        posicoes = list(self._posicoes(senha))
+        if all(filtro[p >> 3] & (1 << (p & 7)) for p in posicoes):
+            self.rejeitadas += 1
+            return False
+        if self._inseridas >= self.capacidade:
+            raise ValueError(f"A guarda de unicidade está cheia (capacidade {self.capacidade}).")
+        for p in posicoes:
+            filtro[p >> 3] |= 1 << (p & 7)
+        self._inseridas += 1
+        return True
+
+    def __contains__(self, senha: str) -> bool:
+        return all(self._filtro[p >> 3] & (1 << (p & 7)) for p in self._posicoes(senha))
+
+    def __len__(self) -> int:
+        return self._inseridas
+
+    def memoria_bytes(self) -> int:
+        return len(self._filtro)
+
+def criar_guarda(modo: str, capacidade: int, taxa_falsos_positivos: float = TAXA_FALSOS_POSITIVOS_PADRAO):
+    if modo == "exata":
+        return GuardaUnicidadeExata(capacidade)
+    if modo == "bloom":
+        return GuardaUnicidadeBloom(capacidade, taxa_falsos_positivos)
+    raise ValueError(f"Modo de unicidade inválido: {modo}. Use um de: {', '.join(MODOS_UNICIDADE)}.")
+
+def garantir_unicidade(resultados: Iterable[ResultadoGeracao],
+                       guarda: GuardaUnicidadeExata | GuardaUnicidadeBloom,
+                       regerar: Callable[[], ResultadoGeracao],
+                       max_repeticoes: int = MAX_REPETICOES_SEGUIDAS) -> Iterator[ResultadoGeracao]:
+    #repassa os resultados, trocando cada senha ja vista por uma nova gerada com `regerar`
+    for resultado in resultados:
+        repeticoes = 0
+        while not guarda.adicionar(resultado.senha):
+            repeticoes += 1
+            if repeticoes > max_repeticoes:
+                raise ValueError("Não foi possível gerar uma senha inédita; o espaço de senhas parece esgotado.")
+            resultado = regerar()
+        yield resultado
+
+def verificar_espaco(gerador: GeradorSenhaCompilado, quantidade: int) -> None:
+    if gerador.entropia_bits < math.log2(max(quantidade, 1)):
+        raise ValueError(f"A configuração não comporta {quantidade} senhas únicas "
+                         f"(apenas {2 ** gerador.entropia_bits:.0f} combinações).")